@@ -3,6 +3,7 @@ import copy
 import time
 from config import *
 from board import Move
+from search_stats import SearchStats
 
 class B22CH032:
     """
@@ -17,12 +18,14 @@ class B22CH032:
         self.transposition_table = {}
         # Move ordering helpers
         self.killer_moves = [[] for _ in range(10)]  # Store killer moves per depth
+        self.stats = SearchStats()
     
     def get_best_move(self):
         """
         Calculates and returns the best move using Minimax with Alpha-Beta pruning.
         """
         self.nodes_expanded = 0
+        self.stats.reset()
         self.transposition_table.clear()
         
         # Determine our color on first move
@@ -44,6 +47,7 @@ class B22CH032:
         # Order moves for better pruning
         ordered_moves = self._order_moves(legal_moves)
         
+        self.stats.begin_iteration(self.depth)
         for move in ordered_moves:
             self.board.make_move(move)
             score = self._minimax(self.depth - 1, alpha, beta, False)
@@ -56,6 +60,9 @@ class B22CH032:
             alpha = max(alpha, score)
             if beta <= alpha:
                 break
+        self.stats.end_iteration(self.depth)
+        self.stats.score = best_score if self.is_white else -best_score
+        self.stats.finish()
         
         return best_move
     
@@ -64,13 +71,17 @@ class B22CH032:
         Minimax algorithm with Alpha-Beta pruning.
         """
         self.nodes_expanded += 1
+        self.stats.nodes += 1
         # Terminal conditions
         game_state = self.board.get_game_state()
         if depth == 0 or game_state != "ongoing":
             return self.evaluate_board()
         # Check transposition table
         board_hash = self._get_board_hash()
+        self.stats.tt_probes += 1
         if board_hash in self.transposition_table:
+            self.stats.tt_hits += 1
+            self.stats.tt_cutoffs += 1
             return self.transposition_table[board_hash]
         
         legal_moves = self.board.get_legal_moves()
@@ -84,7 +95,7 @@ class B22CH032:
         
         if is_maximizing:
             max_score = float('-inf')
-            for move in ordered_moves:
+            for i, move in enumerate(ordered_moves):
                 self.board.make_move(move)
                 score = self._minimax(depth - 1, alpha, beta, False)
                 self.board.undo_move()
@@ -92,6 +103,9 @@ class B22CH032:
                 max_score = max(max_score, score)
                 alpha = max(alpha, score)
                 if beta <= alpha:
+                    self.stats.cutoffs += 1
+                    if i == 0:
+                        self.stats.first_move_cutoffs += 1
                     # Store killer move
                     if depth < len(self.killer_moves):
                         if move not in self.killer_moves[depth]:
@@ -104,7 +118,7 @@ class B22CH032:
             return max_score
         else:
             min_score = float('inf')
-            for move in ordered_moves:
+            for i, move in enumerate(ordered_moves):
                 self.board.make_move(move)
                 score = self._minimax(depth - 1, alpha, beta, True)
                 self.board.undo_move()
@@ -112,6 +126,9 @@ class B22CH032:
                 min_score = min(min_score, score)
                 beta = min(beta, score)
                 if beta <= alpha:
+                    self.stats.cutoffs += 1
+                    if i == 0:
+                        self.stats.first_move_cutoffs += 1
                     # Store killer move
                     if depth < len(self.killer_moves):
                         if move not in self.killer_moves[depth]:
@@ -3,6 +3,34 @@ import copy
 import time
 from config import *
 from board import Move
+from search_stats import SearchStats
+from deadline import SearchDeadline
+from lazy_eval import LazyEvaluator
+from pawn_table import PawnTable, squares
+from eval_cache import EvalCache
+from move_ordering import MoveOrderer
+
+
+def _spread(table):
+    """Width of the range a side's sum over one piece of a table can take, counting 0 (no piece)."""
+    values = [v for row in table for v in row]
+    return max(0, max(values)) - min(0, min(values))
+
+
+# Evaluation terms, cheapest first, with the largest absolute value each can
+# add (each side has at most 4 pawns, 2 knights, a bishop and a king, and
+# at most 3 + 3 + 3 + 3 + 6 + 6 + 6 + 8 = 38 legal moves). Weights are taken
+# by absolute value, as texel.py may tune them to either sign.
+EVAL_TERMS = [
+    ("_evaluate_material", None),
+    ("_evaluate_center_control", 4 * abs(CENTER_CONTROL_BONUS)),
+    ("_evaluate_king_safety", abs(KING_SAFETY_PENALTY)),
+    ("_evaluate_endgame", 8),
+    ("_evaluate_positions", 4 * _spread(PAWN_PST) + 2 * _spread(KNIGHT_PST) +
+                            _spread(BISHOP_PST) + _spread(KING_PST_LATE_GAME)),
+    ("_evaluate_pawn_structure", 4 * (abs(PASSED_PAWN_BONUS) + 6 * abs(PASSED_PAWN_RANK_BONUS))),
+    ("_evaluate_mobility", 38 * abs(MOBILITY_WEIGHT)),
+]
 
 class B22CH0322:
     """
@@ -17,22 +45,33 @@ class B22CH0322:
         self.depth = 4  # Optimal depth for 60-second games
         self.start_time = 0
         self.time_limit = 0.8  # Reserve time for other operations
+        self.deadline = SearchDeadline(self.time_limit)
         
         # Transposition table for memoization
         self.transposition_table = {}
         
-        # Move ordering helpers
-        self.killer_moves = [[] for _ in range(10)]  # Store killer moves per depth
-        self.history_heuristic = {}
+        # Move ordering helpers (killers, history, countermoves)
+        self.orderer = MoveOrderer()
+        self.root_ply = 0
+        self.pawn_table = PawnTable()
+        self.eval_cache = EvalCache()     # kept for the whole game
+        self.evaluator = LazyEvaluator(self, EVAL_TERMS)
+        self.stats = SearchStats()
     
-    def get_best_move(self):
+    def get_best_move(self, deadline=None):
         """
         Calculates and returns the best move using iterative deepening
         with Alpha-Beta pruning and various optimizations.
+        Stops at `self.time_limit` or when the runner's deadline expires,
+        returning the best move of the last completed iteration.
         """
         self.start_time = time.time()
+        self.deadline = (deadline or SearchDeadline()).within(self.time_limit, check_every=16)
         self.nodes_expanded = 0
+        self.stats.reset()
         self.transposition_table.clear()
+        self.orderer.age()
+        self.root_ply = len(self.board.move_log)
         
         legal_moves = self.board.get_legal_moves()
         if not legal_moves:
@@ -42,19 +81,26 @@ class B22CH0322:
             return legal_moves[0]
         
         best_move = legal_moves[0]
+        start_ply = len(self.board.move_log)
         
         # Iterative deepening
         for depth in range(1, self.depth + 1):
-            if time.time() - self.start_time > self.time_limit:
+            if self.deadline.expired():
                 break
                 
             try:
+                self.stats.begin_iteration(depth)
                 current_best = self._iterative_search(legal_moves, depth)
+                self.stats.end_iteration(depth)
                 if current_best:
                     best_move = current_best
             except TimeoutError:
+                # The search stopped mid-line: take back the moves it left on the board.
+                while len(self.board.move_log) > start_ply:
+                    self.board.undo_move()
                 break
         
+        self.stats.finish()
         return best_move
     
     def _iterative_search(self, moves, depth):
@@ -68,7 +114,7 @@ class B22CH0322:
         ordered_moves = self._order_moves(moves)
         
         for move in ordered_moves:
-            if time.time() - self.start_time > self.time_limit:
+            if self.deadline.should_stop():
                 raise TimeoutError()
             
             self.board.make_move(move)
@@ -83,25 +129,30 @@ class B22CH0322:
             if beta <= alpha:
                 break
         
+        self.stats.score = best_score
         return best_move
     
     def _minimax(self, depth, alpha, beta, is_maximizing):
         """
         Minimax algorithm with Alpha-Beta pruning.
         """
-        if time.time() - self.start_time > self.time_limit:
+        if self.deadline.should_stop():
             raise TimeoutError()
         
         self.nodes_expanded += 1
+        self.stats.nodes += 1
         
         # Terminal conditions
         game_state = self.board.get_game_state()
         if depth == 0 or game_state != "ongoing":
-            return self.evaluate_board()
+            return self.evaluate_board(alpha, beta)
         
         # Check transposition table
         board_hash = self._get_board_hash()
+        self.stats.tt_probes += 1
         if board_hash in self.transposition_table:
+            self.stats.tt_hits += 1
+            self.stats.tt_cutoffs += 1
             return self.transposition_table[board_hash]
         
         legal_moves = self.board.get_legal_moves()
@@ -115,8 +166,8 @@ class B22CH0322:
         
         if is_maximizing:
             max_score = float('-inf')
-            for move in ordered_moves:
-                if time.time() - self.start_time > self.time_limit:
+            for i, move in enumerate(ordered_moves):
+                if self.deadline.should_stop():
                     raise TimeoutError()
                 
                 self.board.make_move(move)
@@ -126,20 +177,19 @@ class B22CH0322:
                 max_score = max(max_score, score)
                 alpha = max(alpha, score)
                 if beta <= alpha:
-                    # Store killer move
-                    if depth < len(self.killer_moves):
-                        if move not in self.killer_moves[depth]:
-                            self.killer_moves[depth].append(move)
-                            if len(self.killer_moves[depth]) > 2:
-                                self.killer_moves[depth].pop(0)
+                    self.stats.cutoffs += 1
+                    if i == 0:
+                        self.stats.first_move_cutoffs += 1
+                    self.orderer.cutoff(move, len(self.board.move_log) - self.root_ply, depth,
+                                        self.board.move_log[-1])
                     break
             
             self.transposition_table[board_hash] = max_score
             return max_score
         else:
             min_score = float('inf')
-            for move in ordered_moves:
-                if time.time() - self.start_time > self.time_limit:
+            for i, move in enumerate(ordered_moves):
+                if self.deadline.should_stop():
                     raise TimeoutError()
                 
                 self.board.make_move(move)
@@ -149,12 +199,11 @@ class B22CH0322:
                 min_score = min(min_score, score)
                 beta = min(beta, score)
                 if beta <= alpha:
-                    # Store killer move
-                    if depth < len(self.killer_moves):
-                        if move not in self.killer_moves[depth]:
-                            self.killer_moves[depth].append(move)
-                            if len(self.killer_moves[depth]) > 2:
-                                self.killer_moves[depth].pop(0)
+                    self.stats.cutoffs += 1
+                    if i == 0:
+                        self.stats.first_move_cutoffs += 1
+                    self.orderer.cutoff(move, len(self.board.move_log) - self.root_ply, depth,
+                                        self.board.move_log[-1])
                     break
             
             self.transposition_table[board_hash] = min_score
@@ -163,18 +212,15 @@ class B22CH0322:
     def _order_moves(self, moves):
         """
         Order moves for better Alpha-Beta pruning efficiency.
-        Priority: captures, checks, killer moves, then by piece value.
+        Priority: captures (MVV-LVA), killer moves, countermove, then by
+        history; checks and positional bonuses break ties within each group.
         """
+        log = self.board.move_log
+        key = self.orderer.sort_key(len(log) - self.root_ply, previous=log[-1] if log else None)
         scored_moves = []
         
         for move in moves:
-            score = 0
-            
-            # Prioritize captures (MVV-LVA: Most Valuable Victim - Least Valuable Attacker)
-            if move.piece_captured != EMPTY_SQUARE:
-                victim_value = abs(PIECE_VALUES.get(move.piece_captured, 0))
-                attacker_value = abs(PIECE_VALUES.get(move.piece_moved, 0))
-                score += victim_value * 10 - attacker_value
+            score = key(move)
             
             # Check if move gives check
             self.board.make_move(move)
@@ -182,16 +228,6 @@ class B22CH0322:
                 score += 50
             self.board.undo_move()
             
-            # Killer move heuristic
-            for depth_moves in self.killer_moves:
-                if move in depth_moves:
-                    score += 30
-                    break
-            
-            # History heuristic
-            move_key = (move.start_row, move.start_col, move.end_row, move.end_col)
-            score += self.history_heuristic.get(move_key, 0)
-            
             # Positional bonuses
             score += self._get_positional_bonus(move)
             
@@ -220,43 +256,32 @@ class B22CH0322:
         
         return bonus
     
-    def evaluate_board(self):
+    def evaluate_board(self, alpha=float('-inf'), beta=float('inf')):
         """
         Comprehensive board evaluation function.
         Returns a score from White's perspective (positive = good for White).
+        Terms run cheapest first (EVAL_TERMS); once the rest cannot bring the
+        score back inside [alpha, beta] the partial score is returned.
+        Exact scores are cached in `self.eval_cache`.
         """
+        key = self.board.position_key()
+        cached = self.eval_cache.get(key, self.stats)
+        if cached is not None:
+            return cached
+        
         game_state = self.board.get_game_state()
         
         # Terminal positions
         if game_state == "checkmate":
-            return -99999 if self.board.white_to_move else 99999
+            score = -99999 if self.board.white_to_move else 99999
         elif game_state == "stalemate":
-            return 0
-        
-        score = 0
-        
-        # Material evaluation
-        score += self._evaluate_material()
-        
-        # Positional evaluation
-        score += self._evaluate_positions()
-        
-        # King safety
-        score += self._evaluate_king_safety()
-        
-        # Piece activity and mobility
-        score += self._evaluate_mobility()
-        
-        # Pawn structure
-        score += self._evaluate_pawn_structure()
-        
-        # Center control
-        score += self._evaluate_center_control()
-        
-        # Endgame considerations
-        if self._is_endgame():
-            score += self._evaluate_endgame()
+            score = 0
+        else:
+            score = self.evaluator.evaluate(alpha, beta)
+            if not self.evaluator.exact:
+                return score
         
+        self.eval_cache.put(key, score)
         return score
     
     def _evaluate_material(self):
@@ -307,11 +332,11 @@ class B22CH0322:
             if not self._is_endgame():
                 # White king safety
                 if white_king_pos[0] < 6:  # King advanced too early
-                    score -= 30
+                    score -= KING_SAFETY_PENALTY
                 
                 # Black king safety
                 if black_king_pos[0] > 1:  # King advanced too early
-                    score += 30
+                    score += KING_SAFETY_PENALTY
         
         return score
     
@@ -329,36 +354,28 @@ class B22CH0322:
         
         mobility_diff = current_moves - opponent_moves
         if self.board.white_to_move:
-            score += mobility_diff * 2
+            score += mobility_diff * MOBILITY_WEIGHT
         else:
-            score -= mobility_diff * 2
+            score -= mobility_diff * MOBILITY_WEIGHT
         
         return score
     
     def _evaluate_pawn_structure(self):
-        """Evaluate pawn structure."""
-        score = 0
-        
-        white_pawns = []
-        black_pawns = []
+        """Evaluate pawn structure (cached per pawn configuration in the pawn table)."""
+        entry = self.pawn_table.probe(self.board)
+        if entry.score is not None:
+            return entry.score
         
-        for r in range(BOARD_HEIGHT):
-            for c in range(BOARD_WIDTH):
-                piece = self.board.board[r][c]
-                if piece == WHITE_PAWN:
-                    white_pawns.append((r, c))
-                elif piece == BLACK_PAWN:
-                    black_pawns.append((r, c))
+        score = 0
         
         # Reward passed pawns
-        for r, c in white_pawns:
-            if self._is_passed_pawn(r, c, 'w'):
-                score += 15 + (6 - r) * 5  # More reward for advanced passed pawns
+        for r, c in squares(entry.passed['w']):
+            score += PASSED_PAWN_BONUS + (6 - r) * PASSED_PAWN_RANK_BONUS  # More reward for advanced passed pawns
         
-        for r, c in black_pawns:
-            if self._is_passed_pawn(r, c, 'b'):
-                score -= 15 + (r - 1) * 5
+        for r, c in squares(entry.passed['b']):
+            score -= PASSED_PAWN_BONUS + (r - 1) * PASSED_PAWN_RANK_BONUS
         
+        entry.score = score
         return score
     
     def _evaluate_center_control(self):
@@ -370,15 +387,17 @@ class B22CH0322:
             piece = self.board.board[r][c]
             if piece != EMPTY_SQUARE:
                 if piece.startswith('w'):
-                    score += 10
+                    score += CENTER_CONTROL_BONUS
                 else:
-                    score -= 10
+                    score -= CENTER_CONTROL_BONUS
         
         return score
     
     def _evaluate_endgame(self):
-        """Evaluate endgame-specific factors."""
+        """Evaluate endgame-specific factors (0 before the endgame)."""
         score = 0
+        if not self._is_endgame():
+            return score
         
         white_king_pos = self.board._find_king('w')
         black_king_pos = self.board._find_king('b')
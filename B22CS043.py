@@ -2,6 +2,7 @@ import random
 import time
 from board import Move
 from config import *
+from search_stats import SearchStats
 
 class B22CS043:
     """
@@ -12,6 +13,7 @@ class B22CS043:
         self.nodes_expanded = 0
         self.depth = 5
         self.cache = {}
+        self.stats = SearchStats()
 
     def get_moves(self):
         """
@@ -69,10 +71,14 @@ class B22CS043:
 
     def search(self, depth, alpha=-99999, beta=99999):
         self.nodes_expanded += 1
+        self.stats.nodes += 1
 
         board_hash = self._get_board_hash()
         cache_key = (board_hash, depth)
+        self.stats.tt_probes += 1
         if cache_key in self.cache:
+            self.stats.tt_hits += 1
+            self.stats.tt_cutoffs += 1
             return self.cache[cache_key]
 
         if depth == 0:
@@ -89,7 +95,7 @@ class B22CS043:
             self.cache[cache_key] = result
             return result
 
-        for move in legal_moves:
+        for i, move in enumerate(legal_moves):
             self.engine.make_move(move)
             _, eval = self.search(depth - 1, -beta, -alpha)
             eval = -eval
@@ -101,6 +107,9 @@ class B22CS043:
 
             alpha = max(alpha, eval)
             if alpha >= beta:
+                self.stats.cutoffs += 1
+                if i == 0:
+                    self.stats.first_move_cutoffs += 1
                 break
 
         result = (best_move, best_eval)
@@ -113,7 +122,12 @@ class B22CS043:
         """
         # time.sleep(5)  # Simulate "thinking"
         self.nodes_expanded = 0
-        best_move, _ = self.search(self.depth)
+        self.stats.reset()
+        self.stats.begin_iteration(self.depth)
+        best_move, score = self.search(self.depth)
+        self.stats.end_iteration(self.depth)
+        self.stats.score = score if self.engine.white_to_move else -score
+        self.stats.finish()
         return best_move
 
     def evaluate_board(self, game_state):
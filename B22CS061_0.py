@@ -4,6 +4,8 @@ from typing import Optional, Tuple, List
 
 from config import *
 from board import GameEngine, Move
+from search_stats import SearchStats
+from deadline import SearchDeadline
 
 
 class B22CS061:
@@ -12,29 +14,41 @@ class B22CS061:
         self.nodes_expanded = 0
         self.depth = 2
         self.max_time_per_move = 0.2
-        self._deadline: float = 0.0
+        self._deadline: SearchDeadline = SearchDeadline(self.max_time_per_move)
+        self.stats = SearchStats()
 
-    def get_best_move(self) -> Optional[Move]:
+    def get_best_move(self, deadline: Optional[SearchDeadline] = None) -> Optional[Move]:
         legal_moves = self.engine.get_legal_moves()
         if not legal_moves:
             return None
 
         self.nodes_expanded = 0
-        self._deadline = time.perf_counter() + self.max_time_per_move
+        self.stats.reset()
+        self._deadline = (deadline or SearchDeadline()).within(self.max_time_per_move, check_every=16)
 
         legal_moves = self._order_moves(legal_moves)
 
         best_move: Optional[Move] = legal_moves[0]
         scored_moves: List[Tuple[int, Move]] = []
+        start_ply = len(self.engine.move_log)
 
         for current_depth in range(1, self.depth + 1):
             try:
+                self.stats.begin_iteration(current_depth)
                 scored_moves = self._search_root_all(legal_moves, current_depth)
+                self.stats.end_iteration(current_depth)
                 if scored_moves:
                     best_move = scored_moves[0][1]
+                    color = 1 if self.engine.white_to_move else -1
+                    self.stats.score = color * scored_moves[0][0]
             except TimeoutError:
+                # Take back the moves of the interrupted line.
+                while len(self.engine.move_log) > start_ply:
+                    self.engine.undo_move()
                 break
 
+        self.stats.finish()
+
         if scored_moves and len(scored_moves) > 1 and random.random() < 0.30:
             return scored_moves[1][1]
 
@@ -77,6 +91,7 @@ class B22CS061:
 
     def _negamax(self, depth: int, alpha: int, beta: int, color: int) -> int:
         self._guard_time()
+        self.stats.nodes += 1
 
         game_state = self.engine.get_game_state()
         if game_state == "checkmate":
@@ -95,7 +110,7 @@ class B22CS061:
 
         moves = self._order_moves(moves)
 
-        for move in moves:
+        for i, move in enumerate(moves):
             self._guard_time()
             self.engine.make_move(move)
             score = -self._negamax(depth - 1, -beta, -alpha, -color)
@@ -106,6 +121,9 @@ class B22CS061:
             if score > alpha:
                 alpha = score
             if alpha >= beta:
+                self.stats.cutoffs += 1
+                if i == 0:
+                    self.stats.first_move_cutoffs += 1
                 break
 
         return best_score
@@ -120,7 +138,7 @@ class B22CS061:
         return sorted(moves, key=move_key, reverse=True)
 
     def _guard_time(self) -> None:
-        if time.perf_counter() >= self._deadline:
+        if self._deadline.should_stop():
             raise TimeoutError
 
 
@@ -147,6 +147,9 @@ import math
 import random
 from config import *
 from board import Move
+from search_stats import SearchStats
+from pawn_table import PawnTable
+from eval_cache import EvalCache, cached_evaluation
 
 # Agent class expected by your runner (callable as B22EE088(engine))
 class B22EE088:
@@ -157,6 +160,11 @@ class B22EE088:
       - checkmate = +600 (terminal override)
     Constructor matches runner expectation: B22EE088(engine, depth=3, aggressive=False)
     """
+    # Evaluation terms summed by _evaluate_board_basic (profiling.EvalTermProfiler
+    # reports these per term).
+    EVAL_TERMS = ("_material_pst_score", "_mobility_score", "_pawn_structure_score",
+                  "_king_safety_score", "_check_score")
+
     def __init__(self, board, depth=3, aggressive=False):
         self.board = board
         self.depth = depth            # search depth used for minimax
@@ -176,6 +184,9 @@ class B22EE088:
         # PSTs are read from config: PAWN_PST, KNIGHT_PST, BISHOP_PST, KING_PST_LATE_GAME
         # small random jitter to break ties
         self.jitter = 0.001
+        self.pawn_table = PawnTable()
+        self.eval_cache = EvalCache()  # kept between moves
+        self.stats = SearchStats()
     def _move_ordering(self, move):
         score = 0
         if move.piece_captured != EMPTY_SQUARE:
@@ -187,6 +198,7 @@ class B22EE088:
     def get_best_move(self):
         """Return the best Move for current board using minimax alpha-beta (depth = self.depth)."""
         self.nodes_expanded = 0
+        self.stats.reset()
         engine = self.board
         white_to_move = engine.white_to_move
 
@@ -204,6 +216,7 @@ class B22EE088:
         if self.aggressive:
             legal_moves.sort(key=self._move_ordering, reverse=True)
 
+        self.stats.begin_iteration(self.depth)
         for mv in legal_moves:
             engine.make_move(mv)
             score = self._minimax(self.depth - 1, alpha, beta, not white_to_move)
@@ -221,15 +234,22 @@ class B22EE088:
             if beta <= alpha:
                 break
 
+        self.stats.end_iteration(self.depth)
+        self.stats.score = best_score
+        self.stats.finish()
         return best_move
 
     # ---------- minimax with alpha-beta ----------
     def _minimax(self, depth, alpha, beta, maximizing_player):
         self.nodes_expanded += 1
+        self.stats.nodes += 1
         state = self.board.get_game_state()
         board_hash = str(self.board.board) + str(self.board.white_to_move)
         key = (board_hash, depth, maximizing_player)
+        self.stats.tt_probes += 1
         if key in self.transposition_table:
+            self.stats.tt_hits += 1
+            self.stats.tt_cutoffs += 1
             return self.transposition_table[key]
         # terminal or depth cutoff
         if depth == 0 or state != "ongoing":
@@ -245,29 +265,36 @@ class B22EE088:
 
         if maximizing_player:  # White to move in this node
             v = -math.inf
-            for mv in legal_moves:
+            for i, mv in enumerate(legal_moves):
                 self.board.make_move(mv)
                 val = self._minimax(depth - 1, alpha, beta, False)
                 self.board.undo_move()
                 v = max(v, val)
                 alpha = max(alpha, v)
                 if alpha >= beta:
+                    self.stats.cutoffs += 1
+                    if i == 0:
+                        self.stats.first_move_cutoffs += 1
                     break
             return v
         else:  # Black to move in this node
             v = math.inf
-            for mv in legal_moves:
+            for i, mv in enumerate(legal_moves):
                 self.board.make_move(mv)
                 val = self._minimax(depth - 1, alpha, beta, True)
                 self.board.undo_move()
                 v = min(v, val)
                 beta = min(beta, v)
                 if alpha >= beta:
+                    self.stats.cutoffs += 1
+                    if i == 0:
+                        self.stats.first_move_cutoffs += 1
                     break
             self.transposition_table[key] = v
             return v
 
     # ---------- evaluation helpers ----------
+    @cached_evaluation()
     def _evaluate_terminal_or_board(self, state):
         if state == "checkmate":
             if self.board.white_to_move:
@@ -291,10 +318,21 @@ class B22EE088:
           - simple pawn-structure penalties and king safety,
           - small jitter to break ties.
         """
+        score = self._material_pst_score()
+        score += self._mobility_score()
+        score += self._pawn_structure_score()
+        score += self._king_safety_score()
+        score += self._check_score()
+
+        # tiny jitter to break ties
+        score += random.uniform(-self.jitter, self.jitter)
+        return score
+
+    def _material_pst_score(self):
+        """Material and piece-square tables, from White's perspective."""
         board = self.board.board
         score = 0.0
 
-        # Material + PST
         for r in range(BOARD_HEIGHT):
             for c in range(BOARD_WIDTH):
                 piece = board[r][c]
@@ -322,6 +360,11 @@ class B22EE088:
                 elif piece == BLACK_KING:
                     score -= KING_PST_LATE_GAME[BOARD_HEIGHT - 1 - r][c]
 
+        return score
+
+    def _mobility_score(self):
+        """Mobility of the side to move, from White's perspective."""
+        score = 0.0
         # Mobility: difference in number of legal moves (cheap)
         # We compute legal moves for current side and hypothetical opponent by flipping white_to_move
         try:
@@ -341,12 +384,11 @@ class B22EE088:
         except Exception:
             pass
 
-        # Pawn-structure simple penalties (doubled or isolated)
-        score += self._pawn_structure_score()
-
-        # King safety: penalize exposed kings (few defenders near)
-        score += self._king_safety_score()
+        return score
 
+    def _check_score(self):
+        """Small penalty for the side to move being in check, from White's perspective."""
+        score = 0
         # Check bonus: if the side NOT to move is in check, that's good for the side who just moved.
         # engine.is_in_check() tells whether current player to move is in check.
         if self.board.is_in_check():
@@ -355,9 +397,6 @@ class B22EE088:
                 score -= 2  # white in check
             else:
                 score += 2  # black in check
-
-        # tiny jitter to break ties
-        score += random.uniform(-self.jitter, self.jitter)
         return score
 
     def _capture_score(self, move):
@@ -373,16 +412,13 @@ class B22EE088:
         """
         Return small penalty for doubled/isolated pawns (white negative reduces score, black positive increases).
         This function returns a signed value from White's perspective.
+        Cached per pawn configuration in the pawn table.
         """
-        w_files = [0]*BOARD_WIDTH
-        b_files = [0]*BOARD_WIDTH
-        for r in range(BOARD_HEIGHT):
-            for c in range(BOARD_WIDTH):
-                p = self.board.board[r][c]
-                if p == WHITE_PAWN:
-                    w_files[c] += 1
-                elif p == BLACK_PAWN:
-                    b_files[c] += 1
+        entry = self.pawn_table.probe(self.board)
+        if entry.score is not None:
+            return entry.score
+        w_files = entry.files['w']
+        b_files = entry.files['b']
 
         s = 0
         # doubled pawn penalty
@@ -397,6 +433,7 @@ class B22EE088:
                 s -= 4
             if b_files[f] == 1 and ((f-1 < 0 or b_files[f-1] == 0) and (f+1 >= BOARD_WIDTH or b_files[f+1] == 0)):
                 s += 4
+        entry.score = s
         return s
 
     def _king_safety_score(self):
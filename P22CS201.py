@@ -1,6 +1,7 @@
 import random
 import time
 from board import Move
+from search_stats import SearchStats
 
 class P22CS201:
     """
@@ -11,11 +12,14 @@ class P22CS201:
         self.engine = engine
         self.nodes_expanded = 0
         self.depth = 0 # This agent doesn't have a search depth
+        self.stats = SearchStats()
 
     def get_best_move(self):
         """
         Finds and returns a random legal move after a 0.2-second delay.
         """
+        self.stats.reset()
+        self.stats.nodes = 1
         time.sleep(0.2) # Simulate "thinking"
         self.nodes_expanded = 1
         legal_moves = self.engine.get_legal_moves()
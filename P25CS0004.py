@@ -1,5 +1,6 @@
 import random
 from board import Move
+from search_stats import SearchStats
 from config import *
 
 class P25CS0004:
@@ -11,11 +12,14 @@ class P25CS0004:
         self.engine = engine
         self.nodes_expanded = 0
         self.depth = 0 # This agent doesn't have a search depth
+        self.stats = SearchStats()
 
     def get_best_move(self):
         """
         Finds and returns a random legal move.
         """
+        self.stats.reset()
+        self.stats.nodes = 1
         self.nodes_expanded = 1 # It "considers" all moves at once and picks one
         legal_moves = self.engine.get_legal_moves()
         
@@ -0,0 +1,179 @@
+"""
+Lazy agent registry.
+
+Agent classes are discovered by parsing `*.py` files (no import) and looking
+for classes that define `get_best_move` and can be constructed as
+`cls(engine)`. Infrastructure modules (INFRASTRUCTURE_MODULES), whose
+wrappers also define get_best_move, are skipped. Each entry records the class name,
+module, file and declared search depth. A module is only imported when its
+agent is loaded, and an agent that fails to import raises AgentLoadError
+instead of breaking every other agent.
+
+    registry = AgentRegistry(["submissions"])
+    registry.names()                 # ['B22CH032', 'B22CS061', ...]
+    B22CS061 = registry.load("B22CS061")
+
+Run `python agent_registry.py [dir ...]` to list what would be discovered.
+"""
+import ast
+import glob
+import importlib
+import importlib.util
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+INFRASTRUCTURE_MODULES = {"sandbox", "ponder", "agent_registry", "game_runner", "tournament"}
+
+
+class AgentLoadError(Exception):
+    """Raised when an agent's module cannot be imported or lacks the class."""
+
+
+class AgentSpec:
+    """Metadata for one discovered agent class."""
+    def __init__(self, name, module, path, depth=None):
+        self.name = name        # class name, used as the agent's registry name
+        self.module = module    # module name (file stem)
+        self.path = path
+        self.depth = depth      # literal depth declared in __init__, if any
+
+    def __repr__(self):
+        return f"AgentSpec({self.name!r}, module={self.module!r}, depth={self.depth!r})"
+
+
+def _declared_depth(init):
+    """Finds `self.depth = <int>` or `self.depth = depth` with a literal default."""
+    defaults = {}
+    args = init.args.args[-len(init.args.defaults):] if init.args.defaults else []
+    for arg, default in zip(args, init.args.defaults):
+        if isinstance(default, ast.Constant):
+            defaults[arg.arg] = default.value
+
+    for node in ast.walk(init):
+        if not isinstance(node, ast.Assign):
+            continue
+        for target in node.targets:
+            if (isinstance(target, ast.Attribute) and target.attr == "depth"
+                    and isinstance(target.value, ast.Name) and target.value.id == "self"):
+                if isinstance(node.value, ast.Constant):
+                    return node.value.value
+                if isinstance(node.value, ast.Name):
+                    return defaults.get(node.value.id)
+    return None
+
+
+def _takes_engine(init):
+    """True if __init__(self, ...) can be called with the engine alone."""
+    args = init.args
+    positional = args.posonlyargs + args.args
+    required = len(positional) - len(args.defaults)
+    if any(default is None for default in args.kw_defaults):     # keyword-only without default
+        return False
+    return required <= 2 and (len(positional) >= 2 or args.vararg is not None)
+
+
+def scan_file(path):
+    """Returns AgentSpecs for the agent classes defined in one source file."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    module = os.path.splitext(os.path.basename(path))[0]
+    if module in INFRASTRUCTURE_MODULES:
+        return []
+    specs = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        methods = {item.name: item for item in node.body if isinstance(item, ast.FunctionDef)}
+        if "get_best_move" not in methods:
+            continue
+        if "__init__" in methods and not _takes_engine(methods["__init__"]):
+            continue
+        depth = _declared_depth(methods["__init__"]) if "__init__" in methods else None
+        specs.append(AgentSpec(node.name, module, path, depth))
+    return specs
+
+
+class AgentRegistry:
+    """Discovers agent classes in directories and imports them on demand."""
+    def __init__(self, paths=None):
+        self.paths = [os.path.abspath(p) for p in (paths or [REPO_DIR])]
+        self.specs = {}
+        self.errors = {}    # path -> error message for files that could not be scanned
+        self._loaded = {}
+        self.discover()
+
+    def discover(self):
+        for directory in self.paths:
+            for path in sorted(glob.glob(os.path.join(directory, "*.py"))):
+                try:
+                    specs = scan_file(path)
+                except (SyntaxError, UnicodeDecodeError, OSError) as e:
+                    self.errors[path] = f"{type(e).__name__}: {e}"
+                    continue
+                for spec in specs:
+                    self.specs.setdefault(spec.name, spec)
+
+    def names(self):
+        return sorted(self.specs)
+
+    def spec(self, name):
+        try:
+            return self.specs[name]
+        except KeyError:
+            raise AgentLoadError(f"Unknown agent: {name}") from None
+
+    def load(self, name):
+        """Imports the agent's module (once) and returns the agent class."""
+        if name in self._loaded:
+            return self._loaded[name]
+        spec = self.spec(name)
+        try:
+            module = self._import(spec)
+            cls = getattr(module, spec.name)
+        except Exception as e:
+            raise AgentLoadError(f"Failed to load {name} from {spec.path}: {type(e).__name__}: {e}") from e
+        self._loaded[name] = cls
+        return cls
+
+    def _import(self, spec):
+        directory = os.path.dirname(spec.path)
+        module = sys.modules.get(spec.module)
+        if module is not None and os.path.abspath(getattr(module, "__file__", "")) == spec.path:
+            return module
+        # Submissions import board/config by name, so their folder and the
+        # engine's folder must both be importable.
+        for path in (REPO_DIR, directory):
+            if path not in sys.path:
+                sys.path.append(path)
+        if directory == REPO_DIR and module is None:
+            return importlib.import_module(spec.module)
+
+        import_spec = importlib.util.spec_from_file_location(spec.module, spec.path)
+        module = importlib.util.module_from_spec(import_spec)
+        # Registered under its own name so classes stay picklable for worker
+        # processes. A module of the same name loaded from another directory
+        # (another version of the agent) is replaced in sys.modules but keeps working.
+        sys.modules[spec.module] = module
+        try:
+            import_spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[spec.module]
+            raise
+        return module
+
+
+def main():
+    registry = AgentRegistry(sys.argv[1:] or None)
+    print(f"{'Agent':<12} {'Module':<14} {'Depth':>5}  Path")
+    for name in registry.names():
+        spec = registry.spec(name)
+        depth = "-" if spec.depth is None else spec.depth
+        print(f"{spec.name:<12} {spec.module:<14} {depth:>5}  {spec.path}")
+    for path, error in registry.errors.items():
+        print(f"skipped {path}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import copy
 import time
 from config import *
 from board import *
+from search_stats import SearchStats
 
 class B23CM1036:
     """
@@ -14,6 +15,7 @@ class B23CM1036:
         self.board = board
         self.nodes_expanded = 0
         self.depth = 3 ## set depth as you see fit and use it further for your works. 
+        self.stats = SearchStats()
 
         
     def get_best_move(self):
@@ -22,6 +24,7 @@ class B23CM1036:
         This method must be implemented.
         """
         self.nodes_expanded = 0
+        self.stats.reset()
         best_move = None
         is_maximizing_player = self.board.white_to_move
 
@@ -35,6 +38,7 @@ class B23CM1036:
         # Simple move ordering: check captures first. This significantly improves alpha-beta pruning.
         ordered_moves = sorted(legal_moves, key=lambda move: move.piece_captured != EMPTY_SQUARE, reverse=True)
 
+        self.stats.begin_iteration(self.depth)
         for move in ordered_moves:
             self.board.make_move(move)
             # The next turn belongs to the opponent, so we flip the 'is_maximizing_player' flag.
@@ -50,6 +54,10 @@ class B23CM1036:
                     best_value = board_value
                     best_move = move
         
+        self.stats.end_iteration(self.depth)
+        self.stats.score = best_value
+        self.stats.finish()
+
         # Fallback in case no best move is found (should only happen in rare edge cases)
         if best_move is None and legal_moves:
             return legal_moves[0]
@@ -61,6 +69,7 @@ class B23CM1036:
         Recursive helper function for the Minimax algorithm with Alpha-Beta pruning.
         """
         self.nodes_expanded += 1
+        self.stats.nodes += 1
 
         game_state = self.board.get_game_state()
         if depth == 0 or game_state != 'ongoing':
@@ -72,24 +81,30 @@ class B23CM1036:
 
         if is_maximizing_player:
             max_eval = -float('inf')
-            for move in ordered_moves:
+            for i, move in enumerate(ordered_moves):
                 self.board.make_move(move)
                 evaluation = self.minimax(depth - 1, alpha, beta, False)
                 self.board.undo_move()
                 max_eval = max(max_eval, evaluation)
                 alpha = max(alpha, evaluation)
                 if beta <= alpha:
+                    self.stats.cutoffs += 1
+                    if i == 0:
+                        self.stats.first_move_cutoffs += 1
                     break  # Beta cutoff
             return max_eval
         else:  # Minimizing player
             min_eval = float('inf')
-            for move in ordered_moves:
+            for i, move in enumerate(ordered_moves):
                 self.board.make_move(move)
                 evaluation = self.minimax(depth - 1, alpha, beta, True)
                 self.board.undo_move()
                 min_eval = min(min_eval, evaluation)
                 beta = min(beta, evaluation)
                 if beta <= alpha:
+                    self.stats.cutoffs += 1
+                    if i == 0:
+                        self.stats.first_move_cutoffs += 1
                     break  # Alpha cutoff
             return min_eval
         
@@ -0,0 +1,253 @@
+"""
+Reproducible agent benchmark over a fixed position set.
+
+Every agent searches every position from positions.BENCHMARK_POSITIONS
+- at a fixed depth (agent time limits lifted), and
+- at a fixed time per move (only for agents that accept a SearchDeadline).
+
+For each search the benchmark records wall time, time to each completed
+depth, nodes, NPS, depth reached and the chosen move; with --memory a second,
+traced pass records peak Python memory. The random module is reseeded before
+every search, so agents with random tie-breaks (B22EE088's jitter, B22CS061's
+30% second-best pick, the random movers) make the same choices on every run.
+
+Usage:
+    python benchmark.py                                   # tournament agents
+    python benchmark.py B22CH0322 B22CS061 --depth 3 --time 0.5
+    python benchmark.py --out bench.json --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json --threshold 10
+    python benchmark.py B22CH0322 --eval-terms                # per-term evaluation costs
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from agent_registry import AgentRegistry
+from board import GameEngine, move_name
+from deadline import SearchDeadline, accepts_deadline
+from positions import BENCHMARK_POSITIONS
+from profiling import EvalTermProfiler
+from tournament import DEFAULT_AGENTS
+
+# Attributes the agents use for their own per-move time budget.
+TIME_LIMIT_ATTRIBUTES = ("time_limit", "max_time_per_move")
+UNLIMITED_DEPTH = 64
+
+
+def _make_player(player_type, fen, depth=None, time_limit=None):
+    engine = GameEngine()
+    engine.load_fen(fen)
+    player = player_type(engine)
+    if depth is not None:
+        player.depth = depth
+    for attr in TIME_LIMIT_ATTRIBUTES:
+        if hasattr(player, attr):
+            setattr(player, attr, time_limit if time_limit is not None else float("inf"))
+    return player
+
+
+def _search(player, seed, deadline=None):
+    random.seed(seed)
+    start = time.perf_counter()
+    if deadline is not None:
+        move = player.get_best_move(deadline=deadline)
+    else:
+        move = player.get_best_move()
+    return move, time.perf_counter() - start
+
+
+def _record(player, move, elapsed):
+    stats = getattr(player, "stats", None)
+    nodes = stats.nodes + stats.qnodes if stats is not None else player.nodes_expanded
+    record = {
+        "move": move_name(move) if move else None,
+        "time": round(elapsed, 6),
+        "nodes": nodes,
+        "nps": round(nodes / elapsed, 1) if elapsed > 0 else 0.0,
+        "depth": stats.depth_reached if stats is not None else None,
+        "time_to_depth": {},
+    }
+    if stats is not None:
+        total = 0.0
+        for depth, seconds in sorted(stats.iteration_times.items()):
+            total += seconds
+            record["time_to_depth"][str(depth)] = round(total, 6)
+    return record
+
+
+def _peak_memory(player_type, fen, seed, depth=None, time_limit=None):
+    player = _make_player(player_type, fen, depth, time_limit)
+    deadline = SearchDeadline(time_limit) if time_limit is not None else None
+    tracemalloc.start()
+    try:
+        _search(player, seed, deadline)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_agent(player_type, positions, depth=None, time_limit=None, seed=1, memory=False):
+    """Returns {position name: {"depth": record, "time": record}} for one agent."""
+    results = {}
+    for name, fen in positions.items():
+        entry = {}
+        if depth is not None:
+            player = _make_player(player_type, fen, depth=depth)
+            move, elapsed = _search(player, seed)
+            entry["depth"] = _record(player, move, elapsed)
+            if memory:
+                entry["depth"]["peak_memory"] = _peak_memory(player_type, fen, seed, depth=depth)
+
+        if time_limit is not None:
+            player = _make_player(player_type, fen, depth=UNLIMITED_DEPTH, time_limit=time_limit)
+            if accepts_deadline(player):
+                move, elapsed = _search(player, seed, SearchDeadline(time_limit))
+                entry["time"] = _record(player, move, elapsed)
+                if memory:
+                    entry["time"]["peak_memory"] = _peak_memory(
+                        player_type, fen, seed, depth=UNLIMITED_DEPTH, time_limit=time_limit)
+        results[name] = entry
+    return results
+
+
+def profile_eval_terms(player_type, positions, depth=3, seed=1, terms=None):
+    """
+    Runs the fixed-depth searches again with an EvalTermProfiler attached
+    (a separate pass, so the wrappers do not distort the timings above).
+    """
+    profiler = EvalTermProfiler(terms)
+    for fen in positions.values():
+        player = profiler.attach(_make_player(player_type, fen, depth=depth))
+        _search(player, seed)
+        profiler.detach(player)
+    return profiler
+
+
+def run_benchmark(agent_names, depth=3, time_limit=0.5, seed=1, memory=False, registry=None):
+    registry = registry or AgentRegistry()
+    report = {
+        "meta": {
+            "depth": depth,
+            "time_limit": time_limit,
+            "seed": seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    for name in agent_names:
+        print(f"Benchmarking {name}...", file=sys.stderr)
+        player_type = registry.load(name)
+        report["results"][name] = benchmark_agent(
+            player_type, BENCHMARK_POSITIONS, depth, time_limit, seed, memory)
+    return report
+
+
+def _total_time(positions, mode):
+    return sum(modes[mode]["time"] for modes in positions.values() if mode in modes)
+
+
+def compare(report, baseline, threshold=10.0):
+    """
+    Compares a report with a baseline. Returns a list of human-readable
+    findings: per agent and mode, total time regressions above `threshold`
+    percent (single positions are too short to time reliably); per position,
+    changed node counts and moves at fixed depth, which mean the search
+    itself changed.
+    """
+    findings = []
+    for agent, positions in report["results"].items():
+        base_positions = baseline.get("results", {}).get(agent)
+        if base_positions is None:
+            continue
+        shared = {name: modes for name, modes in positions.items() if name in base_positions}
+        for mode in ("depth", "time"):
+            now = _total_time(shared, mode)
+            before = _total_time({name: base_positions[name] for name in shared}, mode)
+            if before > 0:
+                change = 100.0 * (now - before) / before
+                if change > threshold:
+                    findings.append(f"{agent} [{mode}]: time {before:.3f}s -> {now:.3f}s (+{change:.1f}%)")
+
+        for position, modes in shared.items():
+            record, base = modes.get("depth"), base_positions[position].get("depth")
+            if record is None or base is None:
+                continue
+            if record["nodes"] != base["nodes"]:
+                findings.append(f"{agent} {position}: nodes {base['nodes']} -> {record['nodes']}")
+            if record["move"] != base["move"]:
+                findings.append(f"{agent} {position}: move {base['move']} -> {record['move']}")
+    return findings
+
+
+def print_summary(report):
+    print(f"{'Agent':<12} {'Mode':<6} {'Positions':>9} {'Time(s)':>9} {'Nodes':>10} {'NPS':>9} {'AvgDepth':>8}")
+    for agent, positions in report["results"].items():
+        for mode in ("depth", "time"):
+            records = [modes[mode] for modes in positions.values() if mode in modes]
+            if not records:
+                continue
+            total_time = sum(r["time"] for r in records)
+            nodes = sum(r["nodes"] for r in records)
+            depths = [r["depth"] for r in records if r["depth"] is not None]
+            avg_depth = sum(depths) / len(depths) if depths else 0.0
+            nps = nodes / total_time if total_time > 0 else 0.0
+            print(f"{agent:<12} {mode:<6} {len(records):>9} {total_time:>9.3f} {nodes:>10} {nps:>9.0f} {avg_depth:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark agents on a fixed position set.")
+    parser.add_argument("agents", nargs="*", help="agent class names (default: the tournament agents)")
+    parser.add_argument("--depth", type=int, default=3, help="fixed search depth (0 to skip)")
+    parser.add_argument("--time", type=float, default=0.5, help="fixed time per move in seconds (0 to skip)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--memory", action="store_true", help="also measure peak memory (slower)")
+    parser.add_argument("--out", default=None, help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="compare against this saved result file")
+    parser.add_argument("--save-baseline", default=None, help="write the results as a new baseline")
+    parser.add_argument("--threshold", type=float, default=10.0, help="time regression threshold in percent")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--eval-terms", action="store_true",
+                        help="also print a cost-vs-impact table of each agent's evaluation terms")
+    parser.add_argument("--terms", nargs="+", default=None,
+                        help="evaluation methods to profile (default: the agent's EVAL_TERMS, else its _evaluate_* methods)")
+    args = parser.parse_args()
+
+    registry = AgentRegistry()
+    names = args.agents or list(DEFAULT_AGENTS)
+    report = run_benchmark(names, args.depth or None, args.time or None, args.seed,
+                           args.memory, registry)
+    print_summary(report)
+
+    if args.eval_terms:
+        for name in names:
+            profiler = profile_eval_terms(registry.load(name), BENCHMARK_POSITIONS,
+                                          args.depth or 3, args.seed, args.terms)
+            print("\n" + profiler.format_table(f"Evaluation terms of {name} (depth {args.depth or 3}):"))
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        findings = compare(report, baseline, args.threshold)
+        if findings:
+            print(f"\n{len(findings)} differences against {args.baseline}:")
+            for finding in findings:
+                print("  " + finding)
+            if args.fail_on_regression:
+                sys.exit(1)
+        else:
+            print(f"\nNo differences against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,76 @@
 """
 The GameEngine for Chess game.
 """
+import random
 from config import *
 
+# Zobrist hashing: one fixed 64-bit random number per (piece, square) plus one
+# for the side to move. The seed is fixed so keys are stable across processes
+# and runs (they are stored in game databases).
+_zobrist_rng = random.Random(20250404)
+ZOBRIST_PIECE = {
+    piece: [[_zobrist_rng.getrandbits(64) for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
+    for piece in (WHITE_PAWN, BLACK_PAWN, WHITE_KNIGHT, BLACK_KNIGHT,
+                  WHITE_BISHOP, BLACK_BISHOP, WHITE_KING, BLACK_KING)
+}
+ZOBRIST_WHITE_TO_MOVE = _zobrist_rng.getrandbits(64)
+# The same numbers with the files reversed: XORing pieces in with these keys
+# gives the key of the left-right mirror image of the board.
+ZOBRIST_MIRROR = {piece: [row[::-1] for row in table] for piece, table in ZOBRIST_PIECE.items()}
+
+
+def square_index(r, c):
+    """Maps (row, col) to 0..31 in row-major order (a8 = 0, d1 = 31)."""
+    return r * BOARD_WIDTH + c
+
+
+def square_name(r, c):
+    """Algebraic name of a square, e.g. (7, 0) -> 'a1'."""
+    return "abcd"[c] + str(BOARD_HEIGHT - r)
+
+
+def move_name(move):
+    """Coordinate notation of a move, e.g. 'b1c3'."""
+    return square_name(move.start_row, move.start_col) + square_name(move.end_row, move.end_col)
+
+
+def mirror_square(r, c):
+    """The square reflected across the vertical centre line, e.g. a1 <-> d1."""
+    return r, BOARD_WIDTH - 1 - c
+
+
+def mirror_board(board):
+    """A copy of the board reflected left-right."""
+    return [row[::-1] for row in board]
+
+
+def mirror_move(move):
+    """The same move on the mirrored board (pieces are unchanged)."""
+    mirrored = Move.__new__(Move)
+    mirrored.start_row, mirrored.start_col = mirror_square(move.start_row, move.start_col)
+    mirrored.end_row, mirrored.end_col = mirror_square(move.end_row, move.end_col)
+    mirrored.piece_moved = move.piece_moved
+    mirrored.piece_captured = move.piece_captured
+    return mirrored
+
+
+def mirror_move_code(code):
+    """mirror_move for packed codes: reflects the file bits of both squares."""
+    return code ^ ((BOARD_WIDTH - 1) << 5 | (BOARD_WIDTH - 1))
+
+
+def encode_move(move):
+    """Packs a move into 10 bits: from-square << 5 | to-square."""
+    return ((move.start_row * BOARD_WIDTH + move.start_col) << 5) | \
+           (move.end_row * BOARD_WIDTH + move.end_col)
+
+
+def decode_move(code, board):
+    """Rebuilds the Move for a packed code on the given board."""
+    start, end = code >> 5, code & 31
+    return Move(divmod(start, BOARD_WIDTH), divmod(end, BOARD_WIDTH), board)
+
+
 class Move:
     def __init__(self, start_square, end_square, board):
         self.start_row, self.start_col = start_square
@@ -27,10 +95,114 @@ class GameEngine:
         self.board = self.get_initial_board()
         self.white_to_move = True
         self.move_log = []
+        self.board_key = self.compute_board_key()
+        self.mirror_key = self.compute_mirror_key()
+        self.pawn_key = self.compute_pawn_key()
        #history
         self.position_history = {}
         self.update_position_history()
 
+    def compute_board_key(self):
+        """Zobrist key of the piece placement, computed from scratch."""
+        key = 0
+        for r, row in enumerate(self.board):
+            for c, piece in enumerate(row):
+                if piece != EMPTY_SQUARE:
+                    key ^= ZOBRIST_PIECE[piece][r][c]
+        return key
+
+    def compute_mirror_key(self):
+        """Zobrist key of the left-right mirrored piece placement, computed from scratch."""
+        key = 0
+        for r, row in enumerate(self.board):
+            for c, piece in enumerate(row):
+                if piece != EMPTY_SQUARE:
+                    key ^= ZOBRIST_MIRROR[piece][r][c]
+        return key
+
+    def compute_pawn_key(self):
+        """Zobrist key of the pawns alone (for pawn-structure caches), computed from scratch."""
+        key = 0
+        for r, row in enumerate(self.board):
+            for c, piece in enumerate(row):
+                if piece == WHITE_PAWN or piece == BLACK_PAWN:
+                    key ^= ZOBRIST_PIECE[piece][r][c]
+        return key
+
+    def position_key(self):
+        """64-bit Zobrist key of the current position (placement + side to move)."""
+        return self.board_key ^ ZOBRIST_WHITE_TO_MOVE if self.white_to_move else self.board_key
+
+    def mirror_position_key(self):
+        """position_key() of the left-right mirror image of the current position."""
+        return self.mirror_key ^ ZOBRIST_WHITE_TO_MOVE if self.white_to_move else self.mirror_key
+
+    def canonical_key(self):
+        """
+        The smaller of position_key() and mirror_position_key(). With no
+        castling or en passant a position and its mirror have the same
+        game-theoretic value, so tables keyed by this store one entry per
+        symmetric pair. Moves stored under it must be passed through
+        mirror_move() when is_mirrored() differs between store and probe.
+        """
+        key, mirrored = self.position_key(), self.mirror_position_key()
+        return key if key <= mirrored else mirrored
+
+    def is_mirrored(self):
+        """True if canonical_key() is the key of the mirrored position."""
+        return self.mirror_position_key() < self.position_key()
+
+    def set_position(self, board, white_to_move):
+        """Replaces the position, clearing the move log and position history."""
+        self.board = [row[:] for row in board]
+        self.white_to_move = white_to_move
+        self.move_log = []
+        self.board_key = self.compute_board_key()
+        self.mirror_key = self.compute_mirror_key()
+        self.pawn_key = self.compute_pawn_key()
+        self.position_history = {}
+        self.update_position_history()
+
+    def get_fen(self):
+        """
+        Serialises the position as a FEN-like string: ranks 8 to 1 separated
+        by '/', white pieces upper case (PNBK), black lower case, digits for
+        runs of empty squares, then 'w' or 'b' for the side to move.
+        """
+        ranks = []
+        for row in self.board:
+            rank, empty = "", 0
+            for piece in row:
+                if piece == EMPTY_SQUARE:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += piece[1] if piece[0] == 'w' else piece[1].lower()
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        return "/".join(ranks) + (" w" if self.white_to_move else " b")
+
+    def load_fen(self, fen):
+        """Sets up the position described by a string from get_fen()."""
+        placement, side = fen.split()
+        board = []
+        for rank in placement.split("/"):
+            row = []
+            for ch in rank:
+                if ch.isdigit():
+                    row.extend([EMPTY_SQUARE] * int(ch))
+                else:
+                    row.append(('w' if ch.isupper() else 'b') + ch.upper())
+            if len(row) != BOARD_WIDTH:
+                raise ValueError(f"Bad rank {rank!r} in {fen!r}")
+            board.append(row)
+        if len(board) != BOARD_HEIGHT or side not in ("w", "b"):
+            raise ValueError(f"Bad position {fen!r}")
+        self.set_position(board, side == "w")
+
     def update_position_history(self):
         """Adds the current board state to the history log."""
         board_tuple = tuple(tuple(row) for row in self.board)
@@ -54,6 +226,7 @@ class GameEngine:
     def make_move(self, move):
         self.board[move.start_row][move.start_col] = EMPTY_SQUARE
         self.board[move.end_row][move.end_col] = move.piece_moved
+        self._update_board_key(move)
         self.move_log.append(move)
         self.white_to_move = not self.white_to_move
         self.update_position_history()
@@ -67,8 +240,27 @@ class GameEngine:
         move = self.move_log.pop()
         self.board[move.start_row][move.start_col] = move.piece_moved
         self.board[move.end_row][move.end_col] = move.piece_captured
+        self._update_board_key(move)
         self.white_to_move = not self.white_to_move
 
+    def _update_board_key(self, move):
+        """XORs a move in or out of the board keys (the operation is its own inverse)."""
+        sr, sc, er, ec = move.start_row, move.start_col, move.end_row, move.end_col
+        moved = ZOBRIST_PIECE[move.piece_moved]
+        mirrored = ZOBRIST_MIRROR[move.piece_moved]
+        key = self.board_key ^ moved[sr][sc] ^ moved[er][ec]
+        mirror_key = self.mirror_key ^ mirrored[sr][sc] ^ mirrored[er][ec]
+        if move.piece_moved[1] == 'P':
+            self.pawn_key ^= moved[sr][sc] ^ moved[er][ec]
+        if move.piece_captured != EMPTY_SQUARE:
+            captured = ZOBRIST_PIECE[move.piece_captured][er][ec]
+            key ^= captured
+            mirror_key ^= ZOBRIST_MIRROR[move.piece_captured][er][ec]
+            if move.piece_captured[1] == 'P':
+                self.pawn_key ^= captured
+        self.board_key = key
+        self.mirror_key = mirror_key
+
     def get_legal_moves(self):
         possible_moves = self._get_all_possible_moves()
         legal_moves = []
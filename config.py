@@ -26,6 +26,19 @@ PIECE_VALUES = {
     BLACK_KING: -600
 }
 
+# Tournament points for capturing a piece (run_game's scoring rules). Kept
+# apart from PIECE_VALUES, which texel.py may retune for the evaluation.
+CAPTURE_POINTS = {
+    WHITE_PAWN: 20,
+    BLACK_PAWN: 20,
+    WHITE_KNIGHT: 70,
+    BLACK_KNIGHT: 70,
+    WHITE_BISHOP: 70,
+    BLACK_BISHOP: 70,
+    WHITE_KING: 600,
+    BLACK_KING: 600
+}
+
 # Piece-Square Tables (PST) for positional evaluation
 PAWN_PST = [
     [5, 5, 5, 5],
@@ -71,6 +84,13 @@ KING_PST_LATE_GAME = [
     [-30, -20, -20, -30]
 ]
 
+# Evaluation weights (used by B22CH0322; fitted by texel.py)
+KING_SAFETY_PENALTY = 30      # king left its back ranks before the endgame
+MOBILITY_WEIGHT = 2           # per legal move of difference
+CENTER_CONTROL_BONUS = 10     # per piece on the four central squares
+PASSED_PAWN_BONUS = 15
+PASSED_PAWN_RANK_BONUS = 5    # per rank advanced beyond the second
+
 PIECE_SYMBOLS = {
     'wP': '♙', 'bP': '♟', 'wN': '♘', 'bN': '♞',
     'wB': '♗', 'bB': '♝', 'wK': '♔', 'bK': '♚',
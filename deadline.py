@@ -0,0 +1,92 @@
+"""
+Cooperative cancellation for searches.
+
+The runner passes a SearchDeadline to agents whose get_best_move accepts a
+`deadline` argument. Searches call `should_stop()` at every node; it only
+reads the clock every `check_every` calls, so polling costs a counter
+decrement per node. A deadline can also be stopped from outside, either by
+calling stop() or through a threading/multiprocessing Event (for example
+when the opponent's real move arrives during pondering).
+
+    def get_best_move(self, deadline=None):
+        deadline = (deadline or SearchDeadline()).within(self.time_limit)
+        ...
+        if deadline.should_stop():
+            raise TimeoutError
+"""
+import inspect
+import time
+
+
+class SearchDeadline:
+    """Time limit plus external stop signal, polled cheaply from inside a search."""
+    def __init__(self, time_limit=None, check_every=64, stop_event=None, parent=None):
+        self.start_time = time.perf_counter()
+        self.end_time = None if time_limit is None else self.start_time + time_limit
+        self.check_every = check_every
+        self.stop_event = stop_event
+        self.parent = parent
+        self._countdown = check_every
+        self._stopped = False
+
+    def should_stop(self):
+        """Cheap poll for use at every node: checks the clock every `check_every` calls."""
+        if self._stopped:
+            return True
+        self._countdown -= 1
+        if self._countdown > 0:
+            return False
+        self._countdown = self.check_every
+        return self.expired()
+
+    def expired(self):
+        """Checks the clock and stop signals now."""
+        if self._stopped:
+            return True
+        if self.end_time is not None and time.perf_counter() >= self.end_time:
+            self._stopped = True
+        elif self.stop_event is not None and self.stop_event.is_set():
+            self._stopped = True
+        elif self.parent is not None and self.parent.expired():
+            self._stopped = True
+        return self._stopped
+
+    def stop(self):
+        """Requests the search to stop at its next poll."""
+        self._stopped = True
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    def remaining(self):
+        """Seconds left before the time limit, or None if there is none."""
+        if self.end_time is None:
+            return None
+        return max(0.0, self.end_time - time.perf_counter())
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def within(self, seconds, check_every=None):
+        """
+        Returns a child deadline that expires after `seconds` or when this one
+        does, whichever comes first. Stopping this deadline stops the child.
+        """
+        child = SearchDeadline(seconds, check_every or self.check_every, parent=self)
+        if self.end_time is not None and (child.end_time is None or self.end_time < child.end_time):
+            child.end_time = self.end_time
+        return child
+
+
+def accepts_deadline(player):
+    """True if the player's get_best_move takes a `deadline` argument."""
+    try:
+        return "deadline" in inspect.signature(player.get_best_move).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def request_move(player, deadline=None):
+    """Calls player.get_best_move, passing `deadline` when the agent supports it."""
+    if deadline is not None and accepts_deadline(player):
+        return player.get_best_move(deadline=deadline)
+    return player.get_best_move()
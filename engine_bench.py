@@ -0,0 +1,219 @@
+"""
+Micro-benchmarks for GameEngine primitives, independent of any agent.
+
+Each primitive is timed on every position in positions.BENCHMARK_POSITIONS:
+after `warmup` untimed calls, `repeat` samples of `number` calls are taken
+per position (with the garbage collector off, as timeit does). Results are
+per-operation times in microseconds, summarised as min/median/p90/p99 over
+all samples.
+
+Usage:
+    python engine_bench.py                          # all primitives
+    python engine_bench.py make_undo legal_moves --repeat 20
+    python engine_bench.py --save-baseline engine_base.json
+    python engine_bench.py --baseline engine_base.json --threshold 15
+
+With --baseline the run exits with status 1 if any primitive's median is
+more than `threshold` percent slower than in the baseline.
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+
+from board import GameEngine
+from config import *
+from positions import BENCHMARK_POSITIONS
+
+
+# Each factory prepares a primitive for one position and returns
+# (callable, operations per call).
+
+def _make_undo(engine):
+    moves = engine.get_legal_moves()
+    def run():
+        for move in moves:
+            engine.make_move(move)
+            engine.undo_move()
+    return run, len(moves)
+
+
+def _legal_moves(engine):
+    return engine.get_legal_moves, 1
+
+
+def _possible_moves(engine):
+    return engine._get_all_possible_moves, 1
+
+
+def _square_attacked(engine):
+    color = 'w' if engine.white_to_move else 'b'
+    squares = [(r, c) for r in range(BOARD_HEIGHT) for c in range(BOARD_WIDTH)]
+    def run():
+        for square in squares:
+            engine._is_square_attacked(square, color)
+    return run, len(squares)
+
+
+def _game_state(engine):
+    return engine.get_game_state, 1
+
+
+def _position_key(engine):
+    return engine.position_key, 1
+
+
+def _compute_board_key(engine):
+    return engine.compute_board_key, 1
+
+
+def _repetition_count(engine):
+    return engine.get_repetition_count, 1
+
+
+PRIMITIVES = {
+    "make_undo": _make_undo,                    # one make_move + undo_move pair
+    "legal_moves": _legal_moves,                # get_legal_moves()
+    "possible_moves": _possible_moves,          # _get_all_possible_moves()
+    "square_attacked": _square_attacked,        # _is_square_attacked() on one square
+    "game_state": _game_state,                  # get_game_state()
+    "position_key": _position_key,              # incremental Zobrist key
+    "compute_board_key": _compute_board_key,    # Zobrist key from scratch
+    "repetition_count": _repetition_count,      # tuple-of-rows history lookup
+}
+
+
+def _percentile(sorted_values, p):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def time_primitive(factory, positions, number=50, repeat=10, warmup=20):
+    """Returns per-operation samples in microseconds for one primitive."""
+    samples = []
+    for fen in positions.values():
+        engine = GameEngine()
+        engine.load_fen(fen)
+        run, ops = factory(engine)
+        if ops == 0:
+            continue
+        for _ in range(warmup):
+            run()
+
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for _ in range(number):
+                    run()
+                elapsed = time.perf_counter() - start
+                samples.append(elapsed * 1e6 / (number * ops))
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    return samples
+
+
+def summarise(samples):
+    values = sorted(samples)
+    return {
+        "samples": len(values),
+        "min": round(values[0], 4) if values else 0.0,
+        "median": round(_percentile(values, 50), 4),
+        "p90": round(_percentile(values, 90), 4),
+        "p99": round(_percentile(values, 99), 4),
+        "mean": round(sum(values) / len(values), 4) if values else 0.0,
+    }
+
+
+def run_benchmark(names=None, number=50, repeat=10, warmup=20, positions=BENCHMARK_POSITIONS):
+    report = {
+        "meta": {
+            "number": number,
+            "repeat": repeat,
+            "warmup": warmup,
+            "positions": len(positions),
+            "unit": "us/op",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    for name in names or PRIMITIVES:
+        samples = time_primitive(PRIMITIVES[name], positions, number, repeat, warmup)
+        report["results"][name] = summarise(samples)
+    return report
+
+
+def compare(report, baseline, threshold=10.0):
+    """Returns (primitive, old median, new median, % change) for slowdowns above `threshold`."""
+    regressions = []
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or base["median"] <= 0:
+            continue
+        change = 100.0 * (result["median"] - base["median"]) / base["median"]
+        if change > threshold:
+            regressions.append((name, base["median"], result["median"], change))
+    return regressions
+
+
+def print_report(report, baseline=None):
+    print(f"{'Primitive':<18} {'Min':>9} {'Median':>9} {'P90':>9} {'P99':>9} {'Change':>8}   (us/op)")
+    for name, r in report["results"].items():
+        change = ""
+        base = (baseline or {}).get("results", {}).get(name)
+        if base and base["median"] > 0:
+            change = f"{100.0 * (r['median'] - base['median']) / base['median']:+.1f}%"
+        print(f"{name:<18} {r['min']:>9.3f} {r['median']:>9.3f} {r['p90']:>9.3f} {r['p99']:>9.3f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark GameEngine primitives.")
+    parser.add_argument("primitives", nargs="*",
+                        help="primitives to time (default: all): " + ", ".join(PRIMITIVES))
+    parser.add_argument("--number", type=int, default=50, help="calls per sample")
+    parser.add_argument("--repeat", type=int, default=10, help="samples per position")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed calls per position")
+    parser.add_argument("--out", default=None, help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="compare against this saved result file")
+    parser.add_argument("--save-baseline", default=None, help="write the results as a new baseline")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed median slowdown in percent")
+    args = parser.parse_args()
+    unknown = [name for name in args.primitives if name not in PRIMITIVES]
+    if unknown:
+        parser.error(f"unknown primitives: {', '.join(unknown)}")
+
+    report = run_benchmark(args.primitives or None, args.number, args.repeat, args.warmup)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: median {old:.3f} -> {new:.3f} us/op (+{change:.1f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No primitive slower than {args.threshold}% against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Evaluation cache: static evaluations keyed by GameEngine.position_key().
+
+Transpositions and iterative-deepening re-searches evaluate the same
+positions again and again. EvalCache remembers the last `capacity`
+results, evicting the least recently used entry when full (an
+OrderedDict, so both lookups and evictions are O(1)). An agent keeps one
+cache for the whole game, so entries from earlier moves stay useful.
+
+Any agent can cache an evaluation method whose result depends only on the
+position with the decorator:
+
+    class MyAgent:
+        def __init__(self, board):
+            self.board = board
+            self.eval_cache = EvalCache()
+            self.stats = SearchStats()
+
+        @cached_evaluation()            # engine attribute name, default "board"
+        def evaluate_board(self):
+            ...
+
+Agents with window-dependent (lazy) evaluations call get/put themselves
+and only put exact scores. Lookups are counted in `stats.eval_probes` /
+`stats.eval_hits` when an agent passes its SearchStats.
+"""
+import functools
+from collections import OrderedDict
+
+
+class EvalCache:
+    """Bounded LRU map from position key to static evaluation."""
+    def __init__(self, capacity=1 << 17):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.probes = 0
+        self.hits = 0
+
+    def get(self, key, stats=None):
+        """The cached score for `key`, or None."""
+        self.probes += 1
+        if stats is not None:
+            stats.eval_probes += 1
+        score = self.entries.get(key)
+        if score is not None:
+            self.hits += 1
+            if stats is not None:
+                stats.eval_hits += 1
+            self.entries.move_to_end(key)
+        return score
+
+    def put(self, key, score):
+        self.entries[key] = score
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def cached_evaluation(engine_attr="board", cache_attr="eval_cache"):
+    """
+    Decorator for agent evaluation methods: looks the position up in
+    `self.<cache_attr>` (created on first use) before calling the method.
+    The method's arguments are not part of the key, so its result must
+    depend on the position on `self.<engine_attr>` only.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, cache_attr, None)
+            if cache is None:
+                cache = EvalCache()
+                setattr(self, cache_attr, cache)
+            key = getattr(self, engine_attr).position_key()
+            score = cache.get(key, getattr(self, "stats", None))
+            if score is None:
+                score = method(self, *args, **kwargs)
+                cache.put(key, score)
+            return score
+        return wrapper
+    return decorator
@@ -0,0 +1,213 @@
+"""
+Compressed game database with a position index.
+
+Games are stored in an SQLite file. Each game's moves are a BLOB of 2 bytes per
+move (the 10-bit from/to code from board.encode_move, little endian), and every
+position reached is indexed by its 64-bit Zobrist key, so questions like
+"which games reached this position and how did they end" are one indexed
+lookup. Games played from a custom start position keep its FEN in `start`
+(NULL means the initial position). Reading is streamed through cursors, so the database can hold
+millions of games without loading them into memory.
+
+    with GameDatabase("games.db") as db:
+        db.add_game(engine.move_log, white="B22CH032", black="B22CS061", result="1-0")
+        for game_id, ply, result in db.games_reaching(engine):
+            ...
+        for ply, engine, move in db.replay(game_id):
+            ...
+"""
+import sqlite3
+import struct
+from board import GameEngine, encode_move, decode_move
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    white TEXT,
+    black TEXT,
+    result TEXT,
+    reason TEXT,
+    white_points INTEGER,
+    black_points INTEGER,
+    plies INTEGER,
+    moves BLOB,
+    start TEXT
+);
+CREATE TABLE IF NOT EXISTS positions (
+    key INTEGER NOT NULL,
+    game INTEGER NOT NULL,
+    ply INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS positions_key ON positions (key);
+"""
+
+
+def pack_moves(moves):
+    """Encodes a sequence of Moves as 2 bytes per move."""
+    codes = [encode_move(m) for m in moves]
+    return struct.pack(f"<{len(codes)}H", *codes)
+
+
+def unpack_moves(blob):
+    """Returns the list of move codes stored in a moves BLOB."""
+    return list(struct.unpack(f"<{len(blob) // 2}H", blob))
+
+
+def _signed(key):
+    """SQLite integers are signed 64-bit; store Zobrist keys in that range."""
+    return key - (1 << 64) if key >= (1 << 63) else key
+
+
+class GameDatabase:
+    """Append-only game store backed by SQLite."""
+    def __init__(self, path, commit_every=100):
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(games)")]
+        if "start" not in columns:
+            # Databases created before start positions were recorded.
+            self.conn.execute("ALTER TABLE games ADD COLUMN start TEXT")
+        self.commit_every = commit_every
+        self._pending = 0
+
+    # ---------- writing ----------
+    def add_game(self, moves, white=None, black=None, result=None, reason=None,
+                 white_points=None, black_points=None, start=None):
+        """
+        Stores a game given its moves (for example `engine.move_log`) from the
+        initial position or from the FEN `start`, and indexes every position
+        it reached. Returns the new game id.
+        """
+        engine = GameEngine()
+        if start:
+            engine.load_fen(start)
+        keys = [engine.position_key()]
+        for move in moves:
+            engine.make_move(move)
+            keys.append(engine.position_key())
+
+        cursor = self.conn.execute(
+            "INSERT INTO games (white, black, result, reason, white_points, black_points, plies, moves, start) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (white, black, result, reason, white_points, black_points, len(moves), pack_moves(moves),
+             start),
+        )
+        game_id = cursor.lastrowid
+        self.conn.executemany(
+            "INSERT INTO positions (key, game, ply) VALUES (?, ?, ?)",
+            ((_signed(key), game_id, ply) for ply, key in enumerate(keys)),
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+        return game_id
+
+    def add_result(self, moves, result):
+        """Stores a game using the result dict returned by run_game."""
+        return self.add_game(
+            moves, white=result["white"], black=result["black"], result=result["result"],
+            reason=result["reason"], white_points=result["white_points"],
+            black_points=result["black_points"], start=result.get("start"),
+        )
+
+    def commit(self):
+        self.conn.commit()
+        self._pending = 0
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- queries ----------
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def game_info(self, game_id):
+        """Returns the stored metadata of a game as a dict, or None."""
+        row = self.conn.execute(
+            "SELECT id, white, black, result, reason, white_points, black_points, plies, start "
+            "FROM games WHERE id = ?", (game_id,)).fetchone()
+        if row is None:
+            return None
+        names = ("id", "white", "black", "result", "reason", "white_points", "black_points", "plies",
+                 "start")
+        return dict(zip(names, row))
+
+    def games_reaching(self, position):
+        """
+        Yields (game_id, ply, result) for every game that reached `position`,
+        given either a GameEngine or a Zobrist key.
+        """
+        key = position.position_key() if isinstance(position, GameEngine) else position
+        cursor = self.conn.execute(
+            "SELECT p.game, p.ply, g.result FROM positions p JOIN games g ON g.id = p.game "
+            "WHERE p.key = ? ORDER BY p.game, p.ply", (_signed(key),))
+        yield from cursor
+
+    def result_counts(self, position):
+        """Returns {result: number of games} over games that reached `position`."""
+        counts = {}
+        seen = set()
+        for game_id, _, result in self.games_reaching(position):
+            if game_id not in seen:
+                seen.add(game_id)
+                counts[result] = counts.get(result, 0) + 1
+        return counts
+
+    # ---------- replay ----------
+    def moves(self, game_id):
+        """Returns the move codes of a game."""
+        row = self.conn.execute("SELECT moves FROM games WHERE id = ?", (game_id,)).fetchone()
+        return unpack_moves(row[0]) if row else []
+
+    def replay(self, game_id, engine=None):
+        """
+        Replays a game on `engine` (a fresh GameEngine by default), yielding
+        (ply, engine, move) after each move. The engine is shared between
+        iterations, so copy what you need before advancing.
+        """
+        row = self.conn.execute("SELECT start FROM games WHERE id = ?", (game_id,)).fetchone()
+        yield from _replay_codes(self.moves(game_id), engine, row[0] if row else None)
+
+    def iter_games(self, batch_size=1000):
+        """Streams (game_id, move codes) for all games in id order."""
+        cursor = self.conn.execute("SELECT id, moves FROM games ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for game_id, blob in rows:
+                yield game_id, unpack_moves(blob)
+
+    def replay_all(self, batch_size=1000):
+        """
+        Bulk replay: yields (game_id, ply, engine, move) for every move of
+        every game, reusing one engine per game.
+        """
+        cursor = self.conn.execute("SELECT id, moves, start FROM games ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for game_id, blob, start in rows:
+                for ply, engine, move in _replay_codes(unpack_moves(blob), start=start):
+                    yield game_id, ply, engine, move
+
+
+def _replay_codes(codes, engine=None, start=None):
+    if engine is None:
+        engine = GameEngine()
+    if start:
+        engine.load_fen(start)
+    for ply, code in enumerate(codes, 1):
+        move = decode_move(code, engine.board)
+        engine.make_move(move)
+        yield ply, engine, move
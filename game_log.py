@@ -0,0 +1,41 @@
+"""
+Structured JSONL game logs.
+
+run_game writes one compact JSON object per line through a GameLogger:
+- {"type": "move", ...} after every move (move, time, nodes, clocks, point events)
+- {"type": "game", ...} when the game ends (result, reason, points, flags, totals)
+
+Records go through a large write buffer, so logging costs one json.dumps per
+move and the file is only touched when the buffer fills or the log is closed.
+Each process should use its own log file when games run in parallel.
+"""
+import json
+
+
+class GameLogger:
+    """Buffered JSON-lines writer for move and game records."""
+    def __init__(self, path, buffer_size=1 << 16):
+        self.path = path
+        self.file = open(path, "a", buffering=buffer_size)
+
+    def write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_log(path):
+    """Yields the records of a JSONL game log."""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
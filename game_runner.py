@@ -1,11 +1,14 @@
+import json
 import time
+import uuid
 from board import GameEngine, Move
-from B22CH032 import B22CH032
-from B22EE088 import B22EE088
-from B22CS043 import B22CS043
-from B22CH0322 import B22CH0322
-from B22CS061_0 import B22CS061
-from b23cm1036 import B23CM1036
+from agent_registry import AgentRegistry
+from ponder import Ponderer
+from profiling import MoveProfiler
+from game_log import GameLogger
+from game_db import GameDatabase
+from sandbox import SandboxedPlayer
+from deadline import SearchDeadline, request_move
 from config import *
 
 # PIECE_SYMBOLS is imported from config.py
@@ -22,6 +25,10 @@ class PlayerClock:
         seconds = int(time_in_seconds % 60)
         return f"{minutes:02d}:{seconds:02d}"
 
+def _agent_name(player):
+    """Name of the agent behind `player` (sandboxed players report the wrapped class)."""
+    return getattr(player, "agent_name", player.__class__.__name__)
+
 def display_board(engine, clock, white_player, black_player):
     """
     Displays the board with grid lines and the player clock.
@@ -39,9 +46,9 @@ def display_board(engine, clock, white_player, black_player):
         
         # Add player and clock display next to the board
         if r == 2:
-            row_str += f"   Black ({black_player.__class__.__name__}): {clock.get_time_str(clock.black_time)}"
+            row_str += f"   Black ({_agent_name(black_player)}): {clock.get_time_str(clock.black_time)}"
         if r == 5:
-             row_str += f"   White ({white_player.__class__.__name__}): {clock.get_time_str(clock.white_time)}"
+             row_str += f"   White ({_agent_name(white_player)}): {clock.get_time_str(clock.white_time)}"
 
         print(row_str)
         if r < BOARD_HEIGHT - 1:
@@ -50,22 +57,80 @@ def display_board(engine, clock, white_player, black_player):
     print("     a   b   c   d")
 
 
-def run_game(white_player_type, black_player_type, total_time_seconds=60):
+def run_game(white_player_type, black_player_type, total_time_seconds=60,
+             white_ponder=False, black_ponder=False, stats_path=None,
+             profile_dir=None, profile_threshold=0.0, headless=False, log=None,
+             game_id=None, game_db=None, sandbox=False, sandbox_memory_mb=None,
+             start_fen=None, white_name=None, black_name=None):
+    """
+    Plays one game, from the initial position or from `start_fen` (a string
+    from GameEngine.get_fen()). With `headless=True` nothing is printed or rendered.
+    `log` (a path or GameLogger) receives one JSON record per move and one for
+    the finished game, tagged with `game_id`. `game_db` (a path or
+    GameDatabase) stores the finished game's moves and result. Players are
+    named by their agent class unless `white_name` / `black_name` are given
+    (e.g. "B22CH0322@candidate"); the names go into the log, the database,
+    the stats records and the returned result.
+    With `sandbox=True` each agent runs in its own worker process that is
+    killed when the player's clock runs out (see sandbox.py); the worker's
+    address space can be capped with `sandbox_memory_mb`. If `stats_path` is given, one JSON record with the
+    player's SearchStats is appended to it for every move.
+    If `profile_dir` is given, every get_best_move() call runs under cProfile;
+    moves taking at least `profile_threshold` seconds are written to
+    `profile_dir` along with a hot-function report per agent. The agents
+    then run in this process, so `profile_dir` cannot be combined with
+    `sandbox=True` (ValueError).
+
+    Returns a dict describing the finished game (see `_game_result`).
+    """
+    if sandbox and profile_dir:
+        raise ValueError("profile_dir cannot be used with sandbox=True: sandboxed agents run in worker processes")
+    out = _silent if headless else print
+    logger = GameLogger(log) if isinstance(log, str) else log
+    if game_id is None:
+        game_id = uuid.uuid4().hex[:12]
+
     white_flag, black_flag, white_points, black_points = 0, 0, 0, 0
     white_log, black_log = [], []
+    stats_records = []
+    # Per-side totals for tournament standings: [moves, think time, nodes]
+    white_totals, black_totals = [0, 0.0, 0], [0, 0.0, 0]
     
     engine = GameEngine()
-    white_player = white_player_type(engine)
-    black_player = black_player_type(engine)
+    if start_fen:
+        engine.load_fen(start_fen)
+    if sandbox:
+        # CPU limit: the whole clock plus slack for startup and the grace period.
+        cpu_limit = total_time_seconds * 2 + 10
+        white_player = SandboxedPlayer(white_player_type, engine, sandbox_memory_mb, cpu_limit)
+        try:
+            black_player = SandboxedPlayer(black_player_type, engine, sandbox_memory_mb, cpu_limit)
+        except Exception:
+            white_player.close()
+            raise
+    else:
+        white_player = white_player_type(engine)
+        black_player = black_player_type(engine)
+
+    white_name = white_name or _agent_name(white_player)
+    black_name = black_name or _agent_name(black_player)
+
+    # Optional pondering: search on the opponent's clock in a background process.
+    # Ponder time is reported but never charged to the PlayerClock.
+    white_ponderer = Ponderer(white_player_type) if white_ponder else None
+    black_ponderer = Ponderer(black_player_type) if black_ponder else None
+
+    profiler = MoveProfiler(profile_dir, profile_threshold) if profile_dir else None
     
     clock = PlayerClock(total_time_seconds, total_time_seconds)
     turn_counter = 0
 
-    print(f"-"*50)
-    print(f"Starting Blitz Game: {white_player.__class__.__name__} (Depth {white_player.depth}) vs {black_player.__class__.__name__} (Depth {black_player.depth})")
-    print(f"-"*50)
+    out(f"-"*50)
+    out(f"Starting Blitz Game: {white_name} (Depth {white_player.depth}) vs {black_name} (Depth {black_player.depth})")
+    out(f"-"*50)
     
-    display_board(engine, clock, white_player, black_player)
+    if not headless:
+        display_board(engine, clock, white_player, black_player)
 
     file_map = {0: 'a', 1: 'b', 2: 'c', 3: 'd'}
     rank_map = {i: str(8 - i) for i in range(BOARD_HEIGHT)}
@@ -80,9 +145,27 @@ def run_game(white_player_type, black_player_type, total_time_seconds=60):
             game_over = True
             break
 
+        ponderer = white_ponderer if engine.white_to_move else black_ponderer
+        ponder_text = ""
+        ponder_hit = False
+
         start_think_time = time.time()
         
-        move = player.get_best_move()
+        move = None
+        if ponderer and ponderer.is_active():
+            move = ponderer.resolve(engine, player)
+            ponder_hit = move is not None
+            verdict = "hit" if ponder_hit else "miss" if ponderer.last_ready else "miss, not ready"
+            ponder_text = f" | Ponder: {ponderer.last_time:.2f}s ({verdict})"
+        if move is None:
+            # Agents that accept a deadline are told how much clock they have left.
+            remaining = clock.white_time if engine.white_to_move else clock.black_time
+            if sandbox:
+                move = player.get_best_move(time_limit=remaining)
+            elif profiler:
+                move = profiler.run(player, turn_counter + 1, SearchDeadline(remaining))
+            else:
+                move = request_move(player, SearchDeadline(remaining))
 
         time_taken = time.time() - start_think_time
 
@@ -90,21 +173,30 @@ def run_game(white_player_type, black_player_type, total_time_seconds=60):
         if engine.white_to_move:
             clock.white_time -= time_taken
             if clock.white_time <= 0:
-                print("\nBlack wins on time!")
+                out("\nBlack wins on time!")
+                white_flag = 1
                 game_over = True
                 break
         else:
             clock.black_time -= time_taken
             if clock.black_time <= 0:
-                print("\nWhite wins on time!")
+                out("\nWhite wins on time!")
+                black_flag = 1
                 game_over = True
                 break
 
+        totals = white_totals if engine.white_to_move else black_totals
+        totals[0] += 1
+        totals[1] += time_taken
+        totals[2] += player.nodes_expanded
+
         if move:
             engine.make_move(move)
+            events = []
             if move.piece_captured != EMPTY_SQUARE:
-                points = abs(PIECE_VALUES.get(move.piece_captured, 0))
+                points = CAPTURE_POINTS.get(move.piece_captured, 0)
                 event = f"Captured {move.piece_captured[1]} (+{points})"
+                events.append({"event": "capture", "piece": move.piece_captured, "points": points})
                 if not engine.white_to_move:
                     white_points += points
                     white_log.append(event)
@@ -112,7 +204,7 @@ def run_game(white_player_type, black_player_type, total_time_seconds=60):
                     black_points += points
                     black_log.append(event)
 
-            print("\n" + "-" * 20)
+            out("\n" + "-" * 20)
             start = file_map[move.start_col] + rank_map[move.start_row]
             end = file_map[move.end_col] + rank_map[move.end_row]
             move_text = f"Turn {turn_counter + 1}: {color} moves {PIECE_SYMBOLS.get(move.piece_moved)} from {start} to {end}"
@@ -122,6 +214,7 @@ def run_game(white_player_type, black_player_type, total_time_seconds=60):
             
             if engine.is_in_check():
                 move_text += " (Check!)"
+                events.append({"event": "check", "points": 2})
                 if not engine.white_to_move:
                     white_points += 2
                     white_log.append("Gave Check (+2)")
@@ -129,15 +222,71 @@ def run_game(white_player_type, black_player_type, total_time_seconds=60):
                     black_points += 2
                     black_log.append("Gave Check (+2)")
             
-            print(move_text)
-            print(f"Time: {time_taken:.2f}s | Nodes: {player.nodes_expanded}")
-            display_board(engine, clock, white_player, black_player)
+            # On a ponder hit the move comes from the ponder search, not player.stats.
+            stats = ponderer.last_stats if ponder_hit else getattr(player, "stats", None)
+            stats_text = ""
+            if stats is not None and stats_path:
+                record = {
+                    "turn": turn_counter + 1,
+                    "color": "white" if color == '<White>' else "black",
+                    "agent": white_name if color == '<White>' else black_name,
+                    "move": start + end,
+                    "time": round(time_taken, 6),
+                    "ponder_hit": ponder_hit,
+                }
+                record.update(stats.as_record())
+                stats_records.append(record)
+
+            if logger:
+                logger.write({
+                    "type": "move",
+                    "game": game_id,
+                    "ply": turn_counter + 1,
+                    "color": "white" if color == '<White>' else "black",
+                    "agent": white_name if color == '<White>' else black_name,
+                    "move": start + end,
+                    "piece": move.piece_moved,
+                    "captured": move.piece_captured if move.piece_captured != EMPTY_SQUARE else None,
+                    "time": round(time_taken, 6),
+                    "nodes": player.nodes_expanded,
+                    "depth": stats.depth_reached if stats is not None else None,
+                    "white_clock": round(clock.white_time, 3),
+                    "black_clock": round(clock.black_time, 3),
+                    "events": events,
+                    "ponder_hit": ponder_hit,
+                })
+
+            if not headless:
+                if stats is not None:
+                    stats_text = f" | NPS: {stats.nps:.0f} | Depth: {stats.depth_reached}"
+                out(move_text)
+                out(f"Time: {time_taken:.2f}s | Nodes: {player.nodes_expanded}{stats_text}{ponder_text}")
+                display_board(engine, clock, white_player, black_player)
+
+            if ponderer and engine.get_game_state() == "ongoing":
+                ponderer.start(engine)
         else:
             game_over = True
 
         turn_counter += 1
 
-    print("\n" + "="*15, "GAME OVER", "="*15)
+    for ponderer in (white_ponderer, black_ponderer):
+        if ponderer:
+            ponderer.cancel()
+    if sandbox:
+        white_player.close()
+        black_player.close()
+
+    if profiler:
+        for path in profiler.write_reports():
+            out(f"Profile report: {path}")
+
+    if stats_path:
+        with open(stats_path, "a") as f:
+            for record in stats_records:
+                f.write(json.dumps(record) + "\n")
+
+    out("\n" + "="*15, "GAME OVER", "="*15)
     
     final_game_state = engine.get_game_state()
     # final_score = white_player.evaluate_board(final_game_state)
@@ -145,28 +294,93 @@ def run_game(white_player_type, black_player_type, total_time_seconds=60):
 
     if final_game_state == "checkmate":
         winner = '<Black>' if engine.white_to_move else '<White>'
-        print(f"\nCheckmate! {winner} wins.")
+        out(f"\nCheckmate! {winner} wins.")
         if engine.white_to_move:
              black_log.append("Win by Checkmate (+600)"); black_points += 600
         else:
              white_log.append("Win by Checkmate (+600)"); white_points += 600
     elif final_game_state == "stalemate":
-        print("\nStalemate! It's a draw.")
+        out("\nStalemate! It's a draw.")
     elif not game_over:
-         print("\nGame ended due to turn limit.")
+         out("\nGame ended due to turn limit.")
+
+    if white_flag or black_flag:
+        outcome, reason = ("0-1" if white_flag else "1-0"), "time"
+    elif final_game_state == "checkmate":
+        outcome, reason = ("0-1" if engine.white_to_move else "1-0"), "checkmate"
+    elif final_game_state == "stalemate":
+        outcome, reason = "1/2-1/2", "stalemate"
+    elif game_over:
+        # The side to move returned no move although it had legal moves.
+        outcome, reason = ("0-1" if engine.white_to_move else "1-0"), "no_move"
+    else:
+        outcome, reason = "1/2-1/2", "turn_limit"
+
+    out("\nPoints Summary:")
+    out(f"White ({white_name}):")
+    for entry in white_log: out("  -", entry)
+    out(f"  Total: {white_points}")
+
+    out(f"Black ({black_name}):")
+    for entry in black_log: out("  -", entry)
+    out(f"  Total: {black_points}")
+    out(f"Flags: White={white_flag}, Black={black_flag}")
+    for name, ponderer in (("White", white_ponderer), ("Black", black_ponderer)):
+        if ponderer:
+            resolves = ponderer.hits + ponderer.misses
+            out(f"Ponder ({name}): {ponderer.total_time:.2f}s, prediction ready {ponderer.ready}/{resolves}, "
+                f"{ponderer.hits} hits, {ponderer.misses} misses")
+
+    result = _game_result(white_name, black_name, outcome, reason, turn_counter,
+                          white_points, black_points, white_flag, black_flag,
+                          white_totals, black_totals)
+    result["start"] = start_fen
+    if logger:
+        record = {"type": "game", "game": game_id}
+        record.update(result)
+        record["white_clock"] = round(clock.white_time, 3)
+        record["black_clock"] = round(clock.black_time, 3)
+        logger.write(record)
+        if logger is not log:
+            logger.close()
+    if game_db is not None:
+        db = GameDatabase(game_db) if isinstance(game_db, str) else game_db
+        db.add_result(engine.move_log, result)
+        if db is not game_db:
+            db.close()
+    return result
+
+
+def _silent(*args, **kwargs):
+    pass
 
-    print("\nPoints Summary:")
-    print(f"White ({white_player.__class__.__name__}):")
-    for entry in white_log: print("  -", entry)
-    print(f"  Total: {white_points}")
 
-    print(f"Black ({black_player.__class__.__name__}):")
-    for entry in black_log: print("  -", entry)
-    print(f"  Total: {black_points}")
-    print(f"Flags: White={white_flag}, Black={black_flag}")
+def _game_result(white_name, black_name, outcome, reason, plies,
+                 white_points, black_points, white_flag, black_flag,
+                 white_totals, black_totals):
+    """Builds the JSON-serialisable summary returned by run_game."""
+    return {
+        "white": white_name,
+        "black": black_name,
+        "result": outcome,          # "1-0", "0-1" or "1/2-1/2"
+        "reason": reason,           # checkmate, stalemate, time, turn_limit, no_move
+        "plies": plies,
+        "white_points": white_points,
+        "black_points": black_points,
+        "white_flag": white_flag,
+        "black_flag": black_flag,
+        "white_moves": white_totals[0],
+        "black_moves": black_totals[0],
+        "white_time": white_totals[1],
+        "black_time": black_totals[1],
+        "white_nodes": white_totals[2],
+        "black_nodes": black_totals[2],
+    }
 
 if __name__ == "__main__":
-    run_game(white_player_type=B22CH032, black_player_type=B23CM1036, total_time_seconds=60)
+    # Agents are imported lazily; only the two scheduled here are loaded.
+    registry = AgentRegistry()
+    run_game(white_player_type=registry.load("B22CH032"), black_player_type=registry.load("B23CM1036"), total_time_seconds=60)
 
 
 ## Replace by your AI agents for test purposes. Note you only have to submit one AI agent.
@@ -0,0 +1,62 @@
+"""
+Lazy evaluation: sum evaluation terms cheapest first and stop as soon as
+the terms still to come cannot bring the score back into the search window.
+
+An evaluator is built from (method name, bound) pairs, in the order the
+terms should run. Bound is the largest absolute value the term can add to
+the score (None for the first term, usually material, which always runs).
+The names are resolved with getattr on the owning agent:
+
+    self.evaluator = LazyEvaluator(self, [("_evaluate_material", None),
+                                          ("_evaluate_mobility", 40)])
+    score = self.evaluator.evaluate(alpha, beta)
+
+If the partial score plus the remaining bounds is still <= alpha, that
+upper bound is returned; if the partial score minus them is still >= beta,
+that lower bound is returned. Either is a valid fail-soft bound: the exact
+score is no higher (fail low) or no lower (fail high), so alpha-beta makes
+the same decisions and a transposition table may store the value as an
+UPPER / LOWER bound. With the default infinite window every term is
+evaluated.
+`exact` tells whether the last score was complete, e.g. before caching it.
+The methods are looked up once; call bind(owner) again after replacing
+them on the instance (profiling.EvalTermProfiler does).
+"""
+import math
+
+
+class LazyEvaluator:
+    """Window-aware sum of an agent's evaluation terms."""
+    def __init__(self, owner, terms):
+        self.names = [name for name, _ in terms]
+        self.terms = [(getattr(owner, name), bound or 0) for name, bound in terms]
+        # margins[i]: the most the terms after term i can still change the score.
+        self.margins = []
+        remaining = sum(bound for _, bound in self.terms)
+        for _, bound in self.terms:
+            remaining -= bound
+            self.margins.append(remaining)
+        self.evaluations = 0
+        self.early_exits = 0
+        self.exact = True
+
+    def bind(self, owner):
+        """Looks the term methods up on `owner` again."""
+        self.terms = [(getattr(owner, name), bound) for name, (_, bound) in zip(self.names, self.terms)]
+
+    def evaluate(self, alpha=-math.inf, beta=math.inf):
+        """The score, or a bound outside [alpha, beta] on the same side as the exact score."""
+        self.evaluations += 1
+        score = 0
+        for (term, _), margin in zip(self.terms, self.margins):
+            score += term()
+            if margin and score + margin <= alpha:
+                self.early_exits += 1
+                self.exact = False
+                return score + margin           # the exact score is at most this
+            if margin and score - margin >= beta:
+                self.early_exits += 1
+                self.exact = False
+                return score - margin           # the exact score is at least this
+        self.exact = True
+        return score
@@ -0,0 +1,227 @@
+"""
+Monte Carlo Tree Search agent (PUCT) with batched leaf evaluation.
+
+Each step of the search selects up to `batch_size` leaves with virtual
+loss, so one batch explores different lines. Each leaf is expanded (legal
+moves, capture-weighted priors) and its board encoded. All leaves of the
+batch are then scored by a single vectorised NumPy evaluation, and the
+values are backed up. The evaluation is a material + piece-square table
+lookup built from config.py, or the NNUE network when MCTSAgent.NNUE_WEIGHTS
+names a weights file (see nnue.py). Values are win probabilities:
+sigmoid(score / VALUE_SCALE).
+
+The tree is kept between moves. On the next call the root is moved down
+along the moves played since, so the opponent's reply usually lands in an
+already searched subtree.
+
+Requires NumPy.
+"""
+import math
+
+import numpy as np
+
+from config import *
+from search_stats import SearchStats, MATE_SCORE
+from deadline import SearchDeadline
+
+VALUE_SCALE = 100.0         # eval units per logit of win probability
+PRIOR_TEMPERATURE = 50.0    # captured material (eval units) per logit of prior
+
+PIECE_CODES = {EMPTY_SQUARE: 0, WHITE_PAWN: 1, WHITE_KNIGHT: 2, WHITE_BISHOP: 3, WHITE_KING: 4,
+               BLACK_PAWN: 5, BLACK_KNIGHT: 6, BLACK_BISHOP: 7, BLACK_KING: 8}
+
+
+def _material_table():
+    """(9, 32) table of PIECE_VALUES + PST per piece code and square, from White's view."""
+    table = np.zeros((len(PIECE_CODES), BOARD_HEIGHT * BOARD_WIDTH))
+    psts = {'P': PAWN_PST, 'N': KNIGHT_PST, 'B': BISHOP_PST}
+    for piece, code in PIECE_CODES.items():
+        if piece == EMPTY_SQUARE:
+            continue
+        sign = 1 if piece[0] == 'w' else -1
+        for r in range(BOARD_HEIGHT):
+            for c in range(BOARD_WIDTH):
+                value = PIECE_VALUES[piece]
+                if piece[1] in psts:
+                    row = r if piece[0] == 'w' or piece[1] != 'P' else BOARD_HEIGHT - 1 - r
+                    value += sign * psts[piece[1]][row][c]
+                table[code, r * BOARD_WIDTH + c] = value
+    return table
+
+
+MATERIAL_TABLE = _material_table()
+SQUARES = np.arange(BOARD_HEIGHT * BOARD_WIDTH)
+
+
+class Node:
+    __slots__ = ("move", "parent", "children", "prior", "visits", "value", "terminal")
+
+    def __init__(self, move=None, parent=None, prior=1.0):
+        self.move = move
+        self.parent = parent
+        self.children = None        # None until expanded
+        self.prior = prior
+        self.visits = 0
+        self.value = 0.0            # summed results for the player who made `move`
+        self.terminal = None        # win probability for the side to move, if the game is over
+
+    def q(self):
+        return self.value / self.visits if self.visits else 0.5
+
+
+class MCTSAgent:
+    """PUCT search over GameEngine with batched leaf evaluation and tree reuse."""
+    NNUE_WEIGHTS = None     # path to nnue.py weights; None uses the material/PST table
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.nodes_expanded = 0
+        self.depth = 40                 # maximum selection depth in plies
+        self.time_limit = 1.0            # upper bound per move
+        self.moves_to_go = 30            # share of the remaining clock used per move
+        self.max_simulations = 20000
+        self.batch_size = 16
+        self.c_puct = 1.5
+        self.stats = SearchStats()
+        self.root = None
+        self._root_ply = 0
+        self._move_log = None
+        self.nnue = None
+        if self.NNUE_WEIGHTS:
+            from nnue import NNUEWeights
+            self.nnue = NNUEWeights.load(self.NNUE_WEIGHTS)
+
+    def get_best_move(self, deadline=None):
+        deadline = deadline or SearchDeadline()
+        budget = self.time_limit
+        if deadline.remaining() is not None:
+            # The runner's deadline is the whole remaining clock: spread it over the game.
+            budget = min(budget, deadline.remaining() / self.moves_to_go)
+        deadline = deadline.within(budget, check_every=1)
+        self.stats.reset()
+        self.nodes_expanded = 0
+
+        legal_moves = self.engine.get_legal_moves()
+        if not legal_moves:
+            return None
+        if len(legal_moves) == 1:
+            self.root = None
+            return legal_moves[0]
+
+        self._reuse_or_reset_root()
+        simulations = 0
+        while simulations < self.max_simulations and not deadline.expired():
+            simulations += self._run_batch()
+        self.nodes_expanded = simulations
+        self.stats.nodes = simulations
+
+        best = max(self.root.children, key=lambda child: child.visits)
+        p = min(max(best.q(), 1e-6), 1 - 1e-6)
+        score = VALUE_SCALE * math.log(p / (1 - p))
+        self.stats.score = max(-MATE_SCORE, min(MATE_SCORE, score if self.engine.white_to_move else -score))
+        self.stats.finish()
+        return best.move
+
+    # ---------- tree reuse ----------
+
+    def _reuse_or_reset_root(self):
+        """Moves the root down along the moves played since the last search, or starts a new tree."""
+        engine = self.engine
+        root = self.root
+        # set_position/load_fen replace the move log, which invalidates the tree.
+        if root is None or engine.move_log is not self._move_log or len(engine.move_log) < self._root_ply:
+            root = None
+        else:
+            for move in engine.move_log[self._root_ply:]:
+                if not root.children:
+                    root = None
+                    break
+                root = next((child for child in root.children if child.move == move), None)
+                if root is None:
+                    break
+        if root is None:
+            root = Node()
+        root.parent = None
+        root.move = None
+        self.root = root
+        self._root_ply = len(engine.move_log)
+        self._move_log = engine.move_log
+
+    # ---------- search ----------
+
+    def _run_batch(self):
+        """Selects, expands and evaluates one batch of leaves. Returns the number of simulations."""
+        leaves = []         # (path, leaf)
+        boards = []
+        for _ in range(self.batch_size):
+            path, leaf = self._select()
+            if leaf.terminal is None:
+                boards.append(self._encode())
+            leaves.append((path, leaf))
+            for _ in range(len(path) - 1):
+                self.engine.undo_move()
+
+        values = iter(self._evaluate(boards) if boards else ())
+        for path, leaf in leaves:
+            # Win probability for the side to move at the leaf.
+            value = leaf.terminal if leaf.terminal is not None else next(values)
+            for node in reversed(path):
+                value = 1.0 - value
+                node.value += value
+        return len(leaves)
+
+    def _select(self):
+        """
+        Walks from the root to a leaf with PUCT, making the moves on the
+        engine and adding a virtual visit (counted as a loss) to each node.
+        Expands the leaf. Returns (path, leaf); the caller undoes the moves.
+        """
+        node = self.root
+        path = [node]
+        node.visits += 1
+        while node.children and len(path) <= self.depth:
+            sqrt_total = math.sqrt(node.visits)
+            best, best_score = None, -1.0
+            for child in node.children:
+                score = child.q() + self.c_puct * child.prior * sqrt_total / (1 + child.visits)
+                if score > best_score:
+                    best, best_score = child, score
+            node = best
+            self.engine.make_move(node.move)
+            node.visits += 1
+            path.append(node)
+        if node.children is None:
+            self._expand(node)
+            self.stats.depth_reached = max(self.stats.depth_reached, len(path) - 1)
+        return path, node
+
+    def _expand(self, node):
+        moves = self.engine.get_legal_moves()
+        if not moves:
+            node.children = []
+            node.terminal = 0.0 if self.engine.is_in_check() else 0.5
+            return
+        logits = [abs(PIECE_VALUES.get(m.piece_captured, 0)) / PRIOR_TEMPERATURE for m in moves]
+        top = max(logits)
+        weights = [math.exp(l - top) for l in logits]
+        total = sum(weights)
+        node.children = [Node(m, node, w / total) for m, w in zip(moves, weights)]
+
+    def _encode(self):
+        return [PIECE_CODES[piece] for row in self.engine.board for piece in row] + \
+               [1 if self.engine.white_to_move else 0]
+
+    def _evaluate(self, boards):
+        """Win probabilities for the side to move of a batch of encoded positions."""
+        data = np.array(boards, dtype=np.int8)
+        codes, white_to_move = data[:, :-1], data[:, -1].astype(bool)
+        if self.nnue is not None:
+            from nnue import encode_batch, evaluate_batch
+            # nnue.py uses signed piece codes: +1..+4 white, -1..-4 black.
+            signed = np.where(codes > 4, 4 - codes, codes)
+            stm, other = encode_batch(signed, white_to_move)
+            logits = evaluate_batch(self.nnue, stm, other)
+        else:
+            score = MATERIAL_TABLE[codes, SQUARES].sum(axis=1)
+            logits = np.where(white_to_move, score, -score) / VALUE_SCALE
+        return 1.0 / (1.0 + np.exp(-np.clip(logits, -50, 50)))
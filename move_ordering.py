@@ -0,0 +1,112 @@
+"""
+Move ordering: killer moves, history and countermove heuristics.
+
+MoveOrderer keeps the quiet-move statistics an alpha-beta search learns
+from its cutoffs, all in flat tables indexed by board.encode_move codes
+(10 bits: from-square << 5 | to-square), so every lookup is O(1):
+
+    killers[ply]          the last two quiet moves that caused a cutoff at
+                          this distance from the root
+    history[side | code]  sum of depth * depth over the cutoffs caused by
+                          this from-to move (one table per side)
+    countermoves[code]    the quiet move that last refuted the opponent's
+                          move `code`
+
+order() sorts moves by a single integer key, highest first:
+
+    transposition table move    TT_KEY
+    captures                    CAPTURE_KEY + MVV-LVA
+    killer moves                KILLER_KEY (+1 for the newer slot)
+    countermove                 COUNTER_KEY
+    other quiet moves           history score, below COUNTER_KEY
+
+An agent keeps one orderer for the game, calls cutoff() when a quiet move
+fails high and age() before each search:
+
+    self.orderer = MoveOrderer()
+    ...
+    for move in self.orderer.order(moves, ply, tt_code, previous_move):
+        ...
+        if score >= beta:
+            self.orderer.cutoff(move, ply, depth, previous_move)
+            break
+
+age() halves the history (recent searches count more) and forgets the
+killers, whose plies refer to the previous root.
+"""
+from config import *
+from board import encode_move
+
+NO_MOVE = -1
+MAX_PLY = 160
+HISTORY_MAX = 1 << 16          # history is halved when an entry reaches this
+TT_KEY = 1 << 30
+CAPTURE_KEY = 1 << 26
+KILLER_KEY = 1 << 25
+COUNTER_KEY = 1 << 24
+BLACK = 1 << 10                # history index offset for Black's moves
+
+MVV_LVA = {(victim, attacker): 10 * abs(PIECE_VALUES[victim]) - abs(PIECE_VALUES[attacker])
+           for victim in PIECE_VALUES for attacker in PIECE_VALUES}
+
+
+class MoveOrderer:
+    """Killer, history and countermove tables with an integer sort key."""
+    def __init__(self, max_ply=MAX_PLY):
+        self.killers = [[NO_MOVE, NO_MOVE] for _ in range(max_ply)]
+        self.history = [0] * (2 * BLACK)
+        self.countermoves = [NO_MOVE] * BLACK
+
+    def clear(self):
+        for slots in self.killers:
+            slots[0] = slots[1] = NO_MOVE
+        self.history = [0] * (2 * BLACK)
+        self.countermoves = [NO_MOVE] * BLACK
+
+    def age(self):
+        """Called between searches: halves the history and forgets the killers."""
+        for slots in self.killers:
+            slots[0] = slots[1] = NO_MOVE
+        self.history = [value >> 1 for value in self.history]
+
+    def sort_key(self, ply=0, tt_code=None, previous=None):
+        """Returns key(move), the ordering key of a move at `ply` after `previous`."""
+        first, second = self.killers[ply] if ply < len(self.killers) else (NO_MOVE, NO_MOVE)
+        counter = self.countermoves[encode_move(previous)] if previous is not None else NO_MOVE
+        history = self.history
+
+        def key(move):
+            code = encode_move(move)
+            if code == tt_code:
+                return TT_KEY
+            if move.piece_captured != EMPTY_SQUARE:
+                return CAPTURE_KEY + MVV_LVA[move.piece_captured, move.piece_moved]
+            if code == first:
+                return KILLER_KEY + 1
+            if code == second:
+                return KILLER_KEY
+            if code == counter:
+                return COUNTER_KEY
+            return history[BLACK | code if move.piece_moved[0] == 'b' else code]
+        return key
+
+    def order(self, moves, ply=0, tt_code=None, previous=None):
+        """The moves sorted best first; ties keep their generation order."""
+        return sorted(moves, key=self.sort_key(ply, tt_code, previous), reverse=True)
+
+    def cutoff(self, move, ply, depth, previous=None):
+        """Records that `move` failed high at `ply` with `depth` plies left. Captures are ignored."""
+        if move.piece_captured != EMPTY_SQUARE:
+            return
+        code = encode_move(move)
+        if ply < len(self.killers):
+            slots = self.killers[ply]
+            if slots[0] != code:
+                slots[1] = slots[0]
+                slots[0] = code
+        if previous is not None:
+            self.countermoves[encode_move(previous)] = code
+        index = BLACK | code if move.piece_moved[0] == 'b' else code
+        self.history[index] += depth * depth
+        if self.history[index] >= HISTORY_MAX:
+            self.history = [value >> 1 for value in self.history]
@@ -0,0 +1,276 @@
+"""
+NNUE-style neural evaluator with an incrementally updated accumulator.
+
+Inputs are (piece, square) features: 8 piece codes x 32 squares = 256, seen
+from both sides. The White view uses the board as is. The Black view swaps
+colours and flips ranks, so both views share one first-layer weight matrix.
+The first layer is therefore a sum of weight rows for the pieces on the
+board (the accumulator, one per view). A move only changes the rows of the
+moved piece and a captured one, so make_move/undo_move add and subtract a
+few rows instead of rescanning the board.
+
+    256 -> H (per view, clipped ReLU) -> concat(side to move, other) 2H
+        -> 32 (clipped ReLU) -> 1
+
+The output is a logit for the side to move; scores are logit * `scale`,
+returned from White's point of view like the other evaluators.
+evaluate_batch() runs the same network on a batch of one-hot inputs for
+training. `python nnue.py train DIR` fits it on selfplay.py shards.
+
+    evaluator = NNUEEvaluator(engine, NNUEWeights.load("nnue.npz"))
+    evaluator.make_move(move)       # instead of engine.make_move(move)
+    score = evaluator.evaluate()
+    evaluator.undo_move()
+
+Requires NumPy.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from config import *
+
+PIECE_ORDER = (WHITE_PAWN, WHITE_KNIGHT, WHITE_BISHOP, WHITE_KING,
+               BLACK_PAWN, BLACK_KNIGHT, BLACK_BISHOP, BLACK_KING)
+NUM_SQUARES = BOARD_WIDTH * BOARD_HEIGHT
+NUM_FEATURES = len(PIECE_ORDER) * NUM_SQUARES
+
+_PIECE_INDEX = {piece: i for i, piece in enumerate(PIECE_ORDER)}
+# The same piece seen from the other side: colour swapped.
+_OTHER_INDEX = {piece: (i + 4) % 8 for i, piece in enumerate(PIECE_ORDER)}
+
+
+def feature_index(piece, r, c, white_view=True):
+    """Input index of `piece` on (r, c) in the White or Black view."""
+    if white_view:
+        return _PIECE_INDEX[piece] * NUM_SQUARES + r * BOARD_WIDTH + c
+    return _OTHER_INDEX[piece] * NUM_SQUARES + (BOARD_HEIGHT - 1 - r) * BOARD_WIDTH + c
+
+
+def board_features(board):
+    """Returns (White-view indices, Black-view indices) of the pieces on a board."""
+    white, black = [], []
+    for r, row in enumerate(board):
+        for c, piece in enumerate(row):
+            if piece != EMPTY_SQUARE:
+                white.append(feature_index(piece, r, c, True))
+                black.append(feature_index(piece, r, c, False))
+    return white, black
+
+
+class NNUEWeights:
+    """Network parameters (float32)."""
+    def __init__(self, w1, b1, w2, b2, w3, b3, scale=100.0):
+        self.w1, self.b1 = w1, b1       # (256, H), (H,)
+        self.w2, self.b2 = w2, b2       # (2H, 32), (32,)
+        self.w3, self.b3 = w3, b3       # (32,), ()
+        self.scale = scale
+
+    @property
+    def hidden(self):
+        return self.w1.shape[1]
+
+    @classmethod
+    def random(cls, hidden=32, seed=0, scale=100.0):
+        rng = np.random.default_rng(seed)
+        return cls(
+            (rng.standard_normal((NUM_FEATURES, hidden)) * 0.1).astype(np.float32),
+            np.full(hidden, 0.5, dtype=np.float32),
+            (rng.standard_normal((2 * hidden, 32)) / np.sqrt(2 * hidden)).astype(np.float32),
+            np.zeros(32, dtype=np.float32),
+            (rng.standard_normal(32) / np.sqrt(32)).astype(np.float32),
+            np.float32(0.0),
+            scale,
+        )
+
+    def save(self, path):
+        np.savez(path, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2, w3=self.w3, b3=self.b3,
+                 scale=self.scale)
+
+    @classmethod
+    def load(cls, path):
+        d = np.load(path)
+        return cls(d["w1"], d["b1"], d["w2"], d["b2"], d["w3"], d["b3"][()], float(d["scale"]))
+
+    def params(self):
+        return [self.w1, self.b1, self.w2, self.b2, self.w3, self.b3]
+
+
+class NNUEEvaluator:
+    """Evaluator bound to a GameEngine, keeping one accumulator per view in sync with it."""
+    def __init__(self, engine, weights=None):
+        self.engine = engine
+        self.weights = weights or NNUEWeights.random()
+        self._stack = []
+        self.refresh()
+
+    def refresh(self):
+        """Rebuilds the accumulators from the board (needed after set_position or external moves)."""
+        white, black = board_features(self.engine.board)
+        w1, b1 = self.weights.w1, self.weights.b1
+        self.accumulator = np.stack([b1 + w1[white].sum(axis=0), b1 + w1[black].sum(axis=0)])
+        self._stack.clear()
+
+    def make_move(self, move):
+        """Plays `move` on the engine and updates the accumulators by its changed features."""
+        self._stack.append(self.accumulator)
+        w1 = self.weights.w1
+        piece, captured = move.piece_moved, move.piece_captured
+        sr, sc, er, ec = move.start_row, move.start_col, move.end_row, move.end_col
+        white = w1[feature_index(piece, er, ec, True)] - w1[feature_index(piece, sr, sc, True)]
+        black = w1[feature_index(piece, er, ec, False)] - w1[feature_index(piece, sr, sc, False)]
+        if captured != EMPTY_SQUARE:
+            white = white - w1[feature_index(captured, er, ec, True)]
+            black = black - w1[feature_index(captured, er, ec, False)]
+        self.accumulator = self.accumulator + np.stack([white, black])
+        self.engine.make_move(move)
+
+    def undo_move(self):
+        """Takes back the last move on the engine and restores the previous accumulators."""
+        self.engine.undo_move()
+        self.accumulator = self._stack.pop()
+
+    def evaluate(self):
+        """Score of the current position from White's point of view."""
+        w = self.weights
+        acc = np.clip(self.accumulator, 0.0, 1.0)
+        x = np.concatenate((acc[0], acc[1]) if self.engine.white_to_move else (acc[1], acc[0]))
+        h = np.clip(x @ w.w2 + w.b2, 0.0, 1.0)
+        score = float(h @ w.w3 + w.b3) * w.scale
+        return score if self.engine.white_to_move else -score
+
+
+# ---------- batched inference and training ----------
+
+def encode_batch(boards, white_to_move):
+    """
+    One-hot inputs for a batch of selfplay.py boards ((N, 32) int8 piece codes,
+    see selfplay.PIECE_CODES). Returns (side-to-move view, other view) as
+    (N, 256) float32 arrays.
+    """
+    boards = np.asarray(boards, dtype=np.int8).reshape(-1, BOARD_HEIGHT, BOARD_WIDTH)
+    n = len(boards)
+    white_to_move = np.asarray(white_to_move, dtype=bool)
+
+    def one_hot(codes):
+        # Piece code 1..4 (white) -> 0..3, -1..-4 (black) -> 4..7.
+        flat = codes.reshape(n, NUM_SQUARES).astype(np.int32)
+        piece = np.where(flat > 0, flat - 1, -flat + 3)
+        rows, squares = np.nonzero(flat)
+        x = np.zeros((n, NUM_FEATURES), dtype=np.float32)
+        x[rows, piece[rows, squares] * NUM_SQUARES + squares] = 1.0
+        return x
+
+    white_view = one_hot(boards)
+    black_view = one_hot(-boards[:, ::-1, :])
+    stm = np.where(white_to_move[:, None], white_view, black_view)
+    other = np.where(white_to_move[:, None], black_view, white_view)
+    return stm, other
+
+
+def evaluate_batch(weights, stm, other, return_cache=False):
+    """Logits for the side to move for a batch of encoded positions."""
+    w = weights
+    a_stm = stm @ w.w1 + w.b1
+    a_other = other @ w.w1 + w.b1
+    x = np.clip(np.concatenate([a_stm, a_other], axis=1), 0.0, 1.0)
+    z2 = x @ w.w2 + w.b2
+    h = np.clip(z2, 0.0, 1.0)
+    out = h @ w.w3 + w.b3
+    if return_cache:
+        return out, (a_stm, a_other, x, z2, h)
+    return out
+
+
+def _gradients(weights, stm, other, target):
+    """Gradients of the mean squared error between sigmoid(logit) and `target`."""
+    w = weights
+    out, (a_stm, a_other, x, z2, h) = evaluate_batch(weights, stm, other, return_cache=True)
+    p = 1.0 / (1.0 + np.exp(-out))
+    loss = float(((p - target) ** 2).mean())
+    g_out = 2.0 * (p - target) * p * (1.0 - p) / len(target)
+    g_w3 = h.T @ g_out
+    g_b3 = g_out.sum()
+    g_h = np.outer(g_out, w.w3) * ((z2 > 0) & (z2 < 1))
+    g_w2 = x.T @ g_h
+    g_b2 = g_h.sum(axis=0)
+    g_x = (g_h @ w.w2.T) * ((x > 0) & (x < 1))
+    hidden = w.hidden
+    g_stm, g_other = g_x[:, :hidden], g_x[:, hidden:]
+    g_w1 = stm.T @ g_stm + other.T @ g_other
+    g_b1 = g_stm.sum(axis=0) + g_other.sum(axis=0)
+    return loss, [g_w1, g_b1, g_w2, g_b2, g_w3, g_b3]
+
+
+def load_shard_targets(directory, score_weight=0.5, scale=100.0):
+    """
+    Boards, side to move and targets (win probability for the side to move)
+    from selfplay.py shards: the game result, blended with sigmoid(score /
+    scale) by `score_weight` where a search score exists.
+    """
+    from selfplay import iter_shards
+    shards = list(iter_shards(directory))
+    records = np.concatenate(shards) if shards else np.zeros(0)
+    wtm = records["white_to_move"].astype(bool)
+    result = records["result"].astype(np.float32)
+    score = records["score"].astype(np.float32)
+    from_score = 1.0 / (1.0 + np.exp(np.clip(-np.nan_to_num(score) / scale, -50, 50)))
+    target = np.where(np.isnan(score), result, (1 - score_weight) * result + score_weight * from_score)
+    target = np.where(wtm, target, 1.0 - target).astype(np.float32)
+    return records["board"], wtm, target
+
+
+def train(weights, boards, white_to_move, target, epochs=10, batch_size=4096, lr=1e-3, seed=0):
+    """Adam over shuffled mini-batches; returns the trained weights (updated in place)."""
+    rng = np.random.default_rng(seed)
+    params = weights.params()
+    m = [np.zeros_like(p, dtype=np.float32) for p in params]
+    v = [np.zeros_like(p, dtype=np.float32) for p in params]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+    for epoch in range(1, epochs + 1):
+        start = time.perf_counter()
+        order = rng.permutation(len(target))
+        total = 0.0
+        for i in range(0, len(order), batch_size):
+            batch = order[i:i + batch_size]
+            stm, other = encode_batch(boards[batch], white_to_move[batch])
+            loss, grads = _gradients(weights, stm, other, target[batch])
+            total += loss * len(batch)
+            step += 1
+            for j, g in enumerate(grads):
+                m[j] = beta1 * m[j] + (1 - beta1) * g
+                v[j] = beta2 * v[j] + (1 - beta2) * g * g
+                update = lr * (m[j] / (1 - beta1 ** step)) / (np.sqrt(v[j] / (1 - beta2 ** step)) + eps)
+                params[j] = (params[j] - update).astype(np.float32)
+        weights.w1, weights.b1, weights.w2, weights.b2, weights.w3, weights.b3 = params
+        print(f"epoch {epoch:>3}: loss {total / max(1, len(target)):.6f} ({time.perf_counter() - start:.1f}s)")
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the NNUE evaluator on selfplay.py shards.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    t = sub.add_parser("train")
+    t.add_argument("directory", help="selfplay.py output directory")
+    t.add_argument("--out", default="nnue.npz")
+    t.add_argument("--init", default=None, help="start from these weights instead of random ones")
+    t.add_argument("--hidden", type=int, default=32)
+    t.add_argument("--epochs", type=int, default=10)
+    t.add_argument("--batch-size", type=int, default=4096)
+    t.add_argument("--lr", type=float, default=1e-3)
+    t.add_argument("--score-weight", type=float, default=0.5)
+    t.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    weights = NNUEWeights.load(args.init) if args.init else NNUEWeights.random(args.hidden, args.seed)
+    boards, wtm, target = load_shard_targets(args.directory, args.score_weight, weights.scale)
+    print(f"Training on {len(target)} positions")
+    train(weights, boards, wtm, target, args.epochs, args.batch_size, args.lr, args.seed)
+    weights.save(args.out)
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Pawn hash table: caches pawn-structure information per pawn configuration.
+
+Pawns move far less often than the other pieces, so most leaves of a search
+share their pawn configuration with many others. GameEngine keeps
+`pawn_key`, a Zobrist key of the pawns alone, up to date in
+make_move/undo_move. PawnTable maps it to a PawnEntry holding the structure
+that evaluators derive their pawn terms from:
+
+    files[color]      pawns per file, e.g. files['w'] == [1, 2, 0, 1]
+    passed[color]     bitmask (square_index bits) of passed pawns
+    isolated[color]   bitmask of files holding isolated pawns
+
+plus a `score` slot that the owning evaluator fills with its pawn-structure
+score the first time the entry is used:
+
+    entry = self.pawn_table.probe(self.board)
+    if entry.score is None:
+        entry.score = ...   # computed from entry.files / passed / isolated
+    return entry.score
+
+Since the score is evaluator-specific, each agent owns its own table. The
+table has a fixed number of slots, indexed by the low bits of the key; a
+new configuration replaces whatever occupied its slot.
+"""
+from config import *
+from board import square_index
+
+COLORS = ('w', 'b')
+
+
+def squares(mask):
+    """Yields the (row, col) squares set in a square bitmask, a8 first."""
+    while mask:
+        low = mask & -mask
+        yield divmod(low.bit_length() - 1, BOARD_WIDTH)
+        mask ^= low
+
+
+class PawnEntry:
+    __slots__ = ("key", "files", "passed", "isolated", "score")
+
+    def __init__(self, key, board):
+        self.key = key
+        self.files = {'w': [0] * BOARD_WIDTH, 'b': [0] * BOARD_WIDTH}
+        self.passed = {'w': 0, 'b': 0}
+        self.isolated = {'w': 0, 'b': 0}
+        self.score = None
+
+        pawns = {'w': [], 'b': []}
+        for r in range(BOARD_HEIGHT):
+            for c in range(BOARD_WIDTH):
+                piece = board[r][c]
+                if piece == WHITE_PAWN or piece == BLACK_PAWN:
+                    pawns[piece[0]].append((r, c))
+                    self.files[piece[0]][c] += 1
+
+        for color in COLORS:
+            enemy = pawns['b' if color == 'w' else 'w']
+            for r, c in pawns[color]:
+                # Passed: no enemy pawn ahead on its own or an adjacent file.
+                blocked = any(abs(ec - c) <= 1 and (er < r if color == 'w' else er > r)
+                              for er, ec in enemy)
+                if not blocked:
+                    self.passed[color] |= 1 << square_index(r, c)
+            files = self.files[color]
+            for f in range(BOARD_WIDTH):
+                if files[f] and (f == 0 or not files[f - 1]) and (f == BOARD_WIDTH - 1 or not files[f + 1]):
+                    self.isolated[color] |= 1 << f
+
+
+class PawnTable:
+    """Fixed-size, direct-mapped cache of PawnEntry objects keyed by GameEngine.pawn_key."""
+    def __init__(self, size_log2=12):
+        self.entries = [None] * (1 << size_log2)
+        self.mask = len(self.entries) - 1
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, engine):
+        """The entry for the pawns on `engine`, built (and stored) on a miss."""
+        key = engine.pawn_key
+        slot = key & self.mask
+        entry = self.entries[slot]
+        self.probes += 1
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        entry = PawnEntry(key, engine.board)
+        self.entries[slot] = entry
+        return entry
+
+    def clear(self):
+        self.entries = [None] * len(self.entries)
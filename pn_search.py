@@ -0,0 +1,314 @@
+"""
+Depth-first proof-number (df-pn) solver for forced checkmates.
+
+solve(engine, plies) classifies the position on `engine` for the side to
+move within a horizon of `plies` half-moves (run_game stops at 150):
+    "win"      the side to move can force checkmate,
+    "loss"     the opponent can force checkmate,
+    "draw"     neither side can force checkmate within the horizon,
+    "unknown"  the node budget or deadline ran out first.
+Each answer takes up to two proofs: first that the side to move wins, then
+that the opponent does.
+
+Transposition table entries are keyed by (GameEngine.canonical_key(),
+plies left). Positions reached by different move orders, and mirror images
+of each other, share entries, and the ply budget keeps the search graph
+acyclic, which avoids the usual repetition (graph-history) problems of
+proof-number search on DAGs.
+Each entry holds [proof number, disproof number, work], where work is the
+number of nodes spent below it.
+
+The table has a memory budget of `max_entries`. When a node is solved,
+the unsolved entries of its other children are dropped, since they cannot
+affect the result any more. When the table still overflows, the entries
+with the least work are collected first, as they are the cheapest to
+recompute.
+
+    result = solve(engine, plies=15, max_nodes=200000)
+    result.outcome, result.move, result.proof_tree()
+
+Run `python pn_search.py [fen ...] --plies 15` to solve positions
+(default: the opening positions from positions.py).
+"""
+import argparse
+import time
+
+from board import GameEngine, move_name
+from deadline import SearchDeadline
+
+INF = 10 ** 9
+
+
+class _Abort(Exception):
+    pass
+
+
+class ProofNumberSearch:
+    """df-pn for "the attacker forces checkmate within the ply budget"."""
+    def __init__(self, engine, max_entries=1_000_000, max_nodes=None, deadline=None,
+                 gc_fraction=0.5):
+        self.engine = engine
+        self.max_entries = max_entries
+        self.max_nodes = max_nodes
+        self.deadline = deadline or SearchDeadline()
+        self.gc_fraction = gc_fraction
+        self.tt = {}
+        self.nodes = 0
+        self.collections = 0
+        self.attacker_white = True
+
+    def prove(self, attacker_white, plies):
+        """True if the attacker wins, False if not, None if the budget ran out."""
+        self.attacker_white = attacker_white
+        self.tt.clear()
+        try:
+            pn, dn, _ = self._mid(plies, INF, INF)
+        except _Abort:
+            return None
+        return pn == 0 if pn == 0 or dn == 0 else None
+
+    # ---------- df-pn ----------
+
+    def _entry(self, key):
+        return self.tt.get(key) or (1, 1, 0)
+
+    def _terminal(self, moves, remaining, or_node):
+        """(pn, dn) of a node without search, or None if it must be expanded."""
+        if not moves:
+            checkmated = self.engine.is_in_check()
+            # The side to move is mated: a win for the attacker only at AND nodes.
+            if checkmated and not or_node:
+                return 0, INF
+            return INF, 0
+        if remaining == 0:
+            return INF, 0
+        return None
+
+    def _mid(self, remaining, th_pn, th_dn):
+        engine = self.engine
+        key = (engine.canonical_key(), remaining)
+        entry = self.tt.get(key)
+        if entry is not None and (entry[0] >= th_pn or entry[1] >= th_dn):
+            return entry
+
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise _Abort
+        if self.deadline.should_stop():
+            raise _Abort
+
+        or_node = engine.white_to_move == self.attacker_white
+        moves = engine.get_legal_moves()
+        terminal = self._terminal(moves, remaining, or_node)
+        if terminal is not None:
+            entry = (terminal[0], terminal[1], 1)
+            self._store(key, entry)
+            return entry
+
+        child_keys = []
+        for move in moves:
+            engine.make_move(move)
+            child_keys.append((engine.canonical_key(), remaining - 1))
+            engine.undo_move()
+
+        start_nodes = self.nodes
+        base_work = entry[2] if entry is not None else 0
+        while True:
+            children = [self._entry(k) for k in child_keys]
+            if or_node:
+                pn = min(c[0] for c in children)
+                dn = min(INF, sum(c[1] for c in children))
+            else:
+                pn = min(INF, sum(c[0] for c in children))
+                dn = min(c[1] for c in children)
+            entry = (pn, dn, base_work + self.nodes - start_nodes)
+            self._store(key, entry)
+            if pn >= th_pn or dn >= th_dn:
+                break
+
+            # Most proving child and the runner-up's number for the threshold.
+            index = 0 if or_node else 1
+            order = sorted(range(len(children)), key=lambda i: children[i][index])
+            best = order[0]
+            second = children[order[1]][index] if len(order) > 1 else INF
+            c_pn, c_dn = children[best][0], children[best][1]
+            if or_node:
+                child_th_pn = min(th_pn, second + 1)
+                child_th_dn = min(INF, th_dn - dn + c_dn)
+            else:
+                child_th_pn = min(INF, th_pn - pn + c_pn)
+                child_th_dn = min(th_dn, second + 1)
+
+            engine.make_move(moves[best])
+            try:
+                self._mid(remaining - 1, child_th_pn, child_th_dn)
+            finally:
+                engine.undo_move()
+
+        if pn == 0 or dn == 0:
+            self._drop_unsolved(child_keys)
+        return entry
+
+    # ---------- memory ----------
+
+    def _store(self, key, entry):
+        self.tt[key] = entry
+        if len(self.tt) > self.max_entries:
+            self._collect()
+
+    def _drop_unsolved(self, keys):
+        """Forgets unsolved children of a solved node; they no longer matter for it."""
+        for key in keys:
+            entry = self.tt.get(key)
+            if entry is not None and entry[0] != 0 and entry[1] != 0:
+                del self.tt[key]
+
+    def _collect(self):
+        """Removes the `gc_fraction` of entries with the least work."""
+        self.collections += 1
+        count = int(len(self.tt) * self.gc_fraction)
+        by_work = sorted(self.tt.items(), key=lambda item: item[1][2])
+        for key, _ in by_work[:count]:
+            del self.tt[key]
+
+    # ---------- proof tree ----------
+
+    def proof_tree(self, plies, max_nodes=None, deadline=None):
+        """
+        The proof of the last successful prove() as nested dicts
+        {move name: subtree}: one attacker move at attacker nodes, every
+        defence at defender nodes, {} at checkmates. Entries no longer in
+        the table (unsolved children dropped when their parent was solved,
+        or collected as least-work entries) are proved again, within a
+        budget of their own: `max_nodes` more nodes (default: the search's
+        max_nodes) and `deadline`. Returns None if that budget runs out.
+        """
+        saved = self.max_nodes, self.deadline
+        budget = self.max_nodes if max_nodes is None else max_nodes
+        self.max_nodes = None if budget is None else self.nodes + budget
+        self.deadline = deadline or SearchDeadline()
+        try:
+            return self._tree(plies)
+        except _Abort:
+            return None
+        finally:
+            self.max_nodes, self.deadline = saved
+
+    def _tree(self, plies):
+        engine = self.engine
+        moves = engine.get_legal_moves()
+        if not moves:
+            return {}
+        or_node = engine.white_to_move == self.attacker_white
+        tree = {}
+        for move in moves:
+            engine.make_move(move)
+            try:
+                key = (engine.canonical_key(), plies - 1)
+                entry = self.tt.get(key)
+                if entry is None or (entry[0] != 0 and entry[1] != 0):
+                    entry = self._mid(plies - 1, INF, INF)
+                if entry[0] == 0:
+                    tree[move_name(move)] = self._tree(plies - 1)
+                    if or_node:
+                        return tree
+            finally:
+                engine.undo_move()
+        return tree
+
+
+class SolveResult:
+    def __init__(self, outcome, move, search, attacker_white, plies, elapsed):
+        self.outcome = outcome      # "win", "loss", "draw" or "unknown" for the side to move
+        self.move = move            # winning move, move avoiding the loss, or longest defence
+        self.nodes = search.nodes
+        self.elapsed = elapsed
+        self._search = search
+        self._attacker_white = attacker_white
+        self._plies = plies
+
+    def proof_tree(self, max_nodes=None, deadline=None):
+        """
+        Proof tree of the win or loss (None for draws and unknown results, or
+        if re-proving dropped entries exceeds `max_nodes` / `deadline`).
+        """
+        if self.outcome not in ("win", "loss"):
+            return None
+        self._search.attacker_white = self._attacker_white
+        return self._search.proof_tree(self._plies, max_nodes, deadline)
+
+
+def _child_entry(search, move, plies):
+    engine = search.engine
+    engine.make_move(move)
+    try:
+        return search.tt.get((engine.canonical_key(), plies - 1))
+    finally:
+        engine.undo_move()
+
+
+def solve(engine, plies=15, max_nodes=None, max_entries=1_000_000, deadline=None):
+    """Classifies the position on `engine` for the side to move (see module docstring)."""
+    start = time.perf_counter()
+    search = ProofNumberSearch(engine, max_entries, max_nodes, deadline)
+    us = engine.white_to_move
+    moves = engine.get_legal_moves()
+
+    def result(outcome, move, attacker):
+        return SolveResult(outcome, move, search, attacker, plies, time.perf_counter() - start)
+
+    won = search.prove(us, plies)
+    if won is None:
+        return result("unknown", None, us)
+    if won:
+        for move in moves:
+            entry = _child_entry(search, move, plies)
+            if entry is not None and entry[0] == 0:
+                return result("win", move, us)
+
+    lost = search.prove(not us, plies)
+    if lost is None:
+        return result("unknown", None, not us)
+    if lost:
+        # Every move loses; prefer the one that took the most work to refute.
+        move = max(moves, key=lambda m: (_child_entry(search, m, plies) or (0, 0, 0))[2], default=None)
+        return result("loss", move, not us)
+    for move in moves:
+        entry = _child_entry(search, move, plies)
+        if entry is not None and entry[1] == 0:
+            return result("draw", move, not us)
+    return result("draw", moves[0] if moves else None, not us)
+
+
+def _print_tree(tree, indent=1, limit=40):
+    lines = 0
+    for name, subtree in tree.items():
+        print("  " * indent + name)
+        lines += 1 + _print_tree(subtree, indent + 1, limit - lines - 1)
+        if lines >= limit:
+            break
+    return lines
+
+
+def main():
+    from positions import OPENING_POSITIONS
+    parser = argparse.ArgumentParser(description="Solve positions with proof-number search.")
+    parser.add_argument("fens", nargs="*", help="positions (default: positions.OPENING_POSITIONS)")
+    parser.add_argument("--plies", type=int, default=15, help="horizon in half-moves")
+    parser.add_argument("--nodes", type=int, default=200000, help="node budget per position")
+    parser.add_argument("--entries", type=int, default=1_000_000, help="transposition table budget")
+    parser.add_argument("--tree", action="store_true", help="print the proof tree of solved positions")
+    args = parser.parse_args()
+
+    for fen in args.fens or OPENING_POSITIONS.values():
+        engine = GameEngine()
+        engine.load_fen(fen)
+        result = solve(engine, args.plies, args.nodes, args.entries)
+        move = move_name(result.move) if result.move else "-"
+        print(f"{fen:<40} {result.outcome:<8} {move:<6} {result.nodes:>8} nodes {result.elapsed:7.2f}s")
+        if args.tree and result.outcome in ("win", "loss"):
+            _print_tree(result.proof_tree())
+
+
+if __name__ == "__main__":
+    main()
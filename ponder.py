@@ -0,0 +1,171 @@
+"""
+Pondering support: keep searching on the opponent's clock.
+
+After an agent returns its move, a Ponderer starts a background process that
+first predicts the opponent's reply (a short search of PREDICT_TIME seconds
+by the agent, from the opponent's side) and then searches our answer to that
+reply. When the real reply arrives the runner asks the Ponderer to resolve:
+on a hit the pondered move is played and the ponder search's node count and
+SearchStats are reported for it, on a miss the worker is cancelled and the
+agent searches normally. A prediction that has not arrived yet counts as a
+miss; `ready` counts the resolves where it had. Search tables are not handed
+back: the agents clear theirs at the start of every move. Agents that accept
+a deadline are stopped cooperatively through a shared Event before the
+worker is terminated.
+"""
+import multiprocessing
+import time
+from board import GameEngine
+from deadline import SearchDeadline, request_move
+
+PREDICT_TIME = 0.1     # seconds spent guessing the reply, so the guess is ready before it
+
+
+class PonderResult:
+    """Outcome of a completed ponder search."""
+    def __init__(self, predicted, reply, nodes, search_time, stats):
+        self.predicted = predicted      # ((r, c), (r, c)) of the expected opponent move
+        self.reply = reply              # ((r, c), (r, c)) of our answer, or None
+        self.nodes = nodes
+        self.search_time = search_time
+        self.stats = stats              # the ponder search's SearchStats, or None
+
+
+def _squares(move):
+    return ((move.start_row, move.start_col), (move.end_row, move.end_col))
+
+
+def _restore_engine(board, white_to_move, position_history):
+    engine = GameEngine()
+    engine.set_position(board, white_to_move)
+    engine.position_history = dict(position_history)
+    return engine
+
+
+def _ponder_worker(player_type, board, white_to_move, position_history, conn, stop_event,
+                   predict_time=PREDICT_TIME):
+    """Runs in the background process. Sends the prediction, then the result."""
+    engine = _restore_engine(board, white_to_move, position_history)
+
+    # A fresh instance searches from the opponent's side to guess the reply.
+    predictor = player_type(engine)
+    predicted = request_move(predictor, SearchDeadline(predict_time, stop_event=stop_event))
+    if stop_event.is_set():
+        return
+    if predicted is None:
+        conn.send(None)
+        return
+    conn.send(_squares(predicted))
+
+    engine.make_move(predicted)
+    player = player_type(engine)
+    start = time.time()
+    reply = request_move(player, SearchDeadline(stop_event=stop_event))
+    if stop_event.is_set():
+        return
+    conn.send(PonderResult(
+        predicted=_squares(predicted),
+        reply=_squares(reply) if reply else None,
+        nodes=player.nodes_expanded,
+        search_time=time.time() - start,
+        stats=getattr(player, "stats", None),
+    ))
+
+
+class Ponderer:
+    """Manages the background ponder process for one player."""
+    def __init__(self, player_type, predict_time=PREDICT_TIME):
+        self.player_type = player_type
+        self.predict_time = predict_time
+        self.process = None
+        self.conn = None
+        self.stop_event = None
+        self.started_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.ready = 0                  # resolves whose prediction had arrived
+        self.last_ready = False
+        self.total_time = 0.0
+        self.last_time = 0.0
+        self.last_stats = None
+
+    def start(self, engine):
+        """Start pondering on the position after our move (opponent to move)."""
+        self.cancel()
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        self.stop_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=_ponder_worker,
+            args=(self.player_type, engine.board, engine.white_to_move,
+                  engine.position_history, child_conn, self.stop_event, self.predict_time),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.started_at = time.time()
+
+    def is_active(self):
+        return self.process is not None
+
+    def cancel(self, grace=0.05):
+        """
+        Stop the worker: signal the stop event, give a cooperative search
+        `grace` seconds to return, then terminate it.
+        """
+        if self.process is None:
+            return
+        self.stop_event.set()
+        self.process.join(grace)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def resolve(self, engine, player):
+        """
+        Called when the opponent's move has been played on `engine`.
+        Returns our pondered Move on a ponder hit, otherwise None.
+        On a hit the player's node count is set from the ponder search and
+        `last_stats` holds that search's SearchStats. `last_ready` tells
+        whether the prediction had arrived; if not, it counts as a miss.
+        """
+        self.last_stats = None
+        self.last_ready = False
+        if self.process is None:
+            return None
+
+        self.last_time = time.time() - self.started_at
+        self.total_time += self.last_time
+
+        actual = _squares(engine.move_log[-1]) if engine.move_log else None
+        try:
+            self.last_ready = self.conn.poll()
+            predicted = self.conn.recv() if self.last_ready else None
+            self.ready += self.last_ready
+            if predicted is None or predicted != actual:
+                self.misses += 1
+                self.cancel()
+                return None
+
+            # Ponder hit: let the search finish (the caller's clock is running).
+            result = self.conn.recv()
+        except EOFError:
+            # The worker died before reporting back.
+            self.misses += 1
+            self.cancel()
+            return None
+        self.cancel()
+        self.hits += 1
+        if result is None or result.reply is None:
+            return None
+
+        player.nodes_expanded = result.nodes
+        self.last_stats = result.stats
+
+        for move in engine.get_legal_moves():
+            if _squares(move) == result.reply:
+                return move
+        return None
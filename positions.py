@@ -0,0 +1,57 @@
+"""
+Curated 4x8 positions for benchmarks and match testing, in the FEN-like
+format of GameEngine.get_fen() / load_fen().
+
+OPENING_POSITIONS are the initial position after two or four quiet random
+plies (no captures, no check); match harnesses play each of them twice with
+colours swapped. The middlegame and endgame sets were sampled from seeded
+self-play games, keeping quiet positions (side to move not in check). They
+are search benchmarks, not balanced starts: material is often uneven by up
+to a minor piece (eg03 and eg08 have one side a bishop or knight up), so
+do not play matches from them.
+"""
+
+INITIAL_POSITION = "nbkn/pppp/4/4/4/4/PPPP/NBKN w"
+
+OPENING_POSITIONS = {
+    "op01": "nbkn/ppp1/3p/4/4/1N2/PPPP/1BKN w",
+    "op02": "nbkn/1ppp/p3/4/4/2N1/PPPP/NBK1 w",
+    "op03": "1bkn/pppp/4/4/2n1/1NN1/PPPP/1BK1 w",
+    "op04": "nbk1/p1pp/1pn1/4/4/1NN1/PPPP/1BK1 w",
+    "op05": "nbkn/p1pp/1p2/4/4/P3/1PPP/NBKN w",
+    "op06": "nbkn/1ppp/p3/4/4/1N2/PPPP/1BKN w",
+    "op07": "nbkn/ppp1/4/3p/4/2NP/PPP1/NBK1 w",
+    "op08": "nbkn/ppp1/4/3p/4/4/PPPP/NBKN w",
+    "op09": "nbkn/p1pp/1p2/4/4/1N2/PPPP/1BKN w",
+    "op10": "1bkn/pppp/1n2/4/4/P3/1PPP/NBKN w",
+    "op11": "nb1n/pppk/3p/4/4/PN2/1PPP/1BKN w",
+    "op12": "nbkn/1ppp/p3/4/4/2P1/PP1P/NBKN w",
+    "op13": "nbkn/ppp1/3p/4/4/P3/1PPP/NBKN w",
+    "op14": "nbkn/ppp1/3p/4/4/1P2/P1PP/NBKN w",
+    "op15": "nbk1/ppp1/2np/4/4/2N1/PPPP/NB1K w",
+    "op16": "nbk1/pppp/2n1/4/4/3P/PPP1/NBKN w",
+}
+
+MIDDLEGAME_POSITIONS = {
+    "mg01": "k2n/1p1p/1b2/3n/2pP/4/2K1/NB1N w",
+    "mg02": "1k2/bpp1/3p/1p2/3n/P1N1/2BP/N1K1 b",
+    "mg03": "2kn/npb1/4/2p1/2P1/PP1B/2N1/2KN b",
+    "mg04": "3k/1p1p/2p1/4/1b1n/1P1P/B3/N2K b",
+    "mg05": "1b2/k1p1/1n2/p3/P1pn/4/1NNK/1B2 b",
+    "mg06": "1b1k/ppnp/2p1/4/n1P1/4/B2P/N1KN b",
+    "mg07": "1k2/b1pp/pp2/3P/nP2/4/N3/NBK1 w",
+    "mg08": "2kn/1pbp/2p1/p3/P1B1/P3/2PP/N1KN b",
+}
+
+ENDGAME_POSITIONS = {
+    "eg01": "4/4/4/1p1p/3k/4/1K2/4 b",
+    "eg02": "4/1K1k/4/4/2p1/2p1/4/4 w",
+    "eg03": "4/4/N2k/4/n3/b2K/4/4 w",
+    "eg04": "4/4/1P2/1N2/2p1/4/2nK/nk2 b",
+    "eg05": "4/4/2k1/2p1/2K1/3P/4/3B w",
+    "eg06": "4/b1p1/k3/p3/2p1/4/K3/1B2 w",
+    "eg07": "4/2k1/2pp/p3/2K1/4/3P/4 b",
+    "eg08": "4/2N1/4/1Pp1/4/4/k1n1/n2K w",
+}
+
+BENCHMARK_POSITIONS = {"initial": INITIAL_POSITION, **MIDDLEGAME_POSITIONS, **ENDGAME_POSITIONS}
@@ -0,0 +1,232 @@
+"""
+Per-move profiling for game_runner.
+
+MoveProfiler wraps each get_best_move() call in cProfile. Moves slower than
+`threshold` seconds get their own .prof file (loadable with pstats or
+snakeviz), and all profiled moves are merged into one hot-function report
+per agent when the game ends.
+
+EvalTermProfiler times the individual terms of an agent's evaluation
+(`_evaluate_material`, `_evaluate_mobility`, ...) and records the values
+they return, for a cost-vs-impact table (`benchmark.py --eval-terms`).
+"""
+import cProfile
+import io
+import os
+import pstats
+import math
+import time
+from deadline import request_move
+
+# Functions whose share of the move time is always listed in the report.
+WATCHED_FUNCTIONS = (
+    "get_legal_moves",
+    "_get_all_possible_moves",
+    "_is_square_attacked",
+    "update_position_history",
+    "make_move",
+    "undo_move",
+    "get_game_state",
+)
+
+# Top-level evaluation entry points of the agents; reported as one row.
+EVALUATION_FUNCTIONS = ("evaluate_board", "_evaluate_terminal_or_board")
+
+
+class MoveProfiler:
+    """Profiles get_best_move() calls and writes per-move and per-agent reports."""
+    def __init__(self, output_dir, threshold=0.0, top=25):
+        self.output_dir = output_dir
+        self.threshold = threshold
+        self.top = top
+        self.aggregate = {}    # agent name -> pstats.Stats
+        self.move_counts = {}  # agent name -> number of moves kept
+        os.makedirs(output_dir, exist_ok=True)
+
+    def run(self, player, turn, deadline=None):
+        """Calls player.get_best_move() under the profiler and returns the move."""
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            move = request_move(player, deadline)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= self.threshold:
+            name = player.__class__.__name__
+            profiler.create_stats()
+            path = os.path.join(self.output_dir, f"{name}_turn{turn:03d}.prof")
+            profiler.dump_stats(path)
+            if name in self.aggregate:
+                self.aggregate[name].add(profiler)
+            else:
+                self.aggregate[name] = pstats.Stats(profiler)
+            self.move_counts[name] = self.move_counts.get(name, 0) + 1
+        return move
+
+    def write_reports(self):
+        """Writes <agent>_hot.txt for every agent with at least one kept move."""
+        paths = []
+        for name, stats in self.aggregate.items():
+            path = os.path.join(self.output_dir, f"{name}_hot.txt")
+            with open(path, "w") as f:
+                f.write(self.format_report(name, stats))
+            paths.append(path)
+        return paths
+
+    def format_report(self, name, stats):
+        total = stats.total_tt
+        lines = [
+            f"Agent: {name}",
+            f"Profiled moves: {self.move_counts.get(name, 0)} (threshold {self.threshold:.3f}s)",
+            f"Total profiled time: {total:.3f}s",
+            "",
+            "Share of time (cumulative) in watched functions:",
+        ]
+        for func_name in WATCHED_FUNCTIONS:
+            cumulative, calls = _cumulative_time(stats, func_name)
+            share = 100.0 * cumulative / total if total else 0.0
+            lines.append(f"  {func_name:<28} {share:6.1f}%  {cumulative:8.3f}s  {calls:>9} calls")
+
+        cumulative, calls = _cumulative_time(stats, *EVALUATION_FUNCTIONS)
+        share = 100.0 * cumulative / total if total else 0.0
+        lines.append(f"  {'evaluation':<28} {share:6.1f}%  {cumulative:8.3f}s  {calls:>9} calls")
+        lines.append("")
+
+        for sort_key in ("tottime", "cumulative"):
+            buf = io.StringIO()
+            stats.stream = buf
+            stats.sort_stats(sort_key).print_stats(self.top)
+            lines.append(f"Top {self.top} functions by {sort_key}:")
+            lines.append(buf.getvalue())
+        return "\n".join(lines)
+
+
+def _cumulative_time(stats, *func_names):
+    """
+    Sums cumulative time and call counts over all functions with one of the
+    given names (any file). cProfile counts recursive calls only once in the
+    cumulative time, so recursion does not double count.
+    """
+    cumulative, calls = 0.0, 0
+    for (filename, line, name), (cc, nc, tt, ct, callers) in stats.stats.items():
+        if name in func_names:
+            cumulative += ct
+            calls += nc
+    return cumulative, calls
+
+
+class EvalTermProfiler:
+    """
+    Per-term evaluation profiler. attach(agent) replaces the agent's term
+    methods with timing wrappers on that instance only; detach(agent)
+    removes them again, so agents without an attached profiler run the
+    plain methods with no overhead. Statistics are pooled over every agent
+    attached, e.g. one fresh player per benchmark position.
+    """
+    def __init__(self, terms=None):
+        self.terms = terms      # method names; None: the agent's own terms (see _term_names)
+        self.calls = {}         # term -> number of calls
+        self.times = {}         # term -> list of call durations in seconds
+        self.sums = {}          # term -> [sum of values, sum of squared values]
+
+    def _term_names(self, agent):
+        """
+        The terms given to the constructor, else the agent's declared
+        EVAL_TERMS (method names or (name, bound) pairs), else the terms of
+        its LazyEvaluator, else its _evaluate_* methods.
+        """
+        if self.terms is not None:
+            return list(self.terms)
+        declared = getattr(agent, "EVAL_TERMS", None)
+        if declared:
+            return [term if isinstance(term, str) else term[0] for term in declared]
+        evaluator = getattr(agent, "evaluator", None)
+        if getattr(evaluator, "names", None):
+            return list(evaluator.names)
+        return [name for name in dir(type(agent))
+                if name.startswith("_evaluate_") and name not in EVALUATION_FUNCTIONS
+                and callable(getattr(agent, name))]
+
+    def attach(self, agent):
+        for name in self._term_names(agent):
+            setattr(agent, name, self._wrap(name, getattr(agent, name)))
+        self._rebind(agent)
+        return agent
+
+    def detach(self, agent):
+        for name in self._term_names(agent):
+            if name in vars(agent):
+                delattr(agent, name)
+        self._rebind(agent)
+
+    @staticmethod
+    def _rebind(agent):
+        # LazyEvaluator holds the bound term methods it was built with.
+        evaluator = getattr(agent, "evaluator", None)
+        if hasattr(evaluator, "bind"):
+            evaluator.bind(agent)
+
+    def _wrap(self, name, method):
+        self.calls.setdefault(name, 0)
+        times = self.times.setdefault(name, [])
+        sums = self.sums.setdefault(name, [0.0, 0.0])
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            value = method(*args, **kwargs)
+            times.append(clock() - start)
+            self.calls[name] += 1
+            sums[0] += value
+            sums[1] += value * value
+            return value
+        return timed
+
+    def rows(self):
+        """One dict per term, most expensive (total time) first."""
+        grand_total = sum(sum(times) for times in self.times.values())
+        rows = []
+        for name, times in self.times.items():
+            calls = self.calls[name]
+            if not calls:
+                continue
+            ordered = sorted(times)
+            total = sum(ordered)
+            mean = self.sums[name][0] / calls
+            std = math.sqrt(max(0.0, self.sums[name][1] / calls - mean * mean))
+            mean_us = 1e6 * total / calls
+            rows.append({
+                "term": name,
+                "calls": calls,
+                "total": total,
+                "share": 100.0 * total / grand_total if grand_total else 0.0,
+                "mean_us": mean_us,
+                "p50_us": 1e6 * ordered[min(calls - 1, calls // 2)],
+                "p90_us": 1e6 * ordered[min(calls - 1, int(calls * 0.9))],
+                "p99_us": 1e6 * ordered[min(calls - 1, int(calls * 0.99))],
+                "mean_value": mean,
+                "std_value": std,
+                "std_per_us": std / mean_us if mean_us else 0.0,
+            })
+        rows.sort(key=lambda row: row["total"], reverse=True)
+        return rows
+
+    def format_table(self, title=None):
+        """
+        Cost-vs-impact table: call counts and time per call (cost) next to
+        the mean and standard deviation of the returned values (impact;
+        a term with a tiny deviation barely changes move choices). Shares
+        are of the summed term time, so they assume terms do not call each other.
+        """
+        lines = [title] if title else []
+        lines.append(f"{'Term':<28} {'Calls':>8} {'Total s':>8} {'Share':>6} {'Mean us':>8} "
+                     f"{'p50':>7} {'p90':>7} {'p99':>7} {'Mean':>8} {'Std':>8} {'Std/us':>7}")
+        for row in self.rows():
+            lines.append(f"{row['term']:<28} {row['calls']:>8} {row['total']:8.3f} {row['share']:5.1f}% "
+                         f"{row['mean_us']:8.1f} {row['p50_us']:7.1f} {row['p90_us']:7.1f} "
+                         f"{row['p99_us']:7.1f} {row['mean_value']:8.2f} {row['std_value']:8.2f} "
+                         f"{row['std_per_us']:7.3f}")
+        return "\n".join(lines)
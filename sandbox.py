@@ -0,0 +1,207 @@
+"""
+Sandboxed agents: each agent runs in its own long-lived worker process.
+
+SandboxedPlayer looks like an agent to run_game (get_best_move, depth,
+nodes_expanded, stats) but forwards every request to a worker process that
+owns the real agent and a private GameEngine. Each request carries the
+game's base position (the FEN the game started from) and the move codes
+played since. The worker replays only the new moves when its engine is
+still on that base and its move log is a prefix of the game's. Otherwise
+it reloads the base and replays everything. If the result does not match the
+real position's key (for example because the agent left its engine
+modified) it falls back to set_position.
+
+get_best_move(time_limit) waits at most `time_limit + grace` seconds. A worker
+that has not answered by then is killed and restarted for the next request,
+so an agent that never returns cannot block the game. On POSIX systems the
+worker also runs under CPU-time and address-space limits.
+"""
+import multiprocessing
+import traceback
+from board import GameEngine, encode_move, decode_move
+from search_stats import SearchStats
+from deadline import SearchDeadline, request_move
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+class SandboxError(Exception):
+    """Raised when the agent cannot be started inside its worker."""
+
+
+def _apply_limits(memory_limit_mb, cpu_limit):
+    if resource is None:
+        return
+    if memory_limit_mb:
+        limit = int(memory_limit_mb * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_limit:
+        seconds = int(cpu_limit)
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+
+
+def _sync(engine, base, base_fen, codes, board, white_to_move, key):
+    """
+    Brings the worker engine to the given position. `base` is the (FEN,
+    position key) the worker's move log starts from, or None; returns the
+    new one (None after a set_position fallback).
+    """
+    log = [encode_move(m) for m in engine.move_log]
+    if base is None or base[0] != base_fen or len(log) > len(codes) or codes[:len(log)] != log \
+            or (not log and engine.position_key() != base[1]):
+        engine.load_fen(base_fen)
+        base, log = (base_fen, engine.position_key()), []
+    try:
+        for code in codes[len(log):]:
+            move = decode_move(code, engine.board)
+            if move not in engine.get_legal_moves():
+                raise ValueError(f"move code {code} does not fit the worker's position")
+            engine.make_move(move)
+    except ValueError:
+        pass
+    if engine.position_key() != key or engine.board != board:
+        engine.set_position(board, white_to_move)
+        base = None
+    return base
+
+
+def _sandbox_worker(player_type, conn, memory_limit_mb, cpu_limit):
+    try:
+        _apply_limits(memory_limit_mb, cpu_limit)
+        engine = GameEngine()
+        base = None
+        player = player_type(engine)
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+        return
+    conn.send(("ready", getattr(player, "depth", 0)))
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        base_fen, codes, board, white_to_move, key, time_limit = request
+        base = _sync(engine, base, base_fen, codes, board, white_to_move, key)
+        move = request_move(player, SearchDeadline(time_limit))
+        stats = getattr(player, "stats", None)
+        if stats is not None:
+            stats.finish()
+        conn.send((
+            encode_move(move) if move else None,
+            getattr(player, "nodes_expanded", 0),
+            vars(stats).copy() if stats is not None else None,
+        ))
+
+
+class SandboxedPlayer:
+    """Agent proxy that runs `player_type` in a separate, killable process."""
+    def __init__(self, player_type, engine, memory_limit_mb=None, cpu_limit=None,
+                 grace=0.5, startup_timeout=30.0):
+        self.player_type = player_type
+        self.engine = engine
+        self.agent_name = player_type.__name__
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit = cpu_limit
+        self.grace = grace
+        self.startup_timeout = startup_timeout
+        self.nodes_expanded = 0
+        self.depth = 0
+        self.stats = SearchStats()
+        self.timeouts = 0
+        self.crashes = 0
+        self.illegal_moves = 0
+        self.base_fen = engine.get_fen()        # position the game's move log starts from
+        self.base_ply = len(engine.move_log)
+        self.process = None
+        self.conn = None
+        self._start()
+
+    def _start(self):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_sandbox_worker,
+            args=(self.player_type, child_conn, self.memory_limit_mb, self.cpu_limit),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+        if not self.conn.poll(self.startup_timeout):
+            self._kill()
+            raise SandboxError(f"{self.agent_name} did not start within {self.startup_timeout}s")
+        try:
+            status, payload = self.conn.recv()
+        except EOFError:
+            self._kill()
+            raise SandboxError(f"{self.agent_name} exited during startup") from None
+        if status == "error":
+            self._kill()
+            raise SandboxError(f"{self.agent_name} failed to start:\n{payload}")
+        self.depth = payload
+
+    def _kill(self):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+    def get_best_move(self, time_limit=None):
+        """
+        Asks the worker for a move on the current position. Returns None if the
+        worker exceeded `time_limit` (+ grace), crashed, or returned an illegal move.
+        """
+        if self.process is None:
+            self._start()
+        self.stats.reset()
+
+        engine = self.engine
+        if len(engine.move_log) < self.base_ply:
+            # The game engine was reset since we recorded the base.
+            self.base_fen, self.base_ply = engine.get_fen(), len(engine.move_log)
+        request = (self.base_fen, [encode_move(m) for m in engine.move_log[self.base_ply:]],
+                   engine.board, engine.white_to_move, engine.position_key(), time_limit)
+        try:
+            self.conn.send(request)
+            timeout = None if time_limit is None else max(0.0, time_limit) + self.grace
+            if not self.conn.poll(timeout):
+                self.timeouts += 1
+                self._kill()
+                return None
+            code, nodes, stats = self.conn.recv()
+        except (EOFError, OSError):
+            self.crashes += 1
+            self._kill()
+            return None
+
+        self.nodes_expanded = nodes
+        if stats is not None:
+            self.stats.__dict__.update(stats)
+        if code is None:
+            return None
+        move = decode_move(code, self.engine.board)
+        if move not in self.engine.get_legal_moves():
+            self.illegal_moves += 1
+            return None
+        return move
+
+    def close(self):
+        """Stops the worker process."""
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1.0)
+        self._kill()
@@ -0,0 +1,415 @@
+"""
+Shared alpha-beta search for GameEngine agents: a transposition table,
+principal variations and a multi-PV analysis mode.
+
+Searcher runs iterative-deepening negamax with principal variation search
+(the first move with the full window, later moves with a null window and a
+re-search if they beat alpha). It works with any evaluation that scores the
+position on the engine from White's point of view, such as an agent's
+evaluate_board. If the evaluation accepts `alpha` and `beta` (White's view,
+like B22CH0322's lazy evaluation) the node's window is passed on. Moves
+are ordered by a move_ordering.MoveOrderer (TT move, MVV-LVA captures,
+killers, countermoves, history), aged at the start of every search.
+
+    searcher = Searcher(engine, agent.evaluate_board)
+    lines = searcher.search(depth=4, multipv=3, deadline=SearchDeadline(2.0))
+    for line in lines:
+        print(move_name(line.move), line.score, " ".join(move_name(m) for m in line.pv))
+
+With multipv=k, line i is the best of the root moves not already chosen
+for lines 1..i-1. Each line is searched with a full window, so every line
+has an exact score and its own principal variation. The transposition
+table is shared between lines, iterations and calls, so lines after the
+first mostly re-read entries and cost far less than separate searches.
+
+Scores are from White's point of view, mates as +-(MATE_SCORE - plies to mate).
+
+Selectivity toggles (constructor keywords, all off by default so analysis
+scores stay exact; search_agent.SearchAgent turns them on):
+    lmr               late move reductions: quiet moves after the first
+                      LMR_MIN_MOVES are searched LMR_TABLE[depth][move
+                      number] plies shallower with a null window, and again
+                      at full depth if they beat alpha
+    futility          at depth <= 2, quiet non-checking moves are skipped
+                      when the static evaluation plus FUTILITY_MARGINS[depth]
+                      cannot reach alpha
+    reverse_futility  at depth <= RFP_MAX_DEPTH, return the static
+                      evaluation when it beats beta by RFP_MARGIN per ply
+    check_extensions  positions with the side to move in check are searched
+                      one ply deeper (up to twice the iteration depth)
+Pruning and reductions only apply at non-PV nodes (except LMR) and never
+when in check. The static evaluation they compare is only computed when a
+decision needs it (reverse futility unless the TT bound already settles it,
+futility once a quiet move after the first comes up) and is kept in the
+node's TT entry, so later iterations reuse it. `counters` counts how often
+each one fired.
+
+    python search.py [fen ...] --agent B22CH0322 --depth 4 --multipv 3
+"""
+import argparse
+import inspect
+import math
+
+from config import *
+from board import GameEngine, encode_move, move_name
+from deadline import SearchDeadline
+from move_ordering import MoveOrderer
+from search_stats import SearchStats, MATE_SCORE
+
+INF = 10 ** 9
+MAX_PLY = 150               # run_game's turn limit bounds every line
+EXACT, LOWER, UPPER, NONE = 0, 1, 2, 3     # NONE: the entry only holds a static evaluation
+
+LMR_MIN_DEPTH = 3
+LMR_MIN_MOVES = 2
+# Reduction by remaining depth and move number: grows with both, as in most engines.
+LMR_TABLE = [[0 if d < LMR_MIN_DEPTH or i < LMR_MIN_MOVES else
+              max(1, int(0.5 + math.log(d) * math.log(i) / 2.0)) for i in range(64)]
+             for d in range(MAX_PLY + 2)]
+FUTILITY_MARGINS = (0, 40, 80)      # by remaining depth, in evaluation units (a pawn is 20)
+RFP_MAX_DEPTH = 3
+RFP_MARGIN = 35
+
+
+class PVLine:
+    """One multi-PV line: root move, exact score (White's view) and principal variation."""
+    def __init__(self, move, score, pv, depth):
+        self.move = move
+        self.score = score
+        self.pv = pv
+        self.depth = depth
+
+    def __repr__(self):
+        return f"PVLine({move_name(self.move)}, {self.score}, {' '.join(move_name(m) for m in self.pv)})"
+
+
+def _accepts_window(evaluate):
+    try:
+        return "alpha" in inspect.signature(evaluate).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class Searcher:
+    """Iterative-deepening PVS with a transposition table over one GameEngine."""
+    def __init__(self, engine, evaluate, stats=None, tt_entries=1 << 20, orderer=None,
+                 lmr=False, futility=False, reverse_futility=False, check_extensions=False):
+        self.engine = engine
+        self.evaluate = evaluate
+        self.evaluate_window = _accepts_window(evaluate)
+        self.stats = stats or SearchStats()
+        self.tt = {}                # position key -> (depth, score, flag, packed best move, static)
+        self.tt_entries = tt_entries
+        self.orderer = orderer or MoveOrderer(MAX_PLY + 1)
+        self.deadline = SearchDeadline()
+        self.lmr = lmr
+        self.futility = futility
+        self.reverse_futility = reverse_futility
+        self.check_extensions = check_extensions
+        self.selective = lmr or futility or reverse_futility or check_extensions
+        self.counters = {}
+        self._max_ply = MAX_PLY
+
+    def clear(self):
+        self.tt.clear()
+        self.orderer.clear()
+
+    def search(self, depth, multipv=1, deadline=None):
+        """
+        Searches to `depth` plies and returns up to `multipv` PVLines, best
+        first, from the last iteration completed before the deadline (an
+        empty list if not even depth 1 finished or there are no moves).
+        """
+        self.deadline = deadline or SearchDeadline()
+        self.counters = {"lmr": 0, "lmr_researches": 0, "futility": 0, "reverse_futility": 0,
+                         "extensions": 0}
+        self.orderer.age()
+        engine = self.engine
+        root_moves = engine.get_legal_moves()
+        lines = []
+        start_ply = len(engine.move_log)
+        for current_depth in range(1, depth + 1):
+            if not root_moves or self.deadline.expired():
+                break
+            self._max_ply = min(MAX_PLY, 2 * current_depth)
+            try:
+                self.stats.begin_iteration(current_depth)
+                lines = self._search_root(root_moves, current_depth, min(multipv, len(root_moves)))
+                self.stats.end_iteration(current_depth)
+            except TimeoutError:
+                while len(engine.move_log) > start_ply:
+                    engine.undo_move()
+                break
+            # The next iteration starts with this one's best moves.
+            best = [line.move for line in lines]
+            root_moves = best + [move for move in root_moves if move not in best]
+        if lines:
+            self.stats.score = lines[0].score
+        return lines
+
+    # ---------- search ----------
+
+    def _search_root(self, moves, depth, multipv):
+        engine = self.engine
+        sign = 1 if engine.white_to_move else -1
+        lines = []
+        chosen = []
+        for _ in range(multipv):
+            alpha = -INF
+            best_score, best_move, best_pv = -INF, None, []
+            for i, move in enumerate(m for m in moves if m not in chosen):
+                pv = []
+                engine.make_move(move)
+                try:
+                    if i == 0:
+                        score = -self._negamax(depth - 1, -INF, -alpha, 1, pv)
+                    else:
+                        score = -self._negamax(depth - 1, -alpha - 1, -alpha, 1, pv)
+                        if score > alpha:
+                            pv = []
+                            score = -self._negamax(depth - 1, -INF, -alpha, 1, pv)
+                finally:
+                    engine.undo_move()
+                if score > best_score:
+                    best_score, best_move, best_pv = score, move, pv
+                    alpha = max(alpha, score)
+            chosen.append(best_move)
+            lines.append(PVLine(best_move, sign * best_score, [best_move] + best_pv, depth))
+        return lines
+
+    def _negamax(self, depth, alpha, beta, ply, pv):
+        """Fail-soft negamax score for the side to move; fills `pv` at PV nodes."""
+        if self.deadline.should_stop():
+            raise TimeoutError()
+        engine = self.engine
+        stats = self.stats
+        stats.nodes += 1
+        pv_node = beta - alpha > 1
+
+        key = engine.position_key()
+        stats.tt_probes += 1
+        entry = self.tt.get(key)
+        tt_move = tt_score = None
+        tt_flag = NONE
+        static = None
+        if entry is not None:
+            stats.tt_hits += 1
+            tt_depth, tt_score, tt_flag, tt_move, static = entry
+            tt_score = _score_from_tt(tt_score, ply)
+            if tt_depth >= depth and not pv_node:
+                if tt_flag == EXACT or (tt_flag == LOWER and tt_score >= beta) or \
+                        (tt_flag == UPPER and tt_score <= alpha):
+                    stats.tt_cutoffs += 1
+                    return tt_score
+            if static is not None:
+                static = (_score_from_tt(static[0], ply), static[1])
+
+        in_check = self.selective and engine.is_in_check()
+        if in_check and self.check_extensions and ply < self._max_ply:
+            depth += 1
+            self.counters["extensions"] += 1
+
+        if depth <= 0:
+            return self._evaluate(alpha, beta, ply)
+
+        # Pruning near the leaves: quiet moves are futile when the static
+        # evaluation is at most `futility_low`, the node is cut (reverse
+        # futility) when it is at least `rfp_high`. The static evaluation is
+        # only computed once a decision needs it, with the window [low, high]
+        # that settles both comparisons, and is kept in the TT entry.
+        futility_low = rfp_high = None
+        if not pv_node and not in_check and abs(beta) < MATE_SCORE - MAX_PLY:
+            if self.futility and depth < len(FUTILITY_MARGINS):
+                futility_low = alpha - FUTILITY_MARGINS[depth]
+            if self.reverse_futility and depth <= RFP_MAX_DEPTH:
+                rfp_high = beta + RFP_MARGIN * depth
+        low = alpha if futility_low is None else futility_low
+        high = beta if rfp_high is None else rfp_high
+        if rfp_high is not None:
+            # A shallower search's bound on this node may settle the decision.
+            if tt_flag in (EXACT, LOWER) and tt_score >= rfp_high:
+                self.counters["reverse_futility"] += 1
+                return tt_score
+            if not (tt_flag in (EXACT, UPPER) and tt_score < beta):
+                static = self._static_eval(key, static, low, high, ply)
+                if static[1] != UPPER and static[0] >= rfp_high:
+                    self.counters["reverse_futility"] += 1
+                    return static[0]
+
+        moves = engine.get_legal_moves()
+        if not moves:
+            return -(MATE_SCORE - ply) if engine.is_in_check() else 0
+
+        previous = engine.move_log[-1] if engine.move_log else None
+        original_alpha = alpha
+        best_score, best_move = -INF, None
+        for i, move in enumerate(self.orderer.order(moves, ply, tt_move, previous)):
+            child_pv = []
+            quiet = move.piece_captured == EMPTY_SQUARE
+            futile = False
+            if i > 0 and quiet and futility_low is not None:
+                static = self._static_eval(key, static, low, high, ply)
+                futile = static[1] != LOWER and static[0] <= futility_low
+            engine.make_move(move)
+            try:
+                reduction = 0
+                if i > 0 and quiet and not in_check and (futile or (self.lmr and depth >= LMR_MIN_DEPTH
+                                                                     and i >= LMR_MIN_MOVES)):
+                    if not engine.is_in_check():        # the move does not give check
+                        if futile:
+                            self.counters["futility"] += 1
+                            best_score = max(best_score, static[0] + alpha - futility_low)
+                            continue
+                        reduction = LMR_TABLE[depth][min(i, 63)]
+                        if pv_node:
+                            reduction = max(1, reduction - 1)
+                        self.counters["lmr"] += 1
+                if i == 0:
+                    score = -self._negamax(depth - 1, -beta, -alpha, ply + 1, child_pv)
+                else:
+                    score = -self._negamax(depth - 1 - reduction, -alpha - 1, -alpha, ply + 1, child_pv)
+                    if reduction and score > alpha:
+                        self.counters["lmr_researches"] += 1
+                        score = -self._negamax(depth - 1, -alpha - 1, -alpha, ply + 1, child_pv)
+                    if alpha < score < beta:
+                        child_pv = []
+                        score = -self._negamax(depth - 1, -beta, -alpha, ply + 1, child_pv)
+            finally:
+                engine.undo_move()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    pv[:] = [move] + child_pv
+                    if alpha >= beta:
+                        stats.cutoffs += 1
+                        if i == 0:
+                            stats.first_move_cutoffs += 1
+                        self.orderer.cutoff(move, ply, depth, previous)
+                        break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._store(key, depth, _score_to_tt(best_score, ply), flag, encode_move(best_move))
+        return best_score
+
+    def _evaluate(self, alpha, beta, ply):
+        """Static evaluation for the side to move, with mates scored by distance."""
+        white = self.engine.white_to_move
+        if self.evaluate_window:
+            score = self.evaluate(alpha, beta) if white else self.evaluate(-beta, -alpha)
+        else:
+            score = self.evaluate()
+        if not white:
+            score = -score
+        if score >= MATE_SCORE:
+            return MATE_SCORE - ply
+        if score <= -MATE_SCORE:
+            return -(MATE_SCORE - ply)
+        return score
+
+    def _static_eval(self, key, static, low, high, ply):
+        """
+        (score, bound) of the static evaluation: `static` (from the TT) if it
+        is exact or a bound beyond [low, high], else a fresh evaluation with
+        that window, which is stored in the TT.
+        """
+        if static is not None:
+            score, bound = static
+            if bound == EXACT or (bound == UPPER and score <= low) or (bound == LOWER and score >= high):
+                return static
+        score = self._evaluate(low, high, ply)
+        if not self.evaluate_window or low < score < high:
+            bound = EXACT
+        else:
+            bound = UPPER if score <= low else LOWER
+        self._store(key, -1, 0, NONE, None, (_score_to_tt(score, ply), bound))
+        return score, bound
+
+    def _store(self, key, depth, score, flag, move_code, static=None):
+        """Stores a search result; a deeper entry's result is kept. The static evaluation is kept too."""
+        old = self.tt.get(key)
+        if old is not None:
+            static = static or old[4]
+            if old[0] > depth:
+                depth, score, flag, move_code = old[:4]
+        elif len(self.tt) >= self.tt_entries:
+            self.tt.clear()
+        self.tt[key] = (depth, score, flag, move_code, static)
+
+    # ---------- principal variation ----------
+
+    def principal_variation(self, max_length=MAX_PLY):
+        """Best line from the current position read back from the transposition table."""
+        engine = self.engine
+        line = []
+        seen = set()
+        while len(line) < max_length:
+            entry = self.tt.get(engine.position_key())
+            if entry is None or entry[2] != EXACT or engine.position_key() in seen:
+                break
+            seen.add(engine.position_key())
+            move = next((m for m in engine.get_legal_moves() if encode_move(m) == entry[3]), None)
+            if move is None:
+                break
+            line.append(move)
+            engine.make_move(move)
+        for _ in line:
+            engine.undo_move()
+        return line
+
+
+def _score_to_tt(score, ply):
+    """Mate scores are stored relative to the node, not the root."""
+    if score >= MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -(MATE_SCORE - MAX_PLY):
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -(MATE_SCORE - MAX_PLY):
+        return score + ply
+    return score
+
+
+# Agents whose evaluate_board() takes no arguments and scores from White's
+# point of view, as Searcher requires (others score for their own side or
+# need extra arguments).
+WHITE_VIEW_AGENTS = ("B22CH0322", "B22CS061", "B23CM1036")
+
+
+def main():
+    from agent_registry import AgentRegistry
+    from positions import BENCHMARK_POSITIONS
+    parser = argparse.ArgumentParser(description="Multi-PV analysis with an agent's evaluation.")
+    parser.add_argument("fens", nargs="*", help="positions (default: positions.BENCHMARK_POSITIONS)")
+    parser.add_argument("--agent", default="B22CH0322", choices=WHITE_VIEW_AGENTS,
+                        help="agent whose evaluate_board is used")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--multipv", type=int, default=3)
+    parser.add_argument("--time", type=float, default=None, help="seconds per position")
+    args = parser.parse_args()
+
+    agent_type = AgentRegistry().load(args.agent)
+    for fen in args.fens or BENCHMARK_POSITIONS.values():
+        engine = GameEngine()
+        engine.load_fen(fen)
+        agent = agent_type(engine)
+        searcher = Searcher(engine, agent.evaluate_board)
+        lines = searcher.search(args.depth, args.multipv, SearchDeadline(args.time))
+        stats = searcher.stats
+        print(f"{fen}  (depth {stats.depth_reached}, {stats.nodes} nodes)")
+        for i, line in enumerate(lines, 1):
+            print(f"  {i}. {line.score:>7}  {' '.join(move_name(m) for m in line.pv)}")
+
+
+if __name__ == "__main__":
+    main()
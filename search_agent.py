@@ -0,0 +1,50 @@
+"""
+Agent playing with the shared search (search.py) and B22CH0322's evaluation.
+
+SearchAgent runs Searcher with the selectivity toggles in OPTIONS (late
+move reductions, futility and reverse-futility pruning, check extensions;
+all on by default), keeping the transposition table between moves. A
+subclass, or search_bench.py, can switch single toggles off:
+
+    class NoLMRAgent(SearchAgent):
+        OPTIONS = dict(SearchAgent.OPTIONS, lmr=False)
+"""
+from B22CH0322 import B22CH0322
+from deadline import SearchDeadline
+from search import Searcher
+
+
+class SearchAgent:
+    """Iterative-deepening PVS with reductions, pruning and extensions."""
+    OPTIONS = {"lmr": True, "futility": True, "reverse_futility": True, "check_extensions": True}
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.nodes_expanded = 0
+        self.depth = 64                 # iterative deepening stops at the deadline
+        self.time_limit = 1.0           # upper bound per move
+        self.moves_to_go = 30           # share of the remaining clock used per move
+        self.evaluator = B22CH0322(engine)
+        self.searcher = Searcher(engine, self.evaluator.evaluate_board, **self.OPTIONS)
+        self.stats = self.searcher.stats
+
+    def get_best_move(self, deadline=None):
+        deadline = deadline or SearchDeadline()
+        budget = self.time_limit
+        if deadline.remaining() is not None:
+            # The runner's deadline is the whole remaining clock: spread it over the game.
+            budget = min(budget, deadline.remaining() / self.moves_to_go)
+        deadline = deadline.within(budget, check_every=16)
+        self.stats.reset()
+        self.nodes_expanded = 0
+
+        legal_moves = self.engine.get_legal_moves()
+        if not legal_moves:
+            return None
+        if len(legal_moves) == 1:
+            return legal_moves[0]
+
+        lines = self.searcher.search(self.depth, 1, deadline)
+        self.nodes_expanded = self.stats.nodes
+        self.stats.finish()
+        return lines[0].move if lines else legal_moves[0]
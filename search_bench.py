@@ -0,0 +1,134 @@
+"""
+Node-count, depth and strength benchmark for the search.py selectivity toggles.
+
+For every configuration in CONFIGS (full-width search, everything on, and
+everything on but one toggle) it reports over positions.BENCHMARK_POSITIONS
+- the nodes and time to a fixed depth, and how many best moves agree with
+  the full-width search,
+- the depth reached in a fixed time per position,
+and with --games, plays game pairs from the opening positions between two
+configurations of SearchAgent (colours swapped) and reports the score and
+Elo difference.
+
+    python search_bench.py --depth 5 --time 1.0
+    python search_bench.py --depth 0 --time 0 --games 20 --game-time 30 --candidate all --baseline none
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from B22CH0322 import B22CH0322
+from board import GameEngine, move_name
+from deadline import SearchDeadline
+from positions import BENCHMARK_POSITIONS, OPENING_POSITIONS
+from search import Searcher
+from search_agent import SearchAgent
+from sprt import SPRT, play_pair
+
+TOGGLES = ("lmr", "futility", "reverse_futility", "check_extensions")
+CONFIGS = {"none": {t: False for t in TOGGLES}, "all": {t: True for t in TOGGLES}}
+CONFIGS.update({f"no_{t}": dict(CONFIGS["all"], **{t: False}) for t in TOGGLES})
+
+
+def _searcher(fen, options):
+    engine = GameEngine()
+    engine.load_fen(fen)
+    return Searcher(engine, B22CH0322(engine).evaluate_board, **options)
+
+
+def fixed_depth(options, depth, positions=BENCHMARK_POSITIONS):
+    """{position name: (nodes, seconds, move name)} for searches to `depth`."""
+    results = {}
+    for name, fen in positions.items():
+        searcher = _searcher(fen, options)
+        start = time.perf_counter()
+        lines = searcher.search(depth)
+        results[name] = (searcher.stats.nodes, time.perf_counter() - start,
+                         move_name(lines[0].move) if lines else None)
+    return results
+
+
+def fixed_time(options, seconds, positions=BENCHMARK_POSITIONS):
+    """{position name: depth completed} for searches of `seconds` each."""
+    results = {}
+    for name, fen in positions.items():
+        searcher = _searcher(fen, options)
+        searcher.search(64, deadline=SearchDeadline(seconds))
+        results[name] = searcher.stats.depth_reached
+    return results
+
+
+def _agent_type(name):
+    """SearchAgent subclass for configuration `name` (a play_pair loader)."""
+    return type(f"SearchAgent_{name}", (SearchAgent,), {"OPTIONS": CONFIGS[name]})
+
+
+def strength(candidate, baseline, pairs, game_time, workers=None):
+    """
+    Plays `pairs` game pairs with sprt.play_pair. Returns the SPRT object
+    holding the pair scores (see .elo()) and the number of failed pairs.
+    """
+    test = SPRT()
+    errors = 0
+    starts = itertools.islice(itertools.cycle(OPENING_POSITIONS.values()), pairs)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(play_pair, candidate, baseline, fen, game_time, loader=_agent_type)
+                   for fen in starts]
+        for future in as_completed(futures):
+            score, _ = future.result()
+            if score is None:
+                errors += 1
+            else:
+                test.add(score)
+    return test, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search selectivity toggles.")
+    parser.add_argument("configs", nargs="*", help=f"configurations (default: all of {', '.join(CONFIGS)})")
+    parser.add_argument("--depth", type=int, default=5, help="fixed depth for node counts (0 to skip)")
+    parser.add_argument("--time", type=float, default=1.0, help="seconds per position for depth reached (0 to skip)")
+    parser.add_argument("--games", type=int, default=0, help="game pairs to play for the strength test")
+    parser.add_argument("--game-time", type=float, default=30.0, help="seconds per side per game")
+    parser.add_argument("--candidate", default="all", choices=sorted(CONFIGS))
+    parser.add_argument("--baseline", default="none", choices=sorted(CONFIGS))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    names = args.configs or list(CONFIGS)
+    unknown = [name for name in names if name not in CONFIGS]
+    if unknown:
+        parser.error(f"unknown configurations: {', '.join(unknown)}")
+
+    if args.depth:
+        reference = fixed_depth(CONFIGS["none"], args.depth)
+        print(f"Fixed depth {args.depth}:")
+        print(f"  {'Config':<22} {'Nodes':>9} {'Time(s)':>8} {'Nodes %':>8} {'Same move':>10}")
+        ref_nodes = sum(nodes for nodes, _, _ in reference.values())
+        for name in names:
+            results = reference if name == "none" else fixed_depth(CONFIGS[name], args.depth)
+            nodes = sum(r[0] for r in results.values())
+            seconds = sum(r[1] for r in results.values())
+            same = sum(results[p][2] == reference[p][2] for p in results)
+            print(f"  {name:<22} {nodes:>9} {seconds:8.2f} {100.0 * nodes / ref_nodes:7.1f}% "
+                  f"{same:>5}/{len(results)}")
+
+    if args.time:
+        print(f"Depth reached in {args.time:g}s per position:")
+        for name in names:
+            depths = list(fixed_time(CONFIGS[name], args.time).values())
+            print(f"  {name:<22} mean {sum(depths) / len(depths):5.2f}  min {min(depths)}  max {max(depths)}")
+
+    if args.games:
+        test, errors = strength(args.candidate, args.baseline, args.games, args.game_time, args.workers)
+        elo, margin = test.elo()
+        points = sum(pair_score * count for pair_score, count in test.pairs.items())
+        score = points / (2.0 * test.count()) if test.count() else 0.0
+        print(f"{args.candidate} vs {args.baseline}: {test.count()} pairs, score {score:.3f}, "
+              f"Elo {elo:+.1f} +/- {margin:.1f}" + (f", {errors} failed" if errors else ""))
+
+
+if __name__ == "__main__":
+    main()
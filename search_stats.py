@@ -0,0 +1,128 @@
+"""
+Standard search statistics shared by all agents.
+
+Every agent owns a SearchStats instance (`self.stats`), resets it at the start
+of get_best_move and updates the counters from its search. game_runner
+collects `stats.as_record()` after every move.
+
+Counting conventions:
+- nodes: every position entered by the main search (interior nodes and leaves)
+- qnodes: positions entered by a quiescence search, if the agent has one
+- tt_probes / tt_hits: transposition table lookups and lookups that found an entry
+- tt_cutoffs: hits whose stored value was returned without searching
+- eval_probes / eval_hits: evaluation cache lookups and lookups that found a score
+- cutoffs / first_move_cutoffs: beta cutoffs, and those caused by the first move tried
+- score: root score of the chosen move from White's perspective
+"""
+import math
+import time
+
+MATE_SCORE = 99999
+
+
+class SearchStats:
+    """Per-move search counters and timings."""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear all counters and start the move timer."""
+        self.nodes = 0
+        self.qnodes = 0
+        self.depth_reached = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.tt_cutoffs = 0
+        self.eval_probes = 0
+        self.eval_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.score = None
+        self.nodes_by_depth = {}
+        self.iteration_times = {}
+        self.start_time = time.perf_counter()
+        self.elapsed = None
+        self._iteration_start = self.start_time
+        self._iteration_nodes = 0
+
+    def begin_iteration(self, depth):
+        """Mark the start of a (possibly iterative deepening) search to `depth`."""
+        self._iteration_start = time.perf_counter()
+        self._iteration_nodes = self.nodes + self.qnodes
+
+    def end_iteration(self, depth):
+        """Record nodes and time for a completed iteration at `depth`."""
+        self.nodes_by_depth[depth] = self.nodes + self.qnodes - self._iteration_nodes
+        self.iteration_times[depth] = time.perf_counter() - self._iteration_start
+        self.depth_reached = max(self.depth_reached, depth)
+
+    def finish(self):
+        """Stop the move timer. Calling it more than once keeps the first value."""
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.start_time
+
+    @property
+    def total_time(self):
+        if self.elapsed is not None:
+            return self.elapsed
+        return time.perf_counter() - self.start_time
+
+    @property
+    def nps(self):
+        elapsed = self.total_time
+        return (self.nodes + self.qnodes) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def effective_branching_factor(self):
+        """
+        Ratio of node counts between the last two completed iterations, or the
+        depth-th root of the node count for a single fixed-depth search.
+        """
+        depths = sorted(d for d, n in self.nodes_by_depth.items() if n > 0)
+        if len(depths) >= 2:
+            return self.nodes_by_depth[depths[-1]] / self.nodes_by_depth[depths[-2]]
+        if self.depth_reached > 0 and self.nodes > 0:
+            return self.nodes ** (1.0 / self.depth_reached)
+        return 0.0
+
+    @property
+    def tt_hit_rate(self):
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def eval_hit_rate(self):
+        return self.eval_hits / self.eval_probes if self.eval_probes else 0.0
+
+    @property
+    def first_move_cutoff_pct(self):
+        return 100.0 * self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def as_record(self):
+        """Returns the statistics as a JSON-serialisable dict."""
+        return {
+            "nodes": self.nodes,
+            "qnodes": self.qnodes,
+            "nps": round(self.nps, 1),
+            "depth": self.depth_reached,
+            "ebf": round(self.effective_branching_factor, 3),
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_cutoffs": self.tt_cutoffs,
+            "tt_hit_rate": round(self.tt_hit_rate, 4),
+            "eval_probes": self.eval_probes,
+            "eval_hits": self.eval_hits,
+            "eval_hit_rate": round(self.eval_hit_rate, 4),
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_pct": round(self.first_move_cutoff_pct, 2),
+            "score": _finite_score(self.score),
+            "nodes_by_depth": {str(d): n for d, n in sorted(self.nodes_by_depth.items())},
+            "iteration_times": {str(d): round(t, 6) for d, t in sorted(self.iteration_times.items())},
+            "search_time": round(self.total_time, 6),
+        }
+
+
+def _finite_score(score):
+    """Clamps infinite mate scores so records stay valid JSON."""
+    if isinstance(score, float) and math.isinf(score):
+        return math.copysign(MATE_SCORE, score)
+    return score
@@ -0,0 +1,322 @@
+"""
+Self-play data generation into memory-mapped NumPy shards.
+
+Worker processes play games between registered agents from randomised
+openings (a random number of random plies from the initial position, seeded
+per game). Every position after the opening is recorded with the mover's
+search score (SearchStats.score, White's point of view, NaN if the agent
+does not report one). Once the game ends, all its positions are returned
+with the final result.
+
+The main process drops positions whose Zobrist key was already seen and
+appends the rest to fixed-size shards: `shard_NNNNN.npy` files holding
+structured arrays (see POSITION_DTYPE), preallocated and written through
+np.memmap. The set of seen keys is a fixed-size, direct-mapped table
+(`seen.npy`, also memory-mapped). When two keys share a slot the newer one
+replaces the older, so memory stays fixed and only a few duplicates get
+through. RAM use is therefore bounded by the games in flight, whatever the
+total.
+
+`progress.json` records how many games and positions are safely on disk. It
+is rewritten atomically after every game, so an interrupted run continues
+with the next game when started again with the same output directory. A
+game's keys enter the seen table only after its shard records and
+progress.json are written: an interruption in between lets at most that
+game's positions be stored twice, never dropped. A game that raises, or
+whose worker dies, is counted in progress["failed"] and skipped.
+
+    python selfplay.py data --agents B22CH0322 B22CS061 --games 10000 --workers 8 --move-time 0.1
+"""
+import argparse
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from agent_registry import AgentRegistry
+from board import GameEngine
+from config import *
+from deadline import SearchDeadline, request_move
+from search_stats import MATE_SCORE
+
+PIECE_CODES = {EMPTY_SQUARE: 0, WHITE_PAWN: 1, WHITE_KNIGHT: 2, WHITE_BISHOP: 3, WHITE_KING: 4,
+               BLACK_PAWN: -1, BLACK_KNIGHT: -2, BLACK_BISHOP: -3, BLACK_KING: -4}
+CODE_PIECES = {code: piece for piece, code in PIECE_CODES.items()}
+
+POSITION_DTYPE = np.dtype([
+    ("board", np.int8, (BOARD_HEIGHT * BOARD_WIDTH,)),  # PIECE_CODES, row-major from rank 8
+    ("white_to_move", np.int8),
+    ("score", np.float32),      # mover's search score for White, NaN if unknown
+    ("result", np.float32),     # final result for White: 1, 0.5 or 0
+    ("ply", np.int16),
+    ("key", np.uint64),         # GameEngine.position_key()
+])
+
+RESULT_SCORES = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+MAX_PLIES = 150     # same turn limit as run_game
+
+_registry = None
+
+
+def encode_board(board):
+    return [PIECE_CODES[piece] for row in board for piece in row]
+
+
+def decode_board(codes):
+    """Returns the board (list of rows) stored in a POSITION_DTYPE record."""
+    pieces = [CODE_PIECES[int(code)] for code in codes]
+    return [pieces[r * BOARD_WIDTH:(r + 1) * BOARD_WIDTH] for r in range(BOARD_HEIGHT)]
+
+
+def _finite(score):
+    if score is None:
+        return math.nan
+    return max(-MATE_SCORE, min(MATE_SCORE, float(score)))
+
+
+def play_game(white, black, seed, move_time=0.1, opening_plies=(2, 8)):
+    """
+    Worker entry point: plays one game and returns (result, positions) with
+    positions as (board codes, white_to_move, score, ply, key) tuples.
+    """
+    global _registry
+    if _registry is None:
+        _registry = AgentRegistry()
+    rng = random.Random(seed)
+    random.seed(seed)   # agents with random tie-breaks
+
+    engine = GameEngine()
+    for _ in range(rng.randint(*opening_plies)):
+        moves = engine.get_legal_moves()
+        if not moves:
+            break
+        engine.make_move(rng.choice(moves))
+
+    players = {True: _registry.load(white)(engine), False: _registry.load(black)(engine)}
+    positions = []
+    ply = len(engine.move_log)
+    result = "1/2-1/2"
+    while ply < MAX_PLIES:
+        state = engine.get_game_state()
+        if state == "checkmate":
+            result = "0-1" if engine.white_to_move else "1-0"
+            break
+        if state == "stalemate":
+            break
+        legal_moves = engine.get_legal_moves()
+        player = players[engine.white_to_move]
+        board = encode_board(engine.board)
+        key = engine.position_key()
+        wtm = engine.white_to_move
+        move = request_move(player, SearchDeadline(move_time))
+        if move is None or move not in legal_moves:
+            # No move in time or an illegal one: the mover forfeits.
+            result = "0-1" if wtm else "1-0"
+            break
+        stats = getattr(player, "stats", None)
+        positions.append((board, wtm, _finite(stats.score if stats else None), ply, key))
+        engine.make_move(move)
+        ply += 1
+    return RESULT_SCORES[result], positions
+
+
+class SeenTable:
+    """Fixed-size, direct-mapped set of 64-bit keys, stored in a memory-mapped file."""
+    def __init__(self, path, size_log2=24):
+        if os.path.exists(path):
+            self.table = np.load(path, mmap_mode="r+")
+        else:
+            self.table = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint64,
+                                                   shape=(1 << size_log2,))
+        self.mask = len(self.table) - 1
+
+    def __contains__(self, key):
+        return self.table[key & self.mask] == key
+
+    def add(self, key):
+        """Returns True if `key` was not present (and records it)."""
+        slot = key & self.mask
+        if self.table[slot] == key:
+            return False
+        self.table[slot] = key
+        return True
+
+    def flush(self):
+        self.table.flush()
+
+
+class ShardWriter:
+    """Appends position records to fixed-size .npy shards in a directory."""
+    def __init__(self, directory, shard_size=1 << 20, shard=0, count=0):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.shard = shard
+        self.count = count
+        self.array = None
+        self._open(resume=count > 0)
+
+    def _path(self, shard):
+        return os.path.join(self.directory, f"shard_{shard:05d}.npy")
+
+    def _open(self, resume):
+        path = self._path(self.shard)
+        if resume and os.path.exists(path):
+            self.array = np.load(path, mmap_mode="r+")
+        else:
+            self.array = np.lib.format.open_memmap(path, mode="w+", dtype=POSITION_DTYPE,
+                                                   shape=(self.shard_size,))
+
+    def write(self, board, white_to_move, score, result, ply, key):
+        if self.count == len(self.array):
+            self.array.flush()
+            self.shard += 1
+            self.count = 0
+            self._open(resume=False)
+        record = self.array[self.count]
+        record["board"] = board
+        record["white_to_move"] = white_to_move
+        record["score"] = score
+        record["result"] = result
+        record["ply"] = ply
+        record["key"] = key
+        self.count += 1
+
+    def flush(self):
+        self.array.flush()
+
+
+def iter_shards(directory):
+    """Yields the filled part of every shard as a (read-only, memory-mapped) record array."""
+    with open(os.path.join(directory, "progress.json")) as f:
+        progress = json.load(f)
+    for shard in range(progress["shard"] + 1):
+        array = np.load(os.path.join(directory, f"shard_{shard:05d}.npy"), mmap_mode="r")
+        yield array if shard < progress["shard"] else array[:progress["count"]]
+
+
+def _load_progress(directory):
+    path = os.path.join(directory, "progress.json")
+    if not os.path.exists(path):
+        return {"games": 0, "positions": 0, "duplicates": 0, "failed": 0, "shard": 0, "count": 0}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_progress(directory, progress):
+    path = os.path.join(directory, "progress.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(progress, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def generate(directory, agent_names, games, workers=None, move_time=0.1, seed=0,
+             shard_size=1 << 20, seen_log2=24, opening_plies=(2, 8)):
+    """
+    Plays games until `games` are stored in `directory`, continuing from
+    progress.json if present. Game i uses seed `seed + i` and a pairing
+    drawn from `agent_names` with that seed, so a resumed run plays the
+    same games an uninterrupted one would.
+    """
+    os.makedirs(directory, exist_ok=True)
+    progress = _load_progress(directory)
+    progress.update(agents=list(agent_names), seed=seed, shard_size=shard_size)
+    progress.setdefault("failed", 0)
+    seen = SeenTable(os.path.join(directory, "seen.npy"), seen_log2)
+    writer = ShardWriter(directory, shard_size, progress["shard"], progress["count"])
+    workers = workers or os.cpu_count() or 1
+
+    def pairing(i):
+        rng = random.Random(seed + i)
+        return rng.choice(agent_names), rng.choice(agent_names)
+
+    # Games finish out of order; each is stored as soon as it is done, and the
+    # next game index to submit is derived from what is already on disk.
+    next_game = progress["games"]
+    done_indices = set(progress.get("pending_done", []))
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        running = {}
+        while True:
+            while len(running) < workers and next_game < games:
+                if next_game not in done_indices:
+                    white, black = pairing(next_game)
+                    future = pool.submit(play_game, white, black, seed + next_game, move_time,
+                                         opening_plies)
+                    running[future] = next_game
+                next_game += 1
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in finished:
+                index = running.pop(future)
+                try:
+                    result, positions = future.result()
+                except Exception as e:
+                    # A game that raises (or dies with its worker) is counted
+                    # as failed and skipped; the other games carry on.
+                    print(f"game {index} failed: {type(e).__name__}: {e}")
+                    progress["failed"] += 1
+                    broken = broken or isinstance(e, BrokenProcessPool)
+                    result, positions = None, []
+                new_keys = set()
+                for board, wtm, score, ply, key in positions:
+                    if key in seen or key in new_keys:
+                        progress["duplicates"] += 1
+                    else:
+                        new_keys.add(key)
+                        writer.write(board, wtm, score, result, ply, key)
+                        progress["positions"] += 1
+                done_indices.add(index)
+                # Games below the lowest running index are all stored.
+                low = min(running.values(), default=next_game)
+                progress["games"] = low
+                progress["pending_done"] = sorted(i for i in done_indices if i >= low)
+                done_indices = set(progress["pending_done"])
+                writer.flush()
+                progress["shard"], progress["count"] = writer.shard, writer.count
+                _save_progress(directory, progress)
+                # Keys are marked seen only once their positions are on disk,
+                # so an interrupted run never loses positions as "duplicates".
+                for key in new_keys:
+                    seen.add(key)
+                seen.flush()
+            if broken:
+                # A dead worker breaks the whole pool: the games still running
+                # in it fail as they are collected, new ones go to a fresh pool.
+                pool.shutdown(wait=False)
+                pool = ProcessPoolExecutor(max_workers=workers)
+            print(f"[{progress['games']}/{games} games] {progress['positions']} positions, "
+                  f"{progress['duplicates']} duplicates"
+                  + (f", {progress['failed']} failed" if progress["failed"] else ""))
+    finally:
+        pool.shutdown()
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate self-play positions into memory-mapped shards.")
+    parser.add_argument("directory", help="output directory (re-run with the same one to resume)")
+    parser.add_argument("--agents", nargs="+", default=["B22CH0322"], help="agents to draw players from")
+    parser.add_argument("--games", type=int, default=1000, help="total number of games")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--move-time", type=float, default=0.1, help="seconds per move")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=1 << 20, help="positions per shard")
+    parser.add_argument("--seen-log2", type=int, default=24, help="log2 of the dedupe table size")
+    parser.add_argument("--opening-plies", type=int, nargs=2, default=(2, 8), metavar=("MIN", "MAX"))
+    args = parser.parse_args()
+
+    progress = generate(args.directory, args.agents, args.games, args.workers, args.move_time,
+                        args.seed, args.shard_size, args.seen_log2, tuple(args.opening_plies))
+    print(f"Done: {progress['games']} games, {progress['positions']} positions "
+          f"in {progress['shard'] + 1} shard(s)"
+          + (f", {progress['failed']} game(s) failed." if progress["failed"] else "."))
+
+
+if __name__ == "__main__":
+    main()
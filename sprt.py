@@ -0,0 +1,221 @@
+"""
+SPRT match harness for comparing two agents (typically two versions of one).
+
+Games are played in pairs: both agents play the same opening from
+positions.OPENING_POSITIONS once with each colour, which cancels most of the
+opening's bias. After every finished pair a sequential probability ratio
+test decides between
+    H0: the candidate is elo0 stronger than the baseline, and
+    H1: the candidate is elo1 stronger,
+and the match stops as soon as the log-likelihood ratio crosses either
+bound. The test uses pair scores (a pentanomial model: 0, 0.5, 1, 1.5 or 2
+points per pair) with the normal approximation used by Fishtest/cutechess.
+
+Agents are given as `Name` (looked up in the repo) or `Name@dir` (looked
+up in another directory), so a modified copy of an agent can be tested
+against the original:
+
+    python sprt.py B22CH0322@dev B22CH0322 --elo0 0 --elo1 20 --time 20 --workers 4
+"""
+import argparse
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from agent_registry import AgentRegistry
+from game_runner import run_game
+from positions import OPENING_POSITIONS
+
+_registries = {}
+
+
+def load_agent(spec):
+    """Loads `Name` from the repo or `Name@dir` from another directory (cached per process)."""
+    name, _, directory = spec.partition("@")
+    key = directory or None
+    if key not in _registries:
+        _registries[key] = AgentRegistry([directory] if directory else None)
+    return _registries[key].load(name)
+
+
+def _score(result, white):
+    """Points scored in one game result by the white (white=True) or black player."""
+    if result == "1/2-1/2":
+        return 0.5
+    if result == "1-0":
+        return 1.0 if white else 0.0
+    if result == "0-1":
+        return 0.0 if white else 1.0
+    return None
+
+
+def play_pair(candidate, baseline, start_fen, total_time_seconds, log_dir=None, db_path=None,
+              loader=load_agent):
+    """
+    Worker entry point: plays `start_fen` twice with colours swapped. Returns
+    (candidate's pair score or None if a game failed, [game results]).
+    `loader` turns the candidate and baseline specs into agent classes in the
+    worker (load_agent by default). A game that raises is recorded with
+    result "*" and fails the pair.
+    """
+    types = {spec: loader(spec) for spec in (candidate, baseline)}
+    log = os.path.join(log_dir, f"sprt-{os.getpid()}.jsonl") if log_dir else None
+    results, score = [], 0.0
+    for white, black in ((candidate, baseline), (baseline, candidate)):
+        try:
+            result = run_game(types[white], types[black], total_time_seconds, headless=True,
+                              log=log, game_db=db_path, start_fen=start_fen,
+                              white_name=white, black_name=black)
+        except Exception as e:
+            result = {"white": white, "black": black, "result": "*", "reason": "error",
+                      "error": f"{type(e).__name__}: {e}", "start": start_fen}
+        results.append(result)
+        points = _score(result["result"], white == candidate)
+        if points is None:
+            return None, results
+        score += points
+    return score, results
+
+
+def expected_score(elo):
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def elo_from_score(score):
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+class SPRT:
+    """Sequential test over pair scores (pentanomial counts)."""
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        self.elo0, self.elo1 = elo0, elo1
+        self.alpha, self.beta = alpha, beta
+        self.lower = math.log(beta / (1.0 - alpha))
+        self.upper = math.log((1.0 - beta) / alpha)
+        self.pairs = {0.0: 0, 0.5: 0, 1.0: 0, 1.5: 0, 2.0: 0}
+
+    def add(self, pair_score):
+        self.pairs[pair_score] += 1
+
+    def count(self):
+        return sum(self.pairs.values())
+
+    def _moments(self):
+        if self.count() == 0:
+            return 0, 0.5, 0.0
+        # Empty buckets get a tiny weight so a short run of identical pairs
+        # does not give zero variance and an unbounded LLR.
+        counts = {score: k or 1e-3 for score, k in self.pairs.items()}
+        n = sum(counts.values())
+        mean = sum(score / 2.0 * k for score, k in counts.items()) / n
+        var = sum(k * (score / 2.0 - mean) ** 2 for score, k in counts.items()) / n
+        return n, mean, var
+
+    def llr(self):
+        n, mean, var = self._moments()
+        if n == 0:
+            return 0.0
+        s0, s1 = expected_score(self.elo0), expected_score(self.elo1)
+        return n * (s1 - s0) * (2.0 * mean - s0 - s1) / (2.0 * var)
+
+    def status(self):
+        """'H1' (candidate is stronger), 'H0' (it is not) or None (keep playing)."""
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
+
+    def elo(self):
+        """Elo estimate of the candidate and its 95% error margin."""
+        n, mean, var = self._moments()
+        if n == 0:
+            return 0.0, float("inf")
+        margin = 1.96 * math.sqrt(var / n)
+        low, high = elo_from_score(mean - margin), elo_from_score(mean + margin)
+        return elo_from_score(mean), (high - low) / 2.0
+
+
+def run_sprt(candidate, baseline, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05,
+             total_time_seconds=20, max_pairs=1000, workers=None, log_dir=None, db_path=None,
+             openings=OPENING_POSITIONS):
+    """
+    Plays pairs until the SPRT decides or `max_pairs` pairs are done.
+    Returns (SPRT, list of game results). Pairs already running when the test
+    decides are cancelled or discarded.
+    """
+    # Fail here rather than in every worker if an agent cannot be loaded.
+    load_agent(candidate)
+    load_agent(baseline)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    test = SPRT(elo0, elo1, alpha, beta)
+    results = []
+    errors = 0
+    starts = itertools.cycle(openings.values())
+    workers = workers or os.cpu_count() or 1
+    submitted = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = set()
+        while True:
+            while len(running) < workers and submitted < max_pairs:
+                running.add(pool.submit(play_pair, candidate, baseline, next(starts),
+                                        total_time_seconds, log_dir, db_path))
+                submitted += 1
+            if not running:
+                break
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                pair_score, pair_results = future.result()
+                results.extend(pair_results)
+                if pair_score is None:
+                    errors += 1
+                    continue
+                test.add(pair_score)
+            elo, margin = test.elo()
+            print(f"[{test.count()} pairs] LLR {test.llr():+.2f} ({test.lower:+.2f}, {test.upper:+.2f}) "
+                  f"Elo {elo:+.1f} +/- {margin:.1f}" + (f", {errors} failed" if errors else ""))
+            if test.status():
+                for future in running:
+                    future.cancel()
+                break
+    return test, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SPRT match between two agents.")
+    parser.add_argument("candidate", help="agent under test: Name or Name@dir")
+    parser.add_argument("baseline", help="reference agent: Name or Name@dir")
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--time", type=float, default=20, help="seconds per player per game")
+    parser.add_argument("--max-pairs", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--log-dir", default=None, help="write JSONL game logs here")
+    parser.add_argument("--db", default=None, help="store games in this SQLite game database")
+    args = parser.parse_args()
+
+    test, _ = run_sprt(args.candidate, args.baseline, args.elo0, args.elo1, args.alpha, args.beta,
+                       args.time, args.max_pairs, args.workers, args.log_dir, args.db)
+    elo, margin = test.elo()
+    pairs = " ".join(f"{k}" for k in test.pairs.values())
+    print(f"\n{args.candidate} vs {args.baseline}: Elo {elo:+.1f} +/- {margin:.1f}, "
+          f"pairs [0, 0.5, 1, 1.5, 2] = [{pairs}]")
+    status = test.status()
+    if status == "H1":
+        print(f"H1 accepted: {args.candidate} is at least {args.elo1} Elo stronger (LLR {test.llr():.2f}).")
+    elif status == "H0":
+        print(f"H0 accepted: {args.candidate} is not {args.elo1} Elo stronger (LLR {test.llr():.2f}).")
+    else:
+        print(f"Inconclusive after {test.count()} pairs (LLR {test.llr():.2f}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Regression tests for sandboxed games: worker sync and option checks."""
+import pytest
+
+from board import GameEngine
+from game_runner import run_game
+from positions import OPENING_POSITIONS
+from sandbox import SandboxedPlayer
+
+START_FEN = next(iter(OPENING_POSITIONS.values()))
+
+
+class FirstMoveAgent:
+    """Plays the first legal move of its own engine."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.nodes_expanded = 0
+
+    def get_best_move(self):
+        return self.engine.get_legal_moves()[0]
+
+
+class ResettingAgent(FirstMoveAgent):
+    """Leaves its engine reset with set_position, emptying the move log."""
+    def get_best_move(self):
+        move = super().get_best_move()
+        self.engine.set_position(self.engine.board, self.engine.white_to_move)
+        return move
+
+
+def _play(engine, player, plies):
+    """Alternates a local first-move opponent and the sandboxed `player`."""
+    for _ in range(plies):
+        engine.make_move(engine.get_legal_moves()[0])
+        move = player.get_best_move(time_limit=5.0)
+        assert move == engine.get_legal_moves()[0]
+        engine.make_move(move)
+
+
+def test_black_from_start_fen():
+    engine = GameEngine()
+    engine.load_fen(START_FEN)
+    player = SandboxedPlayer(FirstMoveAgent, engine)
+    try:
+        _play(engine, player, 3)
+        assert player.illegal_moves == player.crashes == 0
+    finally:
+        player.close()
+
+
+def test_agent_resetting_its_engine():
+    engine = GameEngine()
+    engine.load_fen(START_FEN)
+    player = SandboxedPlayer(ResettingAgent, engine)
+    try:
+        _play(engine, player, 4)
+        assert player.illegal_moves == player.crashes == 0
+    finally:
+        player.close()
+
+
+def test_game_engine_reset_between_requests():
+    engine = GameEngine()
+    player = SandboxedPlayer(FirstMoveAgent, engine)
+    try:
+        _play(engine, player, 2)
+        engine.load_fen(START_FEN)
+        _play(engine, player, 2)
+        assert player.illegal_moves == player.crashes == 0
+    finally:
+        player.close()
+
+
+def test_profiling_is_refused_under_the_sandbox(tmp_path):
+    with pytest.raises(ValueError):
+        run_game(FirstMoveAgent, FirstMoveAgent, 5, headless=True, sandbox=True,
+                 profile_dir=str(tmp_path))
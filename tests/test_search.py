@@ -0,0 +1,74 @@
+"""Multi-PV results of search.Searcher against a brute-force minimax."""
+import random
+
+import pytest
+
+from B22CH0322 import B22CH0322
+from board import GameEngine
+from search import Searcher, INF
+from search_stats import MATE_SCORE
+
+# Lazy-evaluation exits once cut this position's third line short.
+REGRESSION_FEN = "nb2/p2p/2nk/1pp1/2P1/PPN1/3P/NB1K w"
+
+
+def _brute_force(engine, evaluate, depth, ply):
+    """Plain negamax score for the side to move, mates scored by distance."""
+    moves = engine.get_legal_moves()
+    if not moves:
+        return -(MATE_SCORE - ply) if engine.is_in_check() else 0
+    if depth == 0:
+        score = evaluate() if engine.white_to_move else -evaluate()
+        return max(-(MATE_SCORE - ply), min(MATE_SCORE - ply, score))
+    best = -INF
+    for move in moves:
+        engine.make_move(move)
+        best = max(best, -_brute_force(engine, evaluate, depth - 1, ply + 1))
+        engine.undo_move()
+    return best
+
+
+def _expected_scores(fen, depth, multipv):
+    """The best `multipv` root scores (White's view), exact evaluation everywhere."""
+    engine = GameEngine()
+    engine.load_fen(fen)
+    agent = B22CH0322(engine)
+    sign = 1 if engine.white_to_move else -1
+    scores = []
+    for move in engine.get_legal_moves():
+        engine.make_move(move)
+        scores.append(-sign * _brute_force(engine, agent.evaluate_board, depth - 1, 1))
+        engine.undo_move()
+    return sorted(scores, key=lambda score: -sign * score)[:multipv]
+
+
+def _searched_scores(fen, depth, multipv):
+    engine = GameEngine()
+    engine.load_fen(fen)
+    searcher = Searcher(engine, B22CH0322(engine).evaluate_board)    # lazy window evaluation
+    assert searcher.evaluate_window
+    return [line.score for line in searcher.search(depth, multipv)]
+
+
+def _random_positions(count, seed=7):
+    rng = random.Random(seed)
+    fens = []
+    while len(fens) < count:
+        engine = GameEngine()
+        for _ in range(rng.randint(4, 40)):
+            moves = engine.get_legal_moves()
+            if not moves:
+                break
+            engine.make_move(rng.choice(moves))
+        if engine.get_legal_moves():
+            fens.append(engine.get_fen())
+    return fens
+
+
+def test_multipv_regression_position():
+    assert _searched_scores(REGRESSION_FEN, 3, 3) == _expected_scores(REGRESSION_FEN, 3, 3)
+
+
+@pytest.mark.parametrize("fen", _random_positions(10))
+def test_multipv_matches_brute_force(fen):
+    assert _searched_scores(fen, 3, 3) == _expected_scores(fen, 3, 3)
@@ -0,0 +1,27 @@
+"""Regression tests for self-play generation surviving failed games."""
+import os
+
+import numpy as np
+
+import selfplay
+from board import GameEngine
+
+
+def _fake_game(white, black, seed, move_time=0.1, opening_plies=(2, 8)):
+    """One position per game, keyed by seed; seed 1 raises and seed 3 kills its worker."""
+    if seed == 1:
+        raise RuntimeError("agent crashed")
+    if seed == 3:
+        os._exit(1)
+    engine = GameEngine()
+    return 0.5, [(selfplay.encode_board(engine.board), True, 0.0, 0, seed + 1)]
+
+
+def test_failed_games_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(selfplay, "play_game", _fake_game)
+    progress = selfplay.generate(str(tmp_path), ["B22CH0322"], 6, workers=1, seen_log2=8)
+    assert progress["games"] == 6
+    assert progress["failed"] == 2
+    assert progress["positions"] == 4
+    keys = np.concatenate(list(selfplay.iter_shards(str(tmp_path))))["key"]
+    assert sorted(keys) == [1, 3, 5, 6]
@@ -0,0 +1,40 @@
+"""Regression tests for naming SPRT games by agent spec."""
+import json
+
+from game_db import GameDatabase
+from positions import OPENING_POSITIONS
+from sprt import play_pair
+
+START_FEN = next(iter(OPENING_POSITIONS.values()))
+
+
+class FirstMoveAgent:
+    """Plays the first legal move."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.depth = 1
+        self.nodes_expanded = 0
+
+    def get_best_move(self):
+        return self.engine.get_legal_moves()[0]
+
+
+def test_games_are_stored_under_the_specs(tmp_path):
+    db_path = str(tmp_path / "games.db")
+    score, results = play_pair("First@candidate", "First", START_FEN, 10, str(tmp_path), db_path,
+                               loader=lambda spec: FirstMoveAgent)
+    assert score is not None
+    assert [(r["white"], r["black"]) for r in results] == [("First@candidate", "First"),
+                                                          ("First", "First@candidate")]
+
+    names = set()
+    for log in tmp_path.glob("sprt-*.jsonl"):
+        for line in log.read_text().splitlines():
+            record = json.loads(line)
+            names.update(record[key] for key in ("agent", "white", "black") if key in record)
+    assert names == {"First@candidate", "First"}
+
+    with GameDatabase(db_path) as db:
+        games = [db.game_info(game_id) for game_id in (1, 2)]
+    assert [(g["white"], g["black"]) for g in games] == [("First@candidate", "First"),
+                                                        ("First", "First@candidate")]
@@ -0,0 +1,464 @@
+"""
+Texel-style tuning of the evaluation parameters in config.py.
+
+The tuned evaluation is B22CH0322.evaluate_board, which is linear in its
+parameters: piece values, the four piece-square tables, and the
+king-safety, mobility, centre-control and passed-pawn weights. Each
+training position is reduced once to a sparse feature row: up to
+MAX_FEATURES (parameter index, coefficient) pairs plus a constant part
+that is not tuned (king values, endgame king centralisation). After that,
+an epoch is a few NumPy gathers and one np.bincount over the whole
+dataset, so millions of positions take seconds per epoch.
+
+Positions come from game databases, selfplay.py shards or text files, and
+are labelled with the game result from White's point of view
+(1, 0.5, 0) and/or a search score. The predicted result is
+sigmoid(K * eval): K is fitted first, then the parameters are fitted with
+Adam by minimising the mean squared error. The result is written as a
+copy of config.py with the new values, ready to replace it. The
+tournament's capture points (CAPTURE_POINTS) are a separate constant and
+are never tuned.
+
+    python texel.py --db games.db --cache texel.npz --epochs 300 --out config_tuned.py
+
+Requires NumPy.
+"""
+import argparse
+import ast
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+import config
+from board import GameEngine
+from config import *
+from game_db import GameDatabase
+
+MAX_FEATURES = 32
+
+# Parameter layout: name, number of entries.
+PARAMETER_GROUPS = (
+    ("material", 3),            # pawn, knight, bishop
+    ("PAWN_PST", 32),
+    ("KNIGHT_PST", 32),
+    ("BISHOP_PST", 32),
+    ("KING_PST_LATE_GAME", 32),
+    ("KING_SAFETY_PENALTY", 1),
+    ("MOBILITY_WEIGHT", 1),
+    ("CENTER_CONTROL_BONUS", 1),
+    ("PASSED_PAWN_BONUS", 1),
+    ("PASSED_PAWN_RANK_BONUS", 1),
+)
+
+OFFSETS = {}
+_offset = 0
+for _name, _size in PARAMETER_GROUPS:
+    OFFSETS[_name] = _offset
+    _offset += _size
+NUM_PARAMETERS = _offset
+PAD = NUM_PARAMETERS                # index of the always-zero padding weight
+
+MATERIAL_INDEX = {'P': 0, 'N': 1, 'B': 2}
+PST_GROUP = {'P': "PAWN_PST", 'N': "KNIGHT_PST", 'B': "BISHOP_PST", 'K': "KING_PST_LATE_GAME"}
+SCALARS = ("KING_SAFETY_PENALTY", "MOBILITY_WEIGHT", "CENTER_CONTROL_BONUS",
+           "PASSED_PAWN_BONUS", "PASSED_PAWN_RANK_BONUS")
+FREEZE_GROUPS = {
+    "material": ("material",),
+    "pst": ("PAWN_PST", "KNIGHT_PST", "BISHOP_PST", "KING_PST_LATE_GAME"),
+    "scalars": SCALARS,
+}
+
+CENTER_SQUARES = ((3, 1), (3, 2), (4, 1), (4, 2))
+RESULT_SCORES = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+
+
+def current_weights():
+    """The parameter vector holding the values currently in config.py."""
+    w = np.zeros(NUM_PARAMETERS + 1)
+    w[0:3] = [PIECE_VALUES[WHITE_PAWN], PIECE_VALUES[WHITE_KNIGHT], PIECE_VALUES[WHITE_BISHOP]]
+    for group in PST_GROUP.values():
+        w[OFFSETS[group]:OFFSETS[group] + 32] = np.ravel(getattr(config, group))
+    for name in SCALARS:
+        w[OFFSETS[name]] = getattr(config, name)
+    return w
+
+
+def extract_features(evaluator):
+    """
+    Returns ({parameter index: coefficient}, constant) for the evaluator's
+    current position, so that evaluate_board() == sum(w[i] * c) + constant.
+    `evaluator` is a B22CH0322 instance; its helpers define the terms.
+    """
+    engine = evaluator.board
+    endgame = evaluator._is_endgame()
+    features = {}
+    constant = 0
+
+    def add(index, value):
+        features[index] = features.get(index, 0) + value
+
+    for r in range(BOARD_HEIGHT):
+        for c in range(BOARD_WIDTH):
+            piece = engine.board[r][c]
+            if piece == EMPTY_SQUARE:
+                continue
+            white = piece[0] == 'w'
+            sign = 1 if white else -1
+            kind = piece[1]
+            if kind in MATERIAL_INDEX:
+                add(MATERIAL_INDEX[kind], sign)
+            else:
+                constant += PIECE_VALUES[piece]
+
+            if kind == 'P':
+                add(OFFSETS["PAWN_PST"] + (r if white else 7 - r) * BOARD_WIDTH + c, sign)
+                if evaluator._is_passed_pawn(r, c, piece[0]):
+                    add(OFFSETS["PASSED_PAWN_BONUS"], sign)
+                    add(OFFSETS["PASSED_PAWN_RANK_BONUS"], (6 - r) if white else -(r - 1))
+            elif kind != 'K' or endgame:
+                add(OFFSETS[PST_GROUP[kind]] + r * BOARD_WIDTH + c, sign)
+
+            if (r, c) in CENTER_SQUARES:
+                add(OFFSETS["CENTER_CONTROL_BONUS"], sign)
+
+    white_king = engine._find_king('w')
+    black_king = engine._find_king('b')
+    if white_king and black_king and not endgame:
+        add(OFFSETS["KING_SAFETY_PENALTY"], int(black_king[0] > 1) - int(white_king[0] < 6))
+
+    moves = len(engine.get_legal_moves())
+    engine.white_to_move = not engine.white_to_move
+    opponent_moves = len(engine.get_legal_moves())
+    engine.white_to_move = not engine.white_to_move
+    add(OFFSETS["MOBILITY_WEIGHT"], (moves - opponent_moves) * (1 if engine.white_to_move else -1))
+
+    if endgame:
+        constant += evaluator._evaluate_endgame()
+    return features, constant
+
+
+class TexelDataset:
+    """Feature rows and labels as NumPy arrays (NaN marks a missing label)."""
+    def __init__(self, index, coef, constant, result, score):
+        self.index = index          # (N, MAX_FEATURES) int16, PAD for unused slots
+        self.coef = coef            # (N, MAX_FEATURES) int16
+        self.constant = constant    # (N,) float32
+        self.result = result        # (N,) float32, game result for White
+        self.score = score          # (N,) float32, search score for White
+
+    def __len__(self):
+        return len(self.constant)
+
+    def save(self, path):
+        np.savez(path, index=self.index, coef=self.coef, constant=self.constant,
+                 result=self.result, score=self.score)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(data["index"], data["coef"], data["constant"], data["result"], data["score"])
+
+
+class DatasetBuilder:
+    """Collects labelled positions into a TexelDataset, packing them into arrays every `chunk_size` rows."""
+    def __init__(self, chunk_size=1 << 16):
+        self.engine = GameEngine()
+        # Imported here so the feature definitions follow the agent's code.
+        from B22CH0322 import B22CH0322
+        self.evaluator = B22CH0322(self.engine)
+        self.chunk_size = chunk_size
+        self.chunks = []
+        self.rows = []
+        self.labels = []
+        self.skipped = 0
+
+    def add(self, engine, result=None, score=None):
+        """Adds the position on `engine` unless it is in check or over."""
+        if engine.is_in_check() or not engine.get_legal_moves():
+            self.skipped += 1
+            return False
+        self.engine.set_position([row[:] for row in engine.board], engine.white_to_move)
+        self.rows.append(extract_features(self.evaluator))
+        self.labels.append((math.nan if result is None else result,
+                            math.nan if score is None else score))
+        if len(self.rows) >= self.chunk_size:
+            self._pack()
+        return True
+
+    def _pack(self):
+        n = len(self.rows)
+        index = np.full((n, MAX_FEATURES), PAD, dtype=np.int16)
+        coef = np.zeros((n, MAX_FEATURES), dtype=np.int16)
+        constant = np.zeros(n, dtype=np.float32)
+        for i, (features, const) in enumerate(self.rows):
+            items = list(features.items())[:MAX_FEATURES]
+            index[i, :len(items)] = [k for k, _ in items]
+            coef[i, :len(items)] = [v for _, v in items]
+            constant[i] = const
+        labels = np.array(self.labels, dtype=np.float32).reshape(n, 2)
+        self.chunks.append(TexelDataset(index, coef, constant, labels[:, 0], labels[:, 1]))
+        self.rows, self.labels = [], []
+
+    def build(self):
+        self._pack()
+        return TexelDataset(*(np.concatenate([getattr(chunk, name) for chunk in self.chunks])
+                              for name in ("index", "coef", "constant", "result", "score")))
+
+
+def positions_from_db(path, builder, skip_plies=4):
+    """Adds every position after `skip_plies` of every decided or drawn game in a game database."""
+    with GameDatabase(path) as db:
+        results = dict(db.conn.execute("SELECT id, result FROM games"))
+        for game_id, ply, engine, _ in db.replay_all():
+            result = RESULT_SCORES.get(results.get(game_id))
+            if result is not None and ply >= skip_plies:
+                builder.add(engine, result=result)
+
+
+def positions_from_shards(directory, builder):
+    """Adds the positions of a selfplay.py output directory, with their results and search scores."""
+    from selfplay import decode_board, iter_shards
+    engine = GameEngine()
+    for shard in iter_shards(directory):
+        for record in shard:
+            engine.set_position(decode_board(record["board"]), bool(record["white_to_move"]))
+            score = float(record["score"])
+            builder.add(engine, result=float(record["result"]),
+                        score=None if math.isnan(score) else score)
+
+
+def positions_from_text(path, builder):
+    """
+    Adds positions from a text file with one `<fen> ; <label>` per line, where
+    the label is a result (1-0, 0-1, 1/2-1/2) or a score for White.
+    """
+    engine = GameEngine()
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fen, _, label = line.partition(";")
+            engine.load_fen(fen.strip())
+            label = label.strip()
+            if label in RESULT_SCORES:
+                builder.add(engine, result=RESULT_SCORES[label])
+            else:
+                builder.add(engine, score=float(label))
+
+
+# ---------- model ----------
+
+def evaluate(weights, data, start=0, stop=None):
+    """Linear evaluation of rows [start:stop] of the dataset."""
+    index = data.index[start:stop]
+    return (weights[index] * data.coef[start:stop]).sum(axis=1) + data.constant[start:stop]
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -500, 500)))
+
+
+def targets(data, k, score_weight=0.0):
+    """
+    Training targets: the game result, blended with sigmoid(K * score) by
+    `score_weight` where both exist; positions with only a score use it alone.
+    """
+    has_result = ~np.isnan(data.result)
+    has_score = ~np.isnan(data.score)
+    from_score = _sigmoid(k * np.nan_to_num(data.score))
+    t = np.where(has_result, np.nan_to_num(data.result), from_score)
+    both = has_result & has_score
+    t[both] = (1.0 - score_weight) * data.result[both] + score_weight * from_score[both]
+    return t
+
+
+def mean_squared_error(weights, data, k, target, batch_size=1 << 18):
+    total = 0.0
+    for start in range(0, len(data), batch_size):
+        p = _sigmoid(k * evaluate(weights, data, start, start + batch_size))
+        total += float(((p - target[start:start + batch_size]) ** 2).sum())
+    return total / max(1, len(data))
+
+
+def fit_k(weights, data, low=1e-4, high=0.2, iterations=40):
+    """Golden-section search for the K minimising the error against the game results."""
+    mask = ~np.isnan(data.result)
+    if not mask.any():
+        return 0.01
+    evals = evaluate(weights, data)[mask]
+    result = data.result[mask]
+
+    def error(log_k):
+        return float(((_sigmoid(math.exp(log_k) * evals) - result) ** 2).mean())
+
+    a, b = math.log(low), math.log(high)
+    ratio = (math.sqrt(5) - 1) / 2
+    c, d = b - ratio * (b - a), a + ratio * (b - a)
+    for _ in range(iterations):
+        if error(c) < error(d):
+            b, d = d, c
+            c = b - ratio * (b - a)
+        else:
+            a, c = c, d
+            d = a + ratio * (b - a)
+    return math.exp((a + b) / 2)
+
+
+def gradient(weights, data, k, target, batch_size=1 << 18):
+    """Gradient of the mean squared error, accumulated over batches."""
+    grad = np.zeros_like(weights)
+    n = len(data)
+    for start in range(0, n, batch_size):
+        stop = start + batch_size
+        p = _sigmoid(k * evaluate(weights, data, start, stop))
+        g = 2.0 * (p - target[start:stop]) * k * p * (1.0 - p) / n
+        grad += np.bincount(data.index[start:stop].ravel(),
+                            weights=(g[:, None] * data.coef[start:stop]).ravel(),
+                            minlength=len(weights))
+    return grad
+
+
+def trainable_mask(freeze=()):
+    mask = np.ones(NUM_PARAMETERS + 1, dtype=bool)
+    mask[PAD] = False
+    for group in freeze:
+        for name in FREEZE_GROUPS[group]:
+            size = dict(PARAMETER_GROUPS)[name]
+            mask[OFFSETS[name]:OFFSETS[name] + size] = False
+    return mask
+
+
+def tune(weights, data, k, target, epochs=300, lr=1.0, mask=None, report_every=25):
+    """Adam over full-batch gradients. Returns the tuned weights."""
+    weights = weights.astype(np.float64).copy()
+    mask = trainable_mask() if mask is None else mask
+    m = np.zeros_like(weights)
+    v = np.zeros_like(weights)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    for epoch in range(1, epochs + 1):
+        start = time.perf_counter()
+        g = gradient(weights, data, k, target) * mask
+        m = beta1 * m + (1 - beta1) * g
+        v = beta2 * v + (1 - beta2) * g * g
+        m_hat = m / (1 - beta1 ** epoch)
+        v_hat = v / (1 - beta2 ** epoch)
+        weights -= lr * m_hat / (np.sqrt(v_hat) + eps)
+        if report_every and (epoch % report_every == 0 or epoch == epochs):
+            error = mean_squared_error(weights, data, k, target)
+            print(f"epoch {epoch:>5}: error {error:.6f} ({time.perf_counter() - start:.2f}s/epoch)")
+    return weights
+
+
+# ---------- output ----------
+
+def _format_table(values):
+    rows = np.rint(np.asarray(values)).astype(int).reshape(BOARD_HEIGHT, BOARD_WIDTH)
+    return "[\n" + "".join(f"    [{', '.join(str(v) for v in row)}],\n" for row in rows) + "]"
+
+
+def _format_piece_values(weights):
+    values = {"PAWN": weights[0], "KNIGHT": weights[1], "BISHOP": weights[2],
+              "KING": PIECE_VALUES[WHITE_KING]}
+    lines = []
+    for name, value in values.items():
+        value = int(round(value))
+        lines.append(f"    WHITE_{name}: {value},\n    BLACK_{name}: {-value},\n")
+    return "{\n" + "".join(lines).rstrip(",\n") + "\n}"
+
+
+def config_source(weights, path=None):
+    """
+    Returns the source of config.py with PIECE_VALUES, the PSTs and the scalar
+    weights replaced. CAPTURE_POINTS, the tournament scoring, is left alone.
+    """
+    path = path or config.__file__
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    new_values = {"PIECE_VALUES": _format_piece_values(weights)}
+    for group in PST_GROUP.values():
+        new_values[group] = _format_table(weights[OFFSETS[group]:OFFSETS[group] + 32])
+    for name in SCALARS:
+        new_values[name] = str(int(round(weights[OFFSETS[name]])))
+
+    edits = []
+    for node in ast.parse(source).body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id in new_values):
+            value = node.value
+            edits.append((value.lineno, value.col_offset, value.end_lineno, value.end_col_offset,
+                          new_values[node.targets[0].id]))
+
+    lines = source.splitlines(keepends=True)
+    for lineno, col, end_lineno, end_col, text in sorted(edits, reverse=True):
+        head = lines[lineno - 1][:col]
+        tail = lines[end_lineno - 1][end_col:]
+        lines[lineno - 1:end_lineno] = [head + text + tail]
+    return "".join(lines)
+
+
+def print_changes(old, new):
+    names = ["pawn", "knight", "bishop"] + list(SCALARS)
+    indices = [0, 1, 2] + [OFFSETS[name] for name in SCALARS]
+    for name, i in zip(names, indices):
+        print(f"  {name:<24} {old[i]:>8.1f} -> {new[i]:>8.1f}")
+    for group in PST_GROUP.values():
+        s = slice(OFFSETS[group], OFFSETS[group] + 32)
+        print(f"  {group:<24} mean |change| {np.abs(new[s] - old[s]).mean():.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Texel tuning of the config.py evaluation parameters.")
+    parser.add_argument("--db", action="append", default=[], help="game database to read (repeatable)")
+    parser.add_argument("--shards", action="append", default=[], help="selfplay.py output directory (repeatable)")
+    parser.add_argument("--positions", action="append", default=[],
+                        help="text file of '<fen> ; <result or score>' lines (repeatable)")
+    parser.add_argument("--cache", default=None,
+                        help="feature cache (.npz): loaded if it exists, otherwise written")
+    parser.add_argument("--skip-plies", type=int, default=4, help="skip the first plies of database games")
+    parser.add_argument("--k", type=float, default=None, help="sigmoid scale (fitted if omitted)")
+    parser.add_argument("--score-weight", type=float, default=0.0,
+                        help="weight of the search score in the target where a result also exists")
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--lr", type=float, default=1.0)
+    parser.add_argument("--freeze", action="append", default=[], choices=sorted(FREEZE_GROUPS))
+    parser.add_argument("--out", default="config_tuned.py", help="where to write the tuned config module")
+    args = parser.parse_args()
+
+    if args.cache and os.path.exists(args.cache):
+        data = TexelDataset.load(args.cache)
+        print(f"Loaded {len(data)} positions from {args.cache}")
+    else:
+        builder = DatasetBuilder()
+        start = time.perf_counter()
+        for path in args.db:
+            positions_from_db(path, builder, args.skip_plies)
+        for path in args.shards:
+            positions_from_shards(path, builder)
+        for path in args.positions:
+            positions_from_text(path, builder)
+        data = builder.build()
+        print(f"Extracted {len(data)} positions ({builder.skipped} skipped) "
+              f"in {time.perf_counter() - start:.1f}s")
+        if args.cache:
+            data.save(args.cache)
+    if not len(data):
+        sys.exit("No positions to tune on.")
+
+    weights = current_weights()
+    k = args.k if args.k is not None else fit_k(weights, data)
+    target = targets(data, k, args.score_weight)
+    print(f"K = {k:.6f}, initial error {mean_squared_error(weights, data, k, target):.6f}")
+
+    tuned = tune(weights, data, k, target, args.epochs, args.lr, trainable_mask(args.freeze))
+    print_changes(weights, tuned)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(config_source(tuned))
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Parallel tournament runner.
+
+Plays a round-robin (every pair, both colours) or a gauntlet (one agent
+against every other, both colours) with one game per worker process, then
+prints a standings table built from the run_game results.
+
+Agents are looked up by class name in an AgentRegistry and only imported by
+the worker that plays them. An agent that fails to import forfeits its games.
+
+Games run headless; pass --log-dir to keep JSONL game logs (one file per
+worker process).
+
+Usage:
+    python tournament.py                          # round-robin, all agents
+    python tournament.py --mode gauntlet B22CH032 B22CS061 B23CM1036
+    python tournament.py --games 2 --workers 8 --time 60 --log-dir logs --db games.db
+    python tournament.py --agents-dir submissions
+"""
+import argparse
+import itertools
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from agent_registry import AgentRegistry, AgentLoadError
+from game_runner import run_game
+
+# Agents played by default when no names are given (the random movers are left out).
+DEFAULT_AGENTS = ("B22CH032", "B22EE088", "B22CS043", "B22CH0322", "B22CS061", "B23CM1036")
+
+_registries = {}
+
+
+def _registry(agent_dirs):
+    """One registry per worker process and directory list."""
+    key = tuple(agent_dirs or ())
+    if key not in _registries:
+        _registries[key] = AgentRegistry(list(key) or None)
+    return _registries[key]
+
+
+def schedule(agent_names, mode="round_robin", games_per_pairing=1):
+    """
+    Returns the list of (white, black) agent names to play.
+    In gauntlet mode the first agent plays everyone else.
+    """
+    if mode == "round_robin":
+        pairs = list(itertools.combinations(agent_names, 2))
+    elif mode == "gauntlet":
+        pairs = [(agent_names[0], other) for other in agent_names[1:]]
+    else:
+        raise ValueError(f"Unknown tournament mode: {mode}")
+
+    games = []
+    for _ in range(games_per_pairing):
+        for a, b in pairs:
+            games.append((a, b))
+            games.append((b, a))
+    return games
+
+
+def _play_game(white, black, total_time_seconds, log_dir=None, db_path=None, agent_dirs=None,
+               sandbox=False):
+    """Worker entry point: loads both agents and plays one headless game."""
+    registry = _registry(agent_dirs)
+    errors = {}
+    types = {}
+    for side, name in (("white", white), ("black", black)):
+        try:
+            types[side] = registry.load(name)
+        except AgentLoadError as e:
+            errors[side] = str(e)
+    if errors:
+        return _forfeit(white, black, errors)
+
+    log = os.path.join(log_dir, f"games-{os.getpid()}.jsonl") if log_dir else None
+    try:
+        return run_game(types["white"], types["black"], total_time_seconds, headless=True, log=log,
+                        game_db=db_path, sandbox=sandbox)
+    except Exception:
+        return {
+            "white": white,
+            "black": black,
+            "result": "*",
+            "reason": "error",
+            "error": traceback.format_exc(),
+        }
+
+
+def _forfeit(white, black, errors):
+    """Result for a game that could not start because an agent failed to load."""
+    if len(errors) == 2:
+        outcome = "*"
+    else:
+        outcome = "0-1" if "white" in errors else "1-0"
+    result = {
+        "white": white, "black": black, "result": outcome, "reason": "load_error",
+        "error": "; ".join(errors.values()), "plies": 0,
+    }
+    for side in ("white", "black"):
+        result.update({f"{side}_points": 0, f"{side}_flag": 0, f"{side}_moves": 0,
+                       f"{side}_time": 0.0, f"{side}_nodes": 0})
+    return result
+
+
+def run_tournament(agent_names, mode="round_robin", games_per_pairing=1,
+                   total_time_seconds=60, workers=None, log_dir=None, db_path=None,
+                   agent_dirs=None, sandbox=False):
+    """Plays all scheduled games in a process pool and returns (standings, results)."""
+    games = schedule(agent_names, mode, games_per_pairing)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_play_game, w, b, total_time_seconds, log_dir, db_path, agent_dirs,
+                               sandbox)
+                   for w, b in games]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            print(f"[{done}/{len(games)}] {result['white']} vs {result['black']}: "
+                  f"{result['result']} ({result['reason']})")
+    return compute_standings(results), results
+
+
+def compute_standings(results):
+    """
+    Aggregates game results per agent. Games that ended with an error are
+    reported but not scored.
+    """
+    table = {}
+
+    def row(name):
+        return table.setdefault(name, {
+            "agent": name, "games": 0, "wins": 0, "draws": 0, "losses": 0,
+            "score": 0.0, "points": 0, "moves": 0, "time": 0.0, "nodes": 0, "errors": 0,
+        })
+
+    for result in results:
+        for side in ("white", "black"):
+            entry = row(result[side])
+            if result["result"] == "*":
+                entry["errors"] += 1
+                continue
+            entry["games"] += 1
+            entry["points"] += result[f"{side}_points"]
+            entry["moves"] += result[f"{side}_moves"]
+            entry["time"] += result[f"{side}_time"]
+            entry["nodes"] += result[f"{side}_nodes"]
+            won = "1-0" if side == "white" else "0-1"
+            if result["result"] == "1/2-1/2":
+                entry["draws"] += 1
+                entry["score"] += 0.5
+            elif result["result"] == won:
+                entry["wins"] += 1
+                entry["score"] += 1
+            else:
+                entry["losses"] += 1
+
+    standings = []
+    for entry in table.values():
+        moves = entry["moves"]
+        entry["avg_time_per_move"] = entry["time"] / moves if moves else 0.0
+        entry["avg_nodes_per_move"] = entry["nodes"] / moves if moves else 0.0
+        standings.append(entry)
+    standings.sort(key=lambda e: (e["score"], e["points"]), reverse=True)
+    return standings
+
+
+def print_standings(standings):
+    print(f"\n{'#':>2}  {'Agent':<12} {'G':>3} {'W':>3} {'D':>3} {'L':>3} {'Score':>6} "
+          f"{'Points':>7} {'s/move':>7} {'nodes/move':>11}")
+    for rank, e in enumerate(standings, 1):
+        line = (f"{rank:>2}  {e['agent']:<12} {e['games']:>3} {e['wins']:>3} {e['draws']:>3} "
+                f"{e['losses']:>3} {e['score']:>6.1f} {e['points']:>7} "
+                f"{e['avg_time_per_move']:>7.3f} {e['avg_nodes_per_move']:>11.1f}")
+        if e["errors"]:
+            line += f"  ({e['errors']} errored games)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a parallel tournament between agents.")
+    parser.add_argument("agents", nargs="*", help="agent class names (default: all)")
+    parser.add_argument("--mode", choices=("round_robin", "gauntlet"), default="round_robin")
+    parser.add_argument("--games", type=int, default=1, help="games per pairing and colour")
+    parser.add_argument("--time", type=float, default=60, help="seconds per side")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--log-dir", default=None, help="directory for JSONL game logs")
+    parser.add_argument("--db", default=None, help="game database file to store games in")
+    parser.add_argument("--agents-dir", action="append", default=None,
+                        help="directory to discover agents in (repeatable, default: this repo)")
+    parser.add_argument("--sandbox", action="store_true",
+                        help="run each agent in its own killable worker process")
+    args = parser.parse_args()
+
+    registry = _registry(args.agents_dir)
+    if args.agents:
+        names = args.agents
+    elif args.agents_dir:
+        names = registry.names()
+    else:
+        names = list(DEFAULT_AGENTS)
+    unknown = [name for name in names if name not in registry.specs]
+    if unknown:
+        parser.error(f"unknown agents: {', '.join(unknown)}")
+
+    standings, _ = run_tournament(names, args.mode, args.games, args.time,
+                                  args.workers, args.log_dir, args.db, args.agents_dir,
+                                  args.sandbox)
+    print_standings(standings)
+
+
+if __name__ == "__main__":
+    main()